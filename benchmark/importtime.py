@@ -0,0 +1,77 @@
+import os
+import re
+import subprocess
+import sys
+import argparse
+
+# Mengukur waktu import `main` lewat `python -X importtime` untuk satu platform.
+# Gagal (exit 1) jika modul platform lain ikut termuat atau melewati --budget-ms.
+#
+#   python benchmark/importtime.py --platform webchat --top 15 --budget-ms 1500
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Paket berat yang hanya boleh dimuat saat platform-nya dipakai
+HEAVY_PACKAGES = {
+    "selenium": {"webchat", "facebook"},
+    "webdriver_manager": set(),
+    "telethon": {"telegram"},
+    "instagrapi": {"instagram"},
+}
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(platform):
+    """Menjalankan `import main` di proses baru dan mengembalikan baris stderr -X importtime."""
+    env = dict(os.environ, PLATFORM=platform)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import main gagal untuk PLATFORM={platform}")
+    return result.stderr.splitlines()
+
+
+def parse(lines):
+    """Mengubah output importtime menjadi list (nama, self_us, cumulative_us, kedalaman)."""
+    entries = []
+    for line in lines:
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu import main.py")
+    parser.add_argument("--platform", default=os.getenv("PLATFORM", "webchat"))
+    parser.add_argument("--top", type=int, default=15, help="Jumlah modul terlambat yang ditampilkan")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Batas total waktu import (ms)")
+    args = parser.parse_args()
+
+    entries = parse(measure(args.platform))
+    total_ms = next((cumulative for name, _, cumulative, _ in entries if name == "main"), 0) / 1000
+    loaded = {name.split(".")[0] for name, _, _, _ in entries}
+
+    print(f"PLATFORM={args.platform} | import main: {total_ms:.1f} ms | {len(entries)} modul")
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda entry: entry[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:10.1f} ms {self_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    problems = [
+        f"{package} termuat saat startup"
+        for package, platforms in HEAVY_PACKAGES.items()
+        if package in loaded and args.platform not in platforms
+    ]
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        problems.append(f"import main {total_ms:.1f} ms melebihi budget {args.budget_ms:.0f} ms")
+    for problem in problems:
+        print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import csv
+import glob
+import os
+import re
+import sys
+import timeit
+import argparse
+
+# Membandingkan normalizer lama (delapan re.sub tanpa kompilasi per jawaban) dengan
+# envstatus.normalize_response dan versi batch normalize_responses.
+#
+# Output baru dibandingkan dengan output lama apa adanya. Perbedaan yang disengaja:
+#   - whitespace dirapikan menjadi satu spasi
+#   - baris baru menjadi spasi, bukan dihapus ("a\nb" -> "a b", dulu "ab")
+# Perbedaan lain dianggap regresi (exit 1).
+#
+#   python benchmark/normalizer.py --repeat 5 --scale 20
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from module import envstatus  # noqa: E402
+
+
+def legacy_correction(text):
+    """Implementasi respond_csv_correction/respond_bot_correction sebelum normalizer satu pass."""
+    text = re.sub(r'\(bubble\d*\)', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\[button\]', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\(button\)', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\[List Menu\]', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\[carousel\]', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\[carousel button\]', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\[image\]', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\n', '', text, flags=re.IGNORECASE)
+    return text
+
+
+def load_corpus(scale):
+    """Kolom context dari semua file uji CSV di assets/csv, diulang `scale` kali."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "assets", "csv", "*.csv"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            for row in csv.DictReader(file):
+                row = {str(key).lower(): value for key, value in row.items()}
+                if row.get("context"):
+                    texts.append(row["context"])
+    return texts * scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark normalizer jawaban")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=20, help="Pengali jumlah teks dari assets/csv")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.scale)
+    if not texts:
+        raise SystemExit("Tidak ada kolom context di assets/csv")
+
+    counts = {"sama": 0, "whitespace": 0, "baris baru": 0, "lainnya": 0}
+    mismatches = []
+    for text in texts[: len(texts) // args.scale]:
+        legacy, new = legacy_correction(text), envstatus.normalize_response(text)
+        if legacy == new:
+            counts["sama"] += 1
+        elif " ".join(legacy.split()) == new:
+            counts["whitespace"] += 1
+        elif " ".join(legacy_correction(text.replace("\n", " ")).split()) == new:
+            counts["baris baru"] += 1
+        else:
+            counts["lainnya"] += 1
+            mismatches.append(text)
+    print(f"{len(texts)} teks, {sum(map(len, texts)) / 1e6:.1f} juta karakter")
+    print("Dibandingkan dengan output lama: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+    for text in mismatches[:3]:
+        print(f"  berbeda: {legacy_correction(text)[:80]!r} -> {envstatus.normalize_response(text)[:80]!r}")
+
+    cases = {
+        "legacy re.sub x8": lambda: [legacy_correction(text) for text in texts],
+        "normalize_response": lambda: [envstatus.normalize_response(text) for text in texts],
+        "normalize_responses": lambda: envstatus.normalize_responses(texts),
+    }
+    baseline = None
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name:22s} {best * 1000:9.1f} ms  {best / len(texts) * 1e6:7.2f} us/teks  x{baseline / best:.2f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 import os
 import glob
+import argparse
 import asyncio # Diperlukan untuk menjalankan fungsi async
 from dotenv import load_dotenv
-from module import modul, envfile, envwebchat, action, envreport, envfolder
-# Jangan import envinstagram di sini secara langsung, kita akan import secara kondisional
+
+# Muat .env sebelum modul diimpor agar pengaturan tingkat modul ikut terbaca
+load_dotenv()
+
+from module import modul, envfile, action, envreport, envfolder, envllmqueue, envllmcache, envhttp, envplatform, envprescore, envprogress, envresume
+# Modul platform (selenium, telethon, instagrapi) diimpor lewat envplatform hanya untuk platform yang dipakai
 
 def cleanup_previous_report(report_filename, id_test):
     """
@@ -11,34 +16,70 @@ def cleanup_previous_report(report_filename, id_test):
     """
     modul.show_loading("Membersihkan file laporan lama...")
     full_report_name = f"{report_filename}-{id_test}"
-    report_file_path = envfolder.write_json_data_bot(full_report_name)
-
-    if os.path.exists(report_file_path):
-        try:
-            os.remove(report_file_path)
-            print(f"Berhasil menghapus file laporan lama: {report_file_path}")
-        except OSError as e:
-            print(f"Error saat menghapus file {report_file_path}: {e}")
-    else:
+    report_file_paths = [
+        envfolder.write_json_data_bot(full_report_name),
+        envfolder.journal(full_report_name),
+    ]
+
+    removed = False
+    for report_file_path in report_file_paths:
+        if os.path.exists(report_file_path):
+            try:
+                os.remove(report_file_path)
+                removed = True
+                print(f"Berhasil menghapus file laporan lama: {report_file_path}")
+            except OSError as e:
+                print(f"Error saat menghapus file {report_file_path}: {e}")
+    if not removed:
         print("Tidak ada file laporan lama ditemukan untuk dihapus. Memulai proses baru.")
     print("\n")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pengujian knowledge base chatbot")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WORKERS", "1")),
+        help="Jumlah sesi browser webchat yang berjalan paralel (default: env WORKERS atau 1)"
+    )
+    parser.add_argument(
+        "--resume", metavar="ID_TEST", default=envresume.RESUME_ID or None,
+        help="Melanjutkan run yang terhenti dari journal-nya (default: env RESUME_ID)"
+    )
+    return parser.parse_args()
+
 def main():
     # Muat variabel dari file .env di awal eksekusi
     load_dotenv()
+    args = parse_args()
 
     modul.initialize("Initialize ...")
     today, time_start = modul.todays()
     start_duration_measurement = modul.start_time()
 
-    id_test = modul.id_test()
+    id_test = args.resume or modul.id_test()
 
     report_filename = "Test Knowledge Base"
-    cleanup_previous_report(report_filename, id_test)
+    previous_summary = envresume.start(report_filename, id_test) if args.resume else None
+    if previous_summary is None:
+        if args.resume:
+            print(f"Journal untuk Test ID {id_test} tidak ditemukan, memulai run baru dengan ID tersebut.\n")
+        cleanup_previous_report(report_filename, id_test)
+    else:
+        # Tanggal dan jam mulai di summary tetap milik run aslinya
+        today = previous_summary.get("date_test", today)
+        time_start = previous_summary.get("start_time_test", time_start)
     modul.setup_logging(report_filename, id_test)
 
     print(f"Test ID : {id_test}\nDay : {today}\nStart Time : {time_start}\n")
 
+    # Skoring LLM berjalan di background selama percakapan dengan bot
+    envllmqueue.start_workers(report_filename, id_test)
+    json_data = None
+    if envresume.active():
+        # Jawaban yang sudah tersimpan tetapi belum sempat diskor
+        pending = envllmqueue.enqueue_unscored_data(report_filename, id_test)
+        if pending:
+            print(f"{pending} jawaban dari run sebelumnya dimasukkan ulang ke antrian skoring\n")
+
     try:
         platform = os.getenv('PLATFORM')
         if platform:
@@ -66,19 +107,12 @@ def main():
         print(f"File Uji yang Digunakan: {filename_with_ext}\n")
         print(f"Tester: {tester_name}\n")
 
-        json_data = None
-        if file_extension.lower() == '.csv':
-            try:
-                json_data = envfile.convert_csv_to_json(filename_with_ext, file_name_without_ext)
-            except Exception as e:
-                print(f"Error saat mengonversi file CSV: {e}")
-                modul.test_done("Test Failed!")
-                return
-        elif file_extension.lower() in ['.xlsx', '.xls']:
+        if file_extension.lower() in envfile.TEST_DATA_FOLDERS:
             try:
-                json_data = envfile.convert_excel_to_json(filename_with_ext, file_name_without_ext)
+                # Dibaca secara streaming; pertanyaan pertama dikirim tanpa menunggu seluruh file
+                json_data = envfile.load_test_data(filename_with_ext, file_name_without_ext)
             except Exception as e:
-                print(f"Error saat mengonversi file Excel: {e}")
+                print(f"Error saat membaca file uji {filename_with_ext}: {e}")
                 modul.test_done("Test Failed!")
                 return
         else:
@@ -98,25 +132,42 @@ def main():
                 modul.test_done("Test Failed!")
                 return
             print(f"URL Pengujian: {url}\n")
-            driver, title_page, browser_name = modul.read_browser(url, "chrome")
-            envwebchat.prechat_form(driver, greeting, "Tester", "tester@example.com", "081234567890")
-            action.actions_webchat(driver, json_data, report_filename, id_test, time_start, today, tester_name, url, title_page, browser_name)
-            modul.close_browser(driver)
+            workers = modul.worker_pool_size(args.workers)
+            if workers > 1:
+                action.actions_webchat_parallel(json_data, workers, url, greeting, report_filename, id_test, time_start, today, tester_name)
+            else:
+                driver, title_page, browser_name = modul.read_browser(url, "chrome")
+                envplatform.adapter("webchat").prechat_form(driver, greeting, "Tester", "tester@example.com", "081234567890")
+                action.actions_webchat(driver, json_data, report_filename, id_test, time_start, today, tester_name, url, title_page, browser_name)
+                modul.close_browser(driver)
 
         elif platform == 'telegram':
+            envtelegram = envplatform.adapter("telegram")
             target_bot_username = os.getenv('TARGET_BOT_USERNAME')
-            if not target_bot_username:
+            bot_usernames = envtelegram.bot_usernames(target_bot_username)
+            if not bot_usernames:
                 print("Error: TARGET_BOT_USERNAME tidak diatur untuk platform 'telegram'.")
                 modul.test_done("Test Failed!")
                 return
-            print(f"Target Bot Telegram: {target_bot_username}\n")
-            from module import envtelegram
-            # Pastikan client envtelegram diinisialisasi sebelum digunakan dalam loop asyncio
-            # Asumsi client telah diinisialisasi saat modul dimuat.
-            with envtelegram.client:
-                 envtelegram.client.loop.run_until_complete(
-                     action.actions_telegram(target_bot_username, greeting, json_data, report_filename, id_test, time_start, today, tester_name)
-                 )
+            print(f"Target Bot Telegram: {', '.join(bot_usernames)}\n")
+            sessions = envtelegram.session_strings()
+            if len(sessions) * len(bot_usernames) > 1:
+                # Beberapa session dan/atau bot: percakapan berjalan paralel
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_until_complete(
+                        action.actions_telegram_parallel(sessions, bot_usernames, greeting, json_data, report_filename, id_test, time_start, today, tester_name)
+                    )
+                finally:
+                    loop.close()
+            else:
+                # Client utama dibuat di sini, saat pertama kali dibutuhkan
+                client = envtelegram.get_client()
+                with client:
+                     client.loop.run_until_complete(
+                         action.actions_telegram(bot_usernames[0], greeting, json_data, report_filename, id_test, time_start, today, tester_name)
+                     )
 
         elif platform == 'instagram':
             target_username = os.getenv('TARGET_USERNAME')
@@ -125,7 +176,6 @@ def main():
                 modul.test_done("Test Failed!")
                 return
             print(f"Target User Instagram: @{target_username}\n")
-            from module import envinstagram
             # Menjalankan fungsi async dalam event loop baru
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
@@ -153,12 +203,20 @@ def main():
             finally:
                 loop.close()
         else:
-            print(f"Error: Platform '{platform}' tidak didukung. Harap gunakan 'webchat', 'telegram', 'instagram', atau 'facebook'.")
+            print(f"Error: Platform '{platform}' tidak didukung. Harap gunakan {', '.join(repr(name) for name in envplatform.supported())}.")
             modul.test_done("Test Failed!")
             return
 
     finally:
-        end_duration_measurement = modul.end_time(start_duration_measurement)
+        # Pastikan semua skor sudah terisi sebelum report akhir dibuat
+        envllmqueue.stop_all_workers()
+        if isinstance(json_data, envfile.TestData):
+            json_data.close()
+        envprogress.stop()
+        envfile.write_summary_metrics({**envprescore.stats(), **envllmcache.stats(), **envhttp.metrics()}, report_filename, id_test)
+
+        # Run yang dilanjutkan: durasi run sebelumnya ikut dijumlahkan
+        end_duration_measurement = modul.end_time(start_duration_measurement, envresume.elapsed())
         today_end, time_end = modul.todays()
         print(f"End Time : {time_end}\nDuration : {end_duration_measurement}\n")
 
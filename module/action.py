@@ -1,26 +1,39 @@
 # module/action.py
 import time
 import asyncio
-from module import modul, envwebchat, envstatus, envfile, envreport, envfolder, envtelegram, envinstagram, envllmscore, envfacebook
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from module import modul, envstatus, envfile, envreport, envllmscore, envllmqueue, envplatform, envprogress, envresume
 from module.modul import log_function_status
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from typing import Optional
 
 
 @log_function_status
-def actions_webchat(driver, json_data, report_filename, id_test, time_start, today, tester_name, url, title_page, browser_name):
+def actions_webchat(driver, json_data, report_filename, id_test, time_start, today, tester_name, url, title_page, browser_name, positions=None, total_title=None, total_question=None):
+    envwebchat = envplatform.adapter("webchat")
     start = modul.start_time()
     class_name = "message-content-wrapper"
     content = "content"
     title = "当 Membaca pertanyaan dan mengirim ke webchat"
     modul.show_loading(title)
     print("\n")
-    count_per_element_title = len(json_data)
-    question_count = sum(sum(1 for key in item if key.startswith("pertanyaan")) for item in json_data)
-    for element in json_data:
-        modul.refresh(driver)
-        modul.wait_time(3)
+    # Saat dijalankan paralel, json_data hanya berisi sebagian topik; `positions`
+    # menyimpan posisi asli topik agar urutan report tetap sama dengan file uji
+    if positions is None:
+        positions = itertools.count()
+    count_per_element_title, question_count = envfile.test_data_totals(json_data, total_title, total_question)
+    envprogress.start(question_count)
+    for position, element in zip(positions, json_data):
+        # Total bertambah selama file uji masih dibaca secara streaming
+        count_per_element_title, question_count = envfile.test_data_totals(json_data, count_per_element_title, question_count)
+        envprogress.set_total(question_count)
+        # Topik yang sudah selesai pada run sebelumnya (--resume) dilewati
+        if envresume.topic_done(element):
+            envprogress.skip(envfile.count_questions(element))
+            continue
+        # Percakapan baru per topik tanpa reload halaman (refresh hanya jika widget bermasalah)
+        reset_method, reset_cost = envwebchat.reset_conversation(driver, class_name)
         duration_pertitle = modul.start_time()
         modul.show_loading(element.get("title", "Untitled"))
         print("\n")
@@ -28,13 +41,16 @@ def actions_webchat(driver, json_data, report_filename, id_test, time_start, tod
         for key, value in element.items():
             if key.startswith("pertanyaan") and value is not None and str(value).strip() != "":
                 count += 1
+                if envresume.is_answered(element, key, str(value)):
+                    envprogress.skip()
+                    continue
                 duration_perquestion = modul.start_time()
                 question = str(value) # Ensure question is a string
                 envwebchat.send_message(driver, question)
                 envwebchat.wait_reply(driver, class_name, content, question)
-                if count % 5 == 0:
-                    modul.wait_time(2)
+                if count % 5 == 0 and not envwebchat.health_check(driver):
                     modul.refresh(driver)
+                    modul.wait_time(3)
                 image_capture = envreport.take_screenshot(driver, id_test, key, question)
                 respond_bot = envwebchat.get_reply_chat(driver, class_name, content, question)
                 respond_bot = "\n".join(respond_bot).strip()
@@ -45,28 +61,27 @@ def actions_webchat(driver, json_data, report_filename, id_test, time_start, tod
                 respond_csv = envstatus.respond_csv_correction(respond_csv)
                 end_duration_persampletext = modul.end_time(duration_perquestion)
                 
-                # Mengaktifkan evaluasi LLM
-                skor, _, explanation, AI = envllmscore.llm_score(respond_bot, respond_csv)
-                
-                status = envstatus.status(skor)
                 data_bot = {
                     "no": element.get("no", ""),
                     "title": element.get("title", ""),
                     "question": question,
                     "response_kb": respond_csv,
                     "response_llm": respond_bot,
-                    "status": status,
+                    "status": "pending",
                     "duration": end_duration_persampletext,
                     "image_capture": image_capture,
-                    "skor": skor,
-                    "explanation": explanation
+                    "skor": None,
+                    "explanation": ""
                 }
-                envfile.write_json_data_bot(data_bot, report_filename, id_test)
+                index = envfile.write_json_data_bot(data_bot, report_filename, id_test, order=[position, count], key=envresume.question_key(element, key))
+                # Skor dan status diisi oleh worker skoring di background
+                envllmqueue.submit(report_filename, id_test, index, respond_bot, respond_csv)
                 pass_count, failed_count = envstatus.calculate(report_filename, id_test)
+                envprogress.advance(pass_count, failed_count)
                 data_summary = {
                     "id_test": id_test,
                     "tester_name": tester_name,
-                    "ai_evaluation": AI,
+                    "ai_evaluation": envllmscore.ai_evaluation,
                     "url": url,
                     "page_name": title_page,
                     "browser_name": browser_name,
@@ -79,34 +94,109 @@ def actions_webchat(driver, json_data, report_filename, id_test, time_start, tod
                 }
                 envfile.write_json_data_summary(data_summary, report_filename, id_test)
                 envreport.report_action(report_filename, id_test)
-        end_duration_pertitle = modul.end_time(duration_pertitle)
-        chart = {element.get("title", "Untitled"): end_duration_pertitle}
-        envfile.write_json_chart(chart, report_filename, id_test)
+        end_duration_pertitle = modul.end_time(duration_pertitle, envresume.topic_offset(element))
+        chart = {
+            element.get("title", "Untitled"): end_duration_pertitle,
+            "reset_cost": round(reset_cost, 2),
+            "reset_method": reset_method
+        }
+        envfile.write_json_chart(chart, report_filename, id_test, order=[position], key=envresume.topic_key(element))
         print(f"\n竢ｳ Total durasi Topik '{element.get('title', 'Untitled')}' : {end_duration_pertitle}\n")
     print("識 Topik Terakhir \n")
 
+_browser_lock = threading.Lock()
+
+def _webchat_shard(url, greeting, shard, report_filename, id_test, time_start, today, tester_name, total_title, total_question):
+    """Satu worker: membuka sesi browser sendiri, prechat, lalu menjalankan topik bagiannya."""
+    envwebchat = envplatform.adapter("webchat")
+    positions = [position for position, _ in shard]
+    elements = [element for _, element in shard]
+    # webdriver-manager dan start Chrome tidak aman dijalankan bersamaan
+    with _browser_lock:
+        driver, title_page, browser_name = modul.read_browser(url, "chrome")
+    try:
+        envwebchat.prechat_form(driver, greeting, "Tester", "tester@example.com", "081234567890")
+        actions_webchat(driver, elements, report_filename, id_test, time_start, today, tester_name, url, title_page, browser_name,
+                        positions=positions, total_title=total_title, total_question=total_question)
+    finally:
+        modul.close_browser(driver)
+
 @log_function_status
-async def actions_telegram(target_bot_username, greeting, json_data, report_filename, id_test, time_start, today, tester_name):
+def actions_webchat_parallel(json_data, workers, url, greeting, report_filename, id_test, time_start, today, tester_name):
+    """
+    Menjalankan topik webchat di beberapa sesi browser sekaligus. Topik dibagi
+    round-robin ke tiap worker; hasilnya masuk ke journal yang sama dan
+    diurutkan kembali sesuai posisi topik di file uji.
+    """
+    # Pembagian shard butuh seluruh topik, jadi data uji streaming dibaca penuh di sini
+    json_data = list(json_data)
+    # Topik yang sudah selesai pada run sebelumnya (--resume) tidak dibagikan ke worker
+    pending = [(position, element) for position, element in enumerate(json_data) if not envresume.topic_done(element)]
+    workers = min(workers, len(pending))
+    shards = [pending[i::workers] for i in range(workers)]
+    total_title, total_question = envfile.test_data_totals(json_data)
+    envprogress.start(total_question)
+    envprogress.skip(total_question - sum(envfile.count_questions(element) for _, element in pending))
+    if not shards:
+        return
+    print(f"Menjalankan {workers} sesi webchat paralel\n")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="webchat-worker") as executor:
+        futures = [
+            executor.submit(_webchat_shard, url, greeting, shard, report_filename, id_test, time_start, today, tester_name, total_title, total_question)
+            for shard in shards
+        ]
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ Error pada worker webchat: {e}")
+                errors.append(e)
+    if errors and len(errors) == len(futures):
+        raise errors[0]
+
+@log_function_status
+async def actions_telegram(target_bot_username, greeting, json_data, report_filename, id_test, time_start, today, tester_name, telegram_client=None, semaphore=None, positions=None, total_title=None, total_question=None):
+    envtelegram = envplatform.adapter("telegram")
     modul.show_loading(f"Mengirim sapaan awal ke {target_bot_username}...")
-    await envtelegram.send_message_to_bot(target_bot_username, greeting)
-    await asyncio.sleep(5)
+    # Semaphore membatasi jumlah pertanyaan yang menunggu balasan bersamaan (mode paralel)
+    semaphore = semaphore or asyncio.Semaphore(1)
+    collector = await envtelegram.start_reply_collector(target_bot_username, telegram_client)
+    sent_at = time.monotonic()
+    await envtelegram.send_message_to_bot(target_bot_username, greeting, telegram_client)
+    if collector:
+        await collector.wait_reply(sent_at)
     print("\n")
     title = f"当 Membaca pertanyaan dan mengirim ke {target_bot_username}"
     modul.show_loading(title)
     print("\n")
-    count_per_element_title = len(json_data)
-    question_count = sum(sum(1 for key in item if key.startswith("pertanyaan")) for item in json_data)
-    for element in json_data:
+    if positions is None:
+        positions = itertools.count()
+    count_per_element_title, question_count = envfile.test_data_totals(json_data, total_title, total_question)
+    envprogress.start(question_count)
+    for position, element in zip(positions, json_data):
+        # Total bertambah selama file uji masih dibaca secara streaming
+        count_per_element_title, question_count = envfile.test_data_totals(json_data, count_per_element_title, question_count)
+        envprogress.set_total(question_count)
+        # Topik yang sudah selesai pada run sebelumnya (--resume) dilewati
+        if envresume.topic_done(element):
+            envprogress.skip(envfile.count_questions(element))
+            continue
         duration_pertitle = modul.start_time()
         modul.show_loading(element.get("title", "Untitled"))
         print("\n")
+        count = 0
         for key, value in element.items():
             if key.startswith("pertanyaan") and value is not None and str(value).strip() != "":
+                count += 1
+                if envresume.is_answered(element, key, str(value)):
+                    envprogress.skip()
+                    continue
                 duration_perquestion = modul.start_time()
                 question = str(value) # Ensure question is a string
-                await envtelegram.send_message_to_bot(target_bot_username, question)
-                await asyncio.sleep(15)
-                respond_bot = await envtelegram.get_latest_message_from_bot(target_bot_username)
+                # FloodWait ditunggu di luar semaphore agar slot tidak tertahan
+                respond_bot, reply_latency = await envtelegram.ask_bot(target_bot_username, question, telegram_client, semaphore, collector)
                 if not respond_bot:
                     respond_bot = "Error: Tidak ada balasan dari bot setelah menunggu."
                 title_loading = f"{key} : {question}"
@@ -115,10 +205,6 @@ async def actions_telegram(target_bot_username, greeting, json_data, report_file
                 respond_csv = envstatus.respond_csv_correction(respond_csv)
                 end_duration_persampletext = modul.end_time(duration_perquestion)
                 
-                # Mengaktifkan evaluasi LLM
-                skor, _, explanation, AI = envllmscore.llm_score(respond_bot, respond_csv)
-                
-                status = envstatus.status(skor)
                 image_capture = None
                 data_bot = {
                     "no": element.get("no", ""),
@@ -126,18 +212,22 @@ async def actions_telegram(target_bot_username, greeting, json_data, report_file
                     "question": question,
                     "response_kb": respond_csv,
                     "response_llm": respond_bot,
-                    "status": status,
+                    "status": "pending",
                     "duration": end_duration_persampletext,
                     "image_capture": image_capture,
-                    "skor": skor,
-                    "explanation": explanation
+                    "skor": None,
+                    "explanation": "",
+                    "reply_latency": round(reply_latency, 2) if reply_latency is not None else None
                 }
-                envfile.write_json_data_bot(data_bot, report_filename, id_test)
+                index = envfile.write_json_data_bot(data_bot, report_filename, id_test, order=[position, count], key=envresume.question_key(element, key))
+                # Skor dan status diisi oleh worker skoring di background
+                await envllmqueue.submit_async(report_filename, id_test, index, respond_bot, respond_csv)
                 pass_count, failed_count = envstatus.calculate(report_filename, id_test)
+                envprogress.advance(pass_count, failed_count)
                 data_summary = {
                     "id_test": id_test,
                     "tester_name": tester_name,
-                    "ai_evaluation": AI,
+                    "ai_evaluation": envllmscore.ai_evaluation,
                     "url": f"Telegram Bot ({target_bot_username})",
                     "page_name": "Telegram Test",
                     "browser_name": "Telethon",
@@ -150,21 +240,68 @@ async def actions_telegram(target_bot_username, greeting, json_data, report_file
                 }
                 envfile.write_json_data_summary(data_summary, report_filename, id_test)
                 envreport.report_action(report_filename, id_test)
-        end_duration_pertitle = modul.end_time(duration_pertitle)
+        end_duration_pertitle = modul.end_time(duration_pertitle, envresume.topic_offset(element))
         chart = {element.get("title", "Untitled"): end_duration_pertitle}
-        envfile.write_json_chart(chart, report_filename, id_test)
+        envfile.write_json_chart(chart, report_filename, id_test, order=[position], key=envresume.topic_key(element))
         print(f"\n竢ｳ Total durasi Topik '{element.get('title', 'Untitled')}' : {end_duration_pertitle}\n")
     print("識 Topik Terakhir \n")
+    if collector:
+        collector.stop()
     # modul.close_browser(driver)
 
+@log_function_status
+async def actions_telegram_parallel(sessions, bot_usernames, greeting, json_data, report_filename, id_test, time_start, today, tester_name):
+    """
+    Menjalankan beberapa percakapan Telegram sekaligus. Setiap pasangan
+    (session, bot) menjadi satu jalur percakapan; topik dibagi round-robin
+    ke jalur tersebut dan hasilnya diurutkan kembali sesuai file uji.
+    """
+    envtelegram = envplatform.adapter("telegram")
+    json_data = list(json_data)
+    # Topik yang sudah selesai pada run sebelumnya (--resume) tidak dibagikan ke jalur percakapan
+    pending = [(position, element) for position, element in enumerate(json_data) if not envresume.topic_done(element)]
+    lanes = [(session, bot_username) for session in sessions for bot_username in bot_usernames]
+    lanes = lanes[:len(pending)]
+    shards = [pending[i::len(lanes)] for i in range(len(lanes))]
+    total_title, total_question = envfile.test_data_totals(json_data)
+    envprogress.start(total_question)
+    envprogress.skip(total_question - sum(envfile.count_questions(element) for _, element in pending))
+    if not lanes:
+        return
+    semaphore = asyncio.Semaphore(envtelegram.TELEGRAM_CONCURRENCY)
+    print(f"Menjalankan {len(lanes)} percakapan Telegram paralel (maks {envtelegram.TELEGRAM_CONCURRENCY} bersamaan)\n")
+
+    clients = {session: envtelegram.create_client(session) for session in dict.fromkeys(session for session, _ in lanes)}
+    for telegram_client in clients.values():
+        await telegram_client.connect()
+    try:
+        results = await asyncio.gather(*[
+            actions_telegram(
+                bot_username, greeting, [element for _, element in shard], report_filename, id_test, time_start, today, tester_name,
+                telegram_client=clients[session], semaphore=semaphore,
+                positions=[position for position, _ in shard], total_title=total_title, total_question=total_question
+            )
+            for (session, bot_username), shard in zip(lanes, shards)
+        ], return_exceptions=True)
+    finally:
+        for telegram_client in clients.values():
+            await telegram_client.disconnect()
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    for error in errors:
+        print(f"❌ Error pada percakapan Telegram: {error}")
+    if errors and len(errors) == len(results):
+        raise errors[0]
+
 @log_function_status
 async def actions_instagram(target_username, greeting, json_data, report_filename, id_test, time_start, today, tester_name):
+    envinstagram = envplatform.adapter("instagram")
     modul.show_loading(f"Initializing Instagram API and session...")
-    envinstagram.initialize_instagram_api()
+    await envinstagram.initialize_instagram_api_async()
 
     modul.show_loading(f"Mengirim sapaan awal ke {target_username}...")
     # Kirim sapaan dan dapatkan timestamp setelah pesan terkirim
-    greeting_timestamp = envinstagram.send_message(target_username, greeting)
+    greeting_timestamp = await envinstagram.send_message_async(target_username, greeting)
     if greeting_timestamp:
         # Tunggu sebentar untuk memastikan bot sempat merespons sapaan (jika ada)
         await asyncio.sleep(10)
@@ -174,26 +311,36 @@ async def actions_instagram(target_username, greeting, json_data, report_filenam
     modul.show_loading(title)
     print("\n")
 
-    count_per_element_title = len(json_data)
-    question_count = sum(sum(1 for key in item if key.startswith("pertanyaan")) for item in json_data)
+    count_per_element_title, question_count = envfile.test_data_totals(json_data)
+    envprogress.start(question_count)
 
     for element in json_data:
+        # Total bertambah selama file uji masih dibaca secara streaming
+        count_per_element_title, question_count = envfile.test_data_totals(json_data, count_per_element_title, question_count)
+        envprogress.set_total(question_count)
+        # Topik yang sudah selesai pada run sebelumnya (--resume) dilewati
+        if envresume.topic_done(element):
+            envprogress.skip(envfile.count_questions(element))
+            continue
         duration_pertitle = modul.start_time()
         modul.show_loading(element.get("title", "Untitled"))
         print("\n")
 
         for key, value in element.items():
             if key.startswith("pertanyaan") and value is not None and str(value).strip() != "":
+                if envresume.is_answered(element, key, str(value)):
+                    envprogress.skip()
+                    continue
                 duration_perquestion = modul.start_time()
                 question = str(value)
 
                 # Kirim pertanyaan dan dapatkan timestamp setelah pesan terkirim
-                sent_timestamp = envinstagram.send_message(target_username, question)
+                sent_timestamp = await envinstagram.send_message_async(target_username, question)
                 
                 respond_bot = ""
                 if sent_timestamp:
                     # Cari pesan balasan yang datang SETELAH timestamp pesan kita
-                    respond_bot = envinstagram.get_latest_message(target_username, sent_timestamp)
+                    respond_bot = await envinstagram.get_latest_message_async(target_username, sent_timestamp)
                 
                 if not respond_bot:
                     respond_bot = "Error: Tidak ada balasan dari bot setelah menunggu."
@@ -205,10 +352,6 @@ async def actions_instagram(target_username, greeting, json_data, report_filenam
                 respond_csv = envstatus.respond_csv_correction(respond_csv)
                 end_duration_persampletext = modul.end_time(duration_perquestion)
 
-                # Activate LLM evaluation
-                skor, _, explanation, AI = envllmscore.llm_score(respond_bot, respond_csv)
-
-                status = envstatus.status(skor)
                 image_capture = None
 
                 data_bot = {
@@ -217,19 +360,22 @@ async def actions_instagram(target_username, greeting, json_data, report_filenam
                     "question": question,
                     "response_kb": respond_csv,
                     "response_llm": respond_bot,
-                    "status": status,
+                    "status": "pending",
                     "duration": end_duration_persampletext,
                     "image_capture": image_capture,
-                    "skor": skor,
-                    "explanation": explanation
+                    "skor": None,
+                    "explanation": ""
                 }
-                envfile.write_json_data_bot(data_bot, report_filename, id_test)
+                index = envfile.write_json_data_bot(data_bot, report_filename, id_test, key=envresume.question_key(element, key))
+                # Skor dan status diisi oleh worker skoring di background
+                await envllmqueue.submit_async(report_filename, id_test, index, respond_bot, respond_csv)
 
                 pass_count, failed_count = envstatus.calculate(report_filename, id_test)
+                envprogress.advance(pass_count, failed_count)
                 data_summary = {
                     "id_test": id_test,
                     "tester_name": tester_name,
-                    "ai_evaluation": AI,
+                    "ai_evaluation": envllmscore.ai_evaluation,
                     "url": f"Instagram DM (@{target_username})",
                     "page_name": "Instagram Test",
                     "browser_name": "Instagrapi",
@@ -243,18 +389,22 @@ async def actions_instagram(target_username, greeting, json_data, report_filenam
                 envfile.write_json_data_summary(data_summary, report_filename, id_test)
                 envreport.report_action(report_filename, id_test)
 
-        end_duration_pertitle = modul.end_time(duration_pertitle)
+        end_duration_pertitle = modul.end_time(duration_pertitle, envresume.topic_offset(element))
         chart = {element.get("title", "Untitled"): end_duration_pertitle}
-        envfile.write_json_chart(chart, report_filename, id_test)
+        envfile.write_json_chart(chart, report_filename, id_test, key=envresume.topic_key(element))
         print(f"\n竢ｳ Total durasi Topik '{element.get('title', 'Untitled')}' : {end_duration_pertitle}\n")
 
     print("識 Topik Terakhir \n")
+    envinstagram.shutdown()
 
 @log_function_status
 async def actions_facebook(target_fanpage_id, greeting, json_data, report_filename, id_test, time_start, today, tester_name):
     from session_manager import get_latest_session, validate_session_cookies, create_session_folder
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
     import os
 
+    envfacebook = envplatform.adapter("facebook")
     logger = envfacebook.logger
 
     def setup_test_environment() -> tuple[str, str]:
@@ -266,8 +416,8 @@ async def actions_facebook(target_fanpage_id, greeting, json_data, report_filena
             latest_session = get_latest_session()
             if latest_session:
                 session_id, session_folder = latest_session
-                cookie_file = os.path.join(session_folder, 'cookies.json')
-                if validate_session_cookies(cookie_file):
+                # Folder dikirim langsung agar sessionfb.json juga dikenali
+                if validate_session_cookies(session_folder):
                     logger.info(f"Using existing valid session: {session_id} in {session_folder}")
                     return session_folder, session_id
 
@@ -307,20 +457,31 @@ async def actions_facebook(target_fanpage_id, greeting, json_data, report_filena
         title = "当 Membaca pertanyaan dan mengirim ke Facebook"
         modul.show_loading(title)
         print("\n")
-        count_per_element_title = len(json_data)
-        question_count = sum(sum(1 for key in item if key.startswith("pertanyaan")) for item in json_data)
+        count_per_element_title, question_count = envfile.test_data_totals(json_data)
+        envprogress.start(question_count)
         for element in json_data:
+            # Total bertambah selama file uji masih dibaca secara streaming
+            count_per_element_title, question_count = envfile.test_data_totals(json_data, count_per_element_title, question_count)
+            envprogress.set_total(question_count)
+            # Topik yang sudah selesai pada run sebelumnya (--resume) dilewati
+            if envresume.topic_done(element):
+                envprogress.skip(envfile.count_questions(element))
+                continue
             duration_pertitle = modul.start_time()
             modul.show_loading(element.get("title", "Untitled"))
             print("\n")
             for key, value in element.items():
                 if key.startswith("pertanyaan") and value is not None and str(value).strip() != "":
+                    if envresume.is_answered(element, key, str(value)):
+                        envprogress.skip()
+                        continue
                     duration_perquestion = modul.start_time()
                     question = str(value) # Ensure question is a string
 
+                    # Jumlah bubble bot sebelum kirim, agar hanya bubble baru yang diambil
+                    old_count = envfacebook.count_bot_bubbles(driver)
                     if envfacebook.send_message_to_chatbot(driver, question):
-                        time.sleep(2)
-                        respond_bot = envfacebook.get_chatbot_response(driver)
+                        respond_bot = envfacebook.get_chatbot_response(driver, old_count)
                     else:
                         respond_bot = "Error: Gagal mengirim pesan ke chatbot."
 
@@ -332,28 +493,27 @@ async def actions_facebook(target_fanpage_id, greeting, json_data, report_filena
                     respond_csv = envstatus.respond_csv_correction(respond_csv)
                     end_duration_persampletext = modul.end_time(duration_perquestion)
 
-                    # Mengaktifkan evaluasi LLM
-                    skor, _, explanation, AI = envllmscore.llm_score(respond_bot, respond_csv)
-
-                    status = envstatus.status(skor)
                     data_bot = {
                         "no": element.get("no", ""),
                         "title": element.get("title", ""),
                         "question": question,
                         "response_kb": respond_csv,
                         "response_llm": respond_bot,
-                        "status": status,
+                        "status": "pending",
                         "duration": end_duration_persampletext,
                         "image_capture": image_capture,
-                        "skor": skor,
-                        "explanation": explanation
+                        "skor": None,
+                        "explanation": ""
                     }
-                    envfile.write_json_data_bot(data_bot, report_filename, id_test)
+                    index = envfile.write_json_data_bot(data_bot, report_filename, id_test, key=envresume.question_key(element, key))
+                    # Skor dan status diisi oleh worker skoring di background
+                    await envllmqueue.submit_async(report_filename, id_test, index, respond_bot, respond_csv)
                     pass_count, failed_count = envstatus.calculate(report_filename, id_test)
+                    envprogress.advance(pass_count, failed_count)
                     data_summary = {
                         "id_test": id_test,
                         "tester_name": tester_name,
-                        "ai_evaluation": AI,
+                        "ai_evaluation": envllmscore.ai_evaluation,
                         "url": chatbot_url,
                         "page_name": "Facebook Test",
                         "browser_name": "Selenium",
@@ -366,9 +526,9 @@ async def actions_facebook(target_fanpage_id, greeting, json_data, report_filena
                     }
                     envfile.write_json_data_summary(data_summary, report_filename, id_test)
                     envreport.report_action(report_filename, id_test)
-            end_duration_pertitle = modul.end_time(duration_pertitle)
+            end_duration_pertitle = modul.end_time(duration_pertitle, envresume.topic_offset(element))
             chart = {element.get("title", "Untitled"): end_duration_pertitle}
-            envfile.write_json_chart(chart, report_filename, id_test)
+            envfile.write_json_chart(chart, report_filename, id_test, key=envresume.topic_key(element))
             print(f"\n竢ｳ Total durasi Topik '{element.get('title', 'Untitled')}' : {end_duration_pertitle}\n")
         print("識 Topik Terakhir \n")
 
@@ -0,0 +1,173 @@
+import glob
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from module import envfolder
+
+# Lokasi driver bisa dipatok manual, mis. CHROMEDRIVER_PATH=/opt/drivers/chromedriver
+DRIVER_PATH_ENV = {
+    "chrome": "CHROMEDRIVER_PATH",
+    "edge": "EDGEDRIVER_PATH",
+    "firefox": "GECKODRIVER_PATH",
+}
+
+DRIVER_NAMES = {
+    "chrome": "chromedriver",
+    "edge": "msedgedriver",
+    "firefox": "geckodriver",
+}
+
+# Nama executable browser yang dicoba untuk membaca versi terpasang
+BROWSER_BINARIES = {
+    "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"],
+    "edge": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+    "firefox": ["firefox"],
+}
+
+PROBE_TIMEOUT = 5
+
+_resolved = {}
+_lock = threading.Lock()
+
+
+def _run_version(command):
+    """Menjalankan `<command> --version` dan mengembalikan output-nya, None jika gagal."""
+    try:
+        result = subprocess.run(
+            [command, "--version"], capture_output=True, text=True, timeout=PROBE_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return (result.stdout or result.stderr).strip()
+
+
+def browser_major_version(browser):
+    """Versi mayor browser yang terpasang (mis. '126'), None jika tidak terdeteksi."""
+    for binary in BROWSER_BINARIES[browser]:
+        path = shutil.which(binary)
+        if not path:
+            continue
+        output = _run_version(path)
+        match = re.search(r"(\d+)\.\d+", output or "")
+        if match:
+            return match.group(1)
+    return None
+
+
+def probe_driver(path):
+    """Validasi cepat: driver ada, bisa dieksekusi, dan menjawab `--version`."""
+    if not path or not os.path.isfile(path):
+        return None
+    return _run_version(path)
+
+
+def _cached_driver_path(browser, version):
+    driver_name = DRIVER_NAMES[browser] + (".exe" if sys.platform.startswith("win") else "")
+    return os.path.abspath(os.path.join(envfolder.webdriver_cache(browser, version), driver_name))
+
+
+def _latest_cached_driver(browser):
+    """Driver cache terbaru untuk browser ini (dipakai jika versi browser tidak terdeteksi)."""
+    pattern = os.path.join(envfolder.webdriver_cache(browser), "*", DRIVER_NAMES[browser] + "*")
+    candidates = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+    for candidate in candidates:
+        if probe_driver(candidate):
+            return candidate
+    return None
+
+
+def _download_driver(browser):
+    """Mengunduh driver lewat webdriver-manager (butuh jaringan)."""
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser == "edge":
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    from webdriver_manager.firefox import GeckoDriverManager
+    return GeckoDriverManager().install()
+
+
+def _pin(browser, version, source_path):
+    """Menyalin driver hasil unduhan ke cache dan mencatat manifest-nya."""
+    target_path = _cached_driver_path(browser, version)
+    temp_path = f"{target_path}.tmp"
+    shutil.copy2(source_path, temp_path)
+    os.chmod(temp_path, 0o755)
+    os.replace(temp_path, target_path)
+
+    manifest = {
+        "browser": browser,
+        "browser_version": version,
+        "driver_version": probe_driver(target_path),
+        "source": source_path,
+        "cached_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(os.path.join(os.path.dirname(target_path), "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=4)
+    return target_path
+
+
+def resolve(browser):
+    """
+    Mengembalikan path driver untuk browser ('chrome', 'edge' atau 'firefox').
+
+    Urutan: path dari environment, cache `cache/webdriver/<browser>/<versi>`
+    yang lolos probe `--version`, lalu unduh lewat webdriver-manager dan simpan
+    ke cache. Jika cache sudah terisi, tidak ada akses jaringan sama sekali.
+    """
+    browser = browser.lower()
+    with _lock:
+        if browser in _resolved:
+            return _resolved[browser]
+
+        pinned_path = os.getenv(DRIVER_PATH_ENV[browser])
+        if pinned_path:
+            if not probe_driver(pinned_path):
+                raise RuntimeError(f"{DRIVER_PATH_ENV[browser]}={pinned_path} tidak bisa dijalankan")
+            _resolved[browser] = pinned_path
+            return pinned_path
+
+        start = time.perf_counter()
+        version = browser_major_version(browser)
+        if version:
+            driver_path = _cached_driver_path(browser, version)
+            if not probe_driver(driver_path):
+                driver_path = _pin(browser, version, _download_driver(browser))
+                source = "download"
+            else:
+                source = "cache"
+        else:
+            # Versi browser tidak terbaca: pakai cache terakhir jika ada, jika tidak unduh
+            driver_path = _latest_cached_driver(browser)
+            source = "cache"
+            if driver_path is None:
+                driver_path = _download_driver(browser)
+                source = "download"
+
+        logging.info(
+            f"envdriver: {browser} {version or '?'} -> {driver_path} ({source}, "
+            f"{time.perf_counter() - start:.2f} detik)"
+        )
+        _resolved[browser] = driver_path
+        return driver_path
+
+
+def service(browser):
+    """Service Selenium yang siap dipakai untuk webdriver.Chrome/Edge/Firefox."""
+    browser = browser.lower()
+    if browser == "chrome":
+        from selenium.webdriver.chrome.service import Service
+    elif browser == "edge":
+        from selenium.webdriver.edge.service import Service
+    else:
+        from selenium.webdriver.firefox.service import Service
+    return Service(resolve(browser))
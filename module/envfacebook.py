@@ -5,12 +5,11 @@ import json
 from typing import Optional, Tuple, List, Dict, Any
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from module import envdriver
 from session_manager import (
     save_session_cookies,
     create_session_folder,
@@ -21,6 +20,59 @@ from session_manager import (
 
 logger = logging.getLogger(__name__)
 
+# Chatbot reply bubbles in Messenger; CSS selector is matched natively instead of a DOM-wide XPath scan
+BOT_BUBBLE_SELECTOR = "div.html-div.x18lvrbx"
+FACEBOOK_REPLY_TIMEOUT = float(os.getenv("FACEBOOK_REPLY_TIMEOUT", "30"))
+FACEBOOK_SETTLE_MS = int(os.getenv("FACEBOOK_SETTLE_MS", "1500"))
+# Message-thread container watched for new bubbles; the nearest match around a bubble is used
+FACEBOOK_THREAD_SELECTOR = os.getenv("FACEBOOK_THREAD_SELECTOR", "div[role='grid'], div[role='main']")
+
+# Resolves once there are more than oldCount bubbles and the message thread has been quiet for
+# settleMs (or when timeoutMs passes), returning the texts of the new bubbles. Only the thread
+# container is observed, so typing indicators, badges or ads elsewhere do not reset the timer.
+WAIT_BOT_REPLY_SCRIPT = """
+const [selector, threadSelector, oldCount, settleMs, timeoutMs, done] = arguments;
+const start = Date.now();
+let settleTimer = null;
+let finished = false;
+let root = null;
+
+const findThread = () => {
+  const bubble = document.querySelector(selector);
+  return (bubble && bubble.closest(threadSelector)) || document.querySelector(threadSelector);
+};
+// Until the thread exists, only element insertions on the body are watched to find it
+const watch = () => {
+  const thread = findThread();
+  if (thread === root && root) return;
+  root = thread;
+  observer.disconnect();
+  if (root) observer.observe(root, {childList: true, subtree: true, characterData: true});
+  else observer.observe(document.body, {childList: true, subtree: true});
+};
+
+const newBubbles = () => Array.from(document.querySelectorAll(selector)).slice(oldCount);
+const finish = (status) => {
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearTimeout(settleTimer);
+  clearTimeout(timeoutTimer);
+  done({status: status, bubbles: newBubbles().map((bubble) => bubble.innerText), elapsed_ms: Date.now() - start});
+};
+const check = () => {
+  if (!root || !root.isConnected) watch();
+  if (document.querySelectorAll(selector).length <= oldCount) return;
+  clearTimeout(settleTimer);
+  settleTimer = setTimeout(() => finish('settled'), settleMs);
+};
+
+const observer = new MutationObserver(check);
+watch();
+const timeoutTimer = setTimeout(() => finish(newBubbles().length ? 'settled' : 'timeout'), timeoutMs);
+check();
+"""
+
 def perform_manual_login() -> Tuple[str, str]:
     """
     Handle Facebook login with session reuse.
@@ -55,7 +107,7 @@ def perform_manual_login() -> Tuple[str, str]:
 
     driver = None
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = webdriver.Chrome(service=envdriver.service("chrome"), options=options)
         driver.get("https://www.facebook.com/")
 
         logging.info("Please log in manually and handle 2FA if needed.")
@@ -95,11 +147,8 @@ def perform_manual_login() -> Tuple[str, str]:
         # Get cookies after successful login
         cookies = driver.get_cookies()
 
-        # Save cookies to file
-        cookie_file = os.path.join(folder_path, 'cookies.json')
-        with open(cookie_file, 'w') as f:
-            json.dump(cookies, f, indent=2)
-        logging.info(f"Session cookies saved to {cookie_file}")
+        # Save cookies to file (also records the session in the session index)
+        save_session_cookies(folder_path, cookies)
 
         # Verify cookies contain essential Facebook authentication cookies
         cookie_names = [cookie.get('name', '') for cookie in cookies]
@@ -139,7 +188,7 @@ def initialize_driver(session_folder_path: str) -> webdriver.Chrome:
     # options.add_argument("--headless")
 
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = webdriver.Chrome(service=envdriver.service("chrome"), options=options)
         logger.info("WebDriver initialized successfully")
 
         # Load and validate session cookies
@@ -268,80 +317,49 @@ def _try_send_methods(driver: webdriver.Chrome, message_box) -> bool:
 
     return False
 
-def get_chatbot_response(driver: webdriver.Chrome) -> Optional[str]:
+def count_bot_bubbles(driver: webdriver.Chrome) -> int:
+    """Count the chatbot bubbles currently on the page (snapshot taken before sending)."""
+    try:
+        return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", BOT_BUBBLE_SELECTOR)
+    except WebDriverException as e:
+        logger.warning(f"Could not count chatbot bubbles: {e}")
+        return len(driver.find_elements(By.CSS_SELECTOR, BOT_BUBBLE_SELECTOR))
+
+def get_chatbot_response(driver: webdriver.Chrome, old_count: Optional[int] = None) -> Optional[str]:
     """
-    Get the latest response from the chatbot.
+    Get the chatbot response that arrives after `old_count` bubbles.
+
+    A MutationObserver on the message thread waits until new bubbles appear and
+    the thread has been quiet for FACEBOOK_SETTLE_MS, then returns the texts of all
+    new bubbles in one round trip.
 
     Args:
         driver: Selenium WebDriver instance
+        old_count: Bubble count taken before the question was sent
 
     Returns:
-        Latest chatbot response text or None if not found
+        Chatbot response text or None if not found
     """
     try:
         logger.info("Getting chatbot response...")
-
-        # Multiple possible selectors for chatbot responses
-        response_selectors = [
-            "//div[contains(@class, 'msg') and contains(@class, 'from-them')]//span",
-            "//div[contains(@class, 'message') and contains(@class, 'incoming')]//span",
-            "//div[@dir='auto' and contains(@class, 'html-div')]",
-            "//div[@dir='auto']",
-            "//div[@role='article']//span[contains(@class, 'message')]",
-            "//div[contains(@data-testid, 'message') and contains(@class, 'other')]//span",
-            "//div[contains(@class, 'chatMessage')]//span",
-            "//div[@data-hover='tooltip']/div/span"
-        ]
-
-        # responses = []
-        # for selector in response_selectors:
-        #     try:
-        #         elements = WebDriverWait(driver, 15).until(
-        #             EC.presence_of_all_elements_located((By.XPATH, selector))
-        #         )
-        #         for elem in elements:
-        #             text = elem.text.strip()
-        #             if text:
-        #                 responses.append(text)
-        #     except TimeoutException:
-        #         continue
-
-    
-        # return latest_response.text.strip()
-
-
-        # if responses:
-        #     latest_response = responses[-1]
-        #     logger.info(f"Found response: {latest_response[:50]}...")
-        #     return latest_response
-        # else:
-        #     logger.warning("No chatbot response found")
-        #     return None
-        
-        xpath_bot = "//div[contains(@class,'html-div') and contains(@class,'x18lvrbx')]"
-
-        # hitung jumlah bubble bot sebelum kirim pertanyaan
-        old_count = len(driver.find_elements(By.XPATH, xpath_bot))
-
-        try:
-            # tunggu sampai jumlah bubble bot nambah (ada jawaban baru)
-            WebDriverWait(driver, 15).until(
-                lambda d: len(d.find_elements(By.XPATH, xpath_bot)) > old_count
-            )
-
-            # ambil semua bubble bot setelah old_count
-            elems = driver.find_elements(By.XPATH, xpath_bot)
-            new_elems = elems[old_count:]  # semua bubble baru
-
-            # gabungkan teks jadi satu string
-            responses = [e.text.strip() for e in new_elems if e.text.strip()]
-            full_response = " ".join(responses)
-
-            print("Full response:", full_response)  # print sebagian untuk verifikasi
-            return full_response if full_response else None
-
-        except TimeoutException:
-            return None
+        if old_count is None:
+            old_count = count_bot_bubbles(driver)
+
+        driver.set_script_timeout(FACEBOOK_REPLY_TIMEOUT + 5)
+        result = driver.execute_async_script(
+            WAIT_BOT_REPLY_SCRIPT, BOT_BUBBLE_SELECTOR, FACEBOOK_THREAD_SELECTOR, old_count, FACEBOOK_SETTLE_MS,
+            int(FACEBOOK_REPLY_TIMEOUT * 1000)
+        )
+        logger.info(
+            f"Chatbot reply {result.get('status')}: {len(result.get('bubbles', []))} bubble(s) in {result.get('elapsed_ms')} ms"
+        )
+
+        # gabungkan teks jadi satu string
+        responses = [text.strip() for text in result.get("bubbles", []) if text and text.strip()]
+        full_response = " ".join(responses)
+
+        print("Full response:", full_response)  # print sebagian untuk verifikasi
+        return full_response if full_response else None
     except Exception as e:
         logger.error(f"Error getting chatbot response: {e}")
         return None
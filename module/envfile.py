@@ -1,64 +1,196 @@
 import csv
 import json
-import pandas as pd
+import threading
 from colorama import Fore, Style
-from module import modul, envfolder
+from module import modul, envfolder, envjournal, envkb
 import os
 
-@modul.log_function_status
-def convert_csv_to_json(csv_filename_with_ext, json_file_without_ext):
+# Simpan salinan JSON dari file uji ke assets/json/converted (ditulis di background). 0 = nonaktif
+SAVE_CONVERTED_JSON = os.getenv("SAVE_CONVERTED_JSON", "1") != "0"
+
+TEST_DATA_FOLDERS = {
+    ".csv": "assets/csv",
+    ".xlsx": "assets/xlsx",
+    ".xls": "assets/xlsx",
+}
+
+
+def count_questions(item):
+    return len(envkb.row_questions(item))
+
+
+def _lowercase_row(row):
+    return {key.lower(): value for key, value in row.items() if key is not None}
+
+
+def _iter_csv(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            yield _lowercase_row(row)
+
+
+def _iter_xlsx(path):
+    # Mode read-only membaca sheet baris per baris tanpa memuat seluruh workbook
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [str(name).lower() if name is not None else f"unnamed: {index}" for index, name in enumerate(header)]
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            # Sel kosong menjadi "" seperti pada csv.DictReader
+            yield {key: "" if value is None else value for key, value in zip(keys, values)}
+    finally:
+        workbook.close()
+
+
+def _iter_xls(path):
+    # Format .xls lama tidak didukung openpyxl; dibaca lewat pandas (butuh xlrd)
+    import pandas as pd
+    df = pd.read_excel(path)
+    df.columns = map(str.lower, df.columns)
+    yield from df.to_dict(orient='records')
+
+
+def iter_rows(path):
+    """Membaca file uji (csv/xlsx/xls) baris per baris sebagai dict dengan key huruf kecil."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return _iter_csv(path)
+    if extension == ".xlsx":
+        return _iter_xlsx(path)
+    return _iter_xls(path)
+
+
+class TestData:
     """
-    Mengonversi file CSV menjadi JSON.
+    Data uji yang dibaca secara streaming: setiap iterasi membaca file dari
+    awal dan menghasilkan baris satu per satu, sehingga pertanyaan pertama
+    bisa langsung dikirim tanpa menunggu seluruh file terbaca.
+
+    Thread background membaca file sekali untuk menghitung total topik dan
+    pertanyaan, membangun snapshot KB (envkb) dan menulis salinan JSON jika
+    SAVE_CONVERTED_JSON aktif. Selama hitungan itu belum selesai, `totals()`
+    mengembalikan total sementara.
+
+    Jika snapshot KB untuk isi file ini sudah ada, baris dibaca dari snapshot
+    yang di-memory-map (context sudah dinormalisasi) dan total langsung final.
     """
-    csv_path = f'assets/csv/{csv_filename_with_ext}'
-    result_path = envfolder.json_converted(json_file_without_ext)
-    
-    title = f"Converting csv to json from {csv_path}"
-    modul.show_loading(title)
-    try:
-        csv_data = []
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                lowercased_row = {key.lower(): value for key, value in row.items()}
-                csv_data.append(lowercased_row)
-        with open(result_path, 'w', encoding='utf-8') as file:
-            json.dump(csv_data, file, indent=4)
-            print("File CSV berhasil diubah menjadi JSON.........\n")
-        return csv_data
-    except FileNotFoundError as e:
-        print(Fore.RED + "File CSV tidak ditemukan di path:", str(e) + Style.RESET_ALL)
-        raise
-    except Exception as e:
-        print(Fore.RED + "Terjadi kesalahan saat mengonversi file CSV menjadi JSON:", str(e) + Style.RESET_ALL)
-        raise
+
+    def __init__(self, path, snapshot_path=None):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.complete = threading.Event()
+        self._scanned = [0, 0]
+        self._consumed = [0, 0]
+        self._lock = threading.Lock()
+        self.kb, self.kb_path = envkb.open_compiled(path)
+        if self.kb is not None:
+            self._scanned = list(self.kb.totals())
+            self.complete.set()
+        self._scanner = None
+        if self.kb is None or snapshot_path:
+            self._scanner = threading.Thread(target=self._scan, name="test-data-scan", daemon=True)
+            self._scanner.start()
+
+    def _rows(self, normalized=True):
+        return self.kb.iter_rows(normalized) if self.kb is not None else iter_rows(self.path)
+
+    def _scan(self):
+        try:
+            writer = envkb.KBWriter(self.kb_path) if self.kb is None and self.kb_path else None
+            snapshot = open(self.snapshot_path, 'w', encoding='utf-8') if self.snapshot_path else None
+            try:
+                if snapshot:
+                    snapshot.write("[")
+                for position, row in enumerate(self._rows(normalized=False)):
+                    if self.kb is None:
+                        with self._lock:
+                            self._scanned[0] += 1
+                            self._scanned[1] += count_questions(row)
+                    if writer:
+                        writer.add(row)
+                    if snapshot:
+                        item = json.dumps(row, indent=4, default=str).replace("\n", "\n    ")
+                        snapshot.write(("," if position else "") + "\n    " + item)
+                if snapshot:
+                    snapshot.write("\n]")
+            finally:
+                if snapshot:
+                    snapshot.close()
+            self.complete.set()
+            if writer:
+                writer.close()
+        except Exception as e:
+            print(Fore.RED + f"Terjadi kesalahan saat membaca file uji {self.path}:", str(e) + Style.RESET_ALL)
+
+    def __iter__(self):
+        with self._lock:
+            self._consumed = [0, 0]
+        for row in self._rows():
+            with self._lock:
+                self._consumed[0] += 1
+                self._consumed[1] += count_questions(row)
+            yield row
+
+    def __bool__(self):
+        rows = iter(self)
+        try:
+            return next(rows, None) is not None
+        finally:
+            rows.close()
+
+    def close(self):
+        """
+        Menunggu pembacaan background selesai (snapshot KB dan salinan JSON
+        ditulis lengkap), lalu menutup snapshot KB yang di-memory-map.
+        """
+        if self._scanner is not None:
+            self._scanner.join()
+        if self.kb is not None:
+            self.kb.close()
+            self.kb = None
+
+    def totals(self):
+        """(total_title, total_question); final setelah `complete` di-set."""
+        with self._lock:
+            if self.complete.is_set():
+                return tuple(self._scanned)
+            return max(self._scanned[0], self._consumed[0]), max(self._scanned[1], self._consumed[1])
+
+
+def test_data_totals(json_data, total_title=None, total_question=None):
+    """
+    Total topik dan pertanyaan untuk data uji. TestData mengembalikan total
+    (sementara) dari pembacaan streaming; untuk list dipakai total yang
+    diberikan atau dihitung langsung.
+    """
+    if isinstance(json_data, TestData):
+        return json_data.totals()
+    if total_title is not None and total_question is not None:
+        return total_title, total_question
+    return len(json_data), sum(count_questions(item) for item in json_data)
+
 
 @modul.log_function_status
-def convert_excel_to_json(excel_filename_with_ext, json_file_without_ext):
+def load_test_data(filename_with_ext, json_file_without_ext):
     """
-    Mengonversi file Excel menjadi JSON.
+    Membuka file uji CSV/Excel dari assets/ sebagai TestData (streaming).
     """
-    excel_path = f'assets/xlsx/{excel_filename_with_ext}'
-    result_path = envfolder.json_converted(json_file_without_ext)
+    extension = os.path.splitext(filename_with_ext)[1].lower()
+    path = f'{TEST_DATA_FOLDERS[extension]}/{filename_with_ext}'
 
-    title = f"Converting excel to json from {excel_path}"
+    title = f"Reading test data from {path}"
     modul.show_loading(title)
-    try:
-        df = pd.read_excel(excel_path)
-        # Mengganti nama kolom menjadi huruf kecil
-        df.columns = map(str.lower, df.columns)
-        excel_data = df.to_dict(orient='records')
-        
-        with open(result_path, 'w', encoding='utf-8') as file:
-            json.dump(excel_data, file, indent=4)
-            print("File Excel berhasil diubah menjadi JSON.........\n")
-        return excel_data
-    except FileNotFoundError as e:
-        print(Fore.RED + "File Excel tidak ditemukan di path:", str(e) + Style.RESET_ALL)
-        raise
-    except Exception as e:
-        print(Fore.RED + "Terjadi kesalahan saat mengonversi file Excel menjadi JSON:", str(e) + Style.RESET_ALL)
-        raise
+    if not os.path.isfile(path):
+        print(Fore.RED + "File uji tidak ditemukan di path:", path + Style.RESET_ALL)
+        raise FileNotFoundError(path)
+    snapshot_path = envfolder.json_converted(json_file_without_ext) if SAVE_CONVERTED_JSON else None
+    return TestData(path, snapshot_path)
 
 @modul.log_function_status
 def read_json(jsonFile):
@@ -78,95 +210,76 @@ def read_json(jsonFile):
         raise
 
 @modul.log_function_status
-def write_json_data_bot(data_bot, report_filename, id_test):
+def write_json_data_bot(data_bot, report_filename, id_test, order=None, key=None):
     """
-    Menulis atau memperbarui data bot ke dalam file JSON.
+    Menambahkan data bot ke journal hasil (append-only).
     """
     full_report_name = f"{report_filename}-{id_test}"
-    result_path = envfolder.write_json_data_bot(full_report_name)
 
     try:
-        try:
-            with open(result_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"summary": [], "chart": [], "data": []}
-
-        data["data"].append(data_bot)
-
-        with open(result_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4)
-            
+        return envjournal.get_journal(full_report_name).append_data(data_bot, order, key)
     except Exception as e:
         print(f"Error writing to JSON file: {e}")
 
 @modul.log_function_status
 def write_json_data_summary(data_summary, report_filename, id_test):
     """
-    Menulis atau memperbarui data summary ke dalam file JSON.
+    Memperbarui data summary di journal hasil.
     """
     full_report_name = f"{report_filename}-{id_test}"
-    result_path = envfolder.write_json_data_summary(full_report_name)
-    
-    try:
-        try:
-            with open(result_path, 'r') as f:
-                data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"summary": [], "chart": [], "data": []}
-
-        data['summary'] = [data_summary]
 
-        with open(result_path, 'w') as f:
-            json.dump(data, f, indent=4)
-            
+    try:
+        envjournal.get_journal(full_report_name).update_summary(data_summary)
     except Exception as e:
         print(f"Error writing summary to JSON file: {e}")
 
 @modul.log_function_status
-def write_json_chart(chart_data, report_filename, id_test):
+def write_json_chart(chart_data, report_filename, id_test, order=None, key=None):
     """
-    Menambahkan data chart ke dalam file JSON.
+    Menambahkan data chart ke journal hasil.
     """
     full_report_name = f"{report_filename}-{id_test}"
-    result_path = envfolder.write_json_chart(full_report_name)
-    
-    try:
-        try:
-            with open(result_path, 'r') as f:
-                data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"summary": [], "chart": [], "data": []}
-
-        data['chart'].append(chart_data)
-
-        with open(result_path, 'w') as f:
-            json.dump(data, f, indent=4)
 
+    try:
+        envjournal.get_journal(full_report_name).append_chart(chart_data, order, key)
     except Exception as e:
         print(f"Error writing chart data to JSON file: {e}")
 
 
 @modul.log_function_status
-def write_end_time_summary(end_time, duration, report_filename, id_test):
+def write_summary_metrics(metrics, report_filename, id_test):
     """
-    Memperbarui summary dengan end_time dan duration.
+    Menambahkan metrik run (mis. hit/miss cache LLM) ke summary yang sudah ada.
     """
     full_report_name = f"{report_filename}-{id_test}"
-    result_path = envfolder.write_json_data_summary(full_report_name)
+    if not envjournal.is_active(full_report_name):
+        return
 
     try:
-        with open(result_path, 'r') as f:
-            data = json.load(f)
+        journal = envjournal.get_journal(full_report_name)
+        if journal.summary:
+            journal.update_summary(metrics)
+    except Exception as e:
+        print(f"Error writing metrics to summary: {e}")
 
-        if data['summary']:
-            data['summary'][0]['end_time_test'] = end_time
-            data['summary'][0]['duration'] = duration
+@modul.log_function_status
+def write_end_time_summary(end_time, duration, report_filename, id_test):
+    """
+    Memperbarui summary dengan end_time dan duration, lalu menulis file JSON
+    report lengkap dari journal.
+    """
+    full_report_name = f"{report_filename}-{id_test}"
+    result_path = envfolder.journal(full_report_name)
 
-        with open(result_path, 'w') as f:
-            json.dump(data, f, indent=4)
+    if not envjournal.is_active(full_report_name) and not os.path.exists(result_path):
+        print(f"File not found or empty, cannot write end time: {result_path}")
+        return
 
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"File not found or empty, cannot write end time: {e}")
+    try:
+        journal = envjournal.get_journal(full_report_name)
+        if journal.summary:
+            journal.update_summary({"end_time_test": end_time, "duration": duration})
+        journal.materialize()
+        envjournal.close_journal(full_report_name)
     except Exception as e:
-        print(f"Error writing end time to summary: {e}")
\ No newline at end of file
+        print(f"Error writing end time to summary: {e}")
@@ -1,8 +1,25 @@
 import os
+import glob
 from datetime import datetime
 
+# Tanggal folder report/log untuk run ini. Run yang dilanjutkan (--resume) memakai
+# tanggal folder journal aslinya agar semua hasil tetap berada di satu tempat.
+RUN_DATE = None
+
+def run_date():
+    return RUN_DATE or datetime.now().strftime('%Y-%m-%d')
+
+def use_run_date(date):
+    global RUN_DATE
+    RUN_DATE = date
+
+def find_journal(report_filename):
+    # Journal terbaru dengan nama ini di folder tanggal mana pun, atau None
+    matches = sorted(glob.glob(f'report/json/*/{glob.escape(report_filename)}.jsonl'))
+    return matches[-1] if matches else None
+
 def json_converted(json_file):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'assets/json/converted/{tanggal_hari_ini}'
@@ -15,7 +32,7 @@ def json_converted(json_file):
     return result_path
     
 def read_json(json_file):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'assets/json/converted/{tanggal_hari_ini}'
@@ -28,7 +45,7 @@ def read_json(json_file):
     return result_path
 
 def write_json_data_bot(report_filename):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/json/{tanggal_hari_ini}'
@@ -41,7 +58,7 @@ def write_json_data_bot(report_filename):
     return result_path
 
 def write_json_data_summary(report_filename):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/json/{tanggal_hari_ini}'
@@ -54,7 +71,7 @@ def write_json_data_summary(report_filename):
     return result_path
 
 def write_json_chart(report_filename):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/json/{tanggal_hari_ini}'
@@ -67,7 +84,7 @@ def write_json_chart(report_filename):
     return result_path
 
 def calculate(report_filename):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/json/{tanggal_hari_ini}'
@@ -80,7 +97,7 @@ def calculate(report_filename):
     return result_path
 
 def log(report_filename, id_test):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'log/{tanggal_hari_ini}'
@@ -93,7 +110,7 @@ def log(report_filename, id_test):
     return result_path
     
 def report_html(report_filename):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/html/{tanggal_hari_ini}'
@@ -106,7 +123,7 @@ def report_html(report_filename):
     return result_path
 
 def report_screenshoot(id_test):
-    tanggal_hari_ini = datetime.now().strftime('%Y-%m-%d')
+    tanggal_hari_ini = run_date()
 
     # Membuat path lengkap untuk folder
     folder_path = f'report/screenshoot/{tanggal_hari_ini}'
@@ -119,4 +136,50 @@ def report_screenshoot(id_test):
     if not os.path.exists(result_path):
         os.makedirs(result_path)
     
+    return result_path
+
+def journal(report_filename):
+    tanggal_hari_ini = run_date()
+
+    # Membuat path lengkap untuk folder
+    folder_path = f'report/json/{tanggal_hari_ini}'
+    result_path = f'{folder_path}/{report_filename}.jsonl'
+
+    # Membuat folder jika belum ada
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+
+    return result_path
+
+def llm_cache():
+    # Cache tidak bergantung tanggal agar bisa dipakai lintas run
+    folder_path = 'cache'
+    result_path = f'{folder_path}/llm_cache.sqlite3'
+
+    # Membuat folder jika belum ada
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+
+    return result_path
+
+def webdriver_cache(browser, version=None):
+    # Driver disimpan per versi mayor browser dan dipakai lintas run
+    folder_path = f'cache/webdriver/{browser}'
+    result_path = f'{folder_path}/{version}' if version else folder_path
+
+    # Membuat folder jika belum ada
+    if not os.path.exists(result_path):
+        os.makedirs(result_path)
+
+    return result_path
+
+def kb_cache(kb_name):
+    # Snapshot knowledge base terkompilasi, dipakai lintas run selama file sumber tidak berubah
+    folder_path = 'cache/kb'
+    result_path = f'{folder_path}/{kb_name}.kb'
+
+    # Membuat folder jika belum ada
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+
     return result_path
\ No newline at end of file
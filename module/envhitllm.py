@@ -1,24 +1,19 @@
-import requests
 import re   
 import json
 import time
 import os
+from module import envllmcache, envhttp
 
 api_key_openruter = os.getenv("API_KEY_OPENROUTER")
 
-def prompt_evaluator():
-    PROMPT_TEMPLATE = """
-        Kamu adalah evaluator. Berikan skor dari 0 sampai 1 seberapa sesuai jawaban berikut dengan harapan.
+AI_OPENROUTER = "OPENROUTER AI"
+AI_GEMINI = "GEMINI AI"
 
-        Expected Output:
-        {expected_output}
+OPENROUTER_MODEL = "deepseek/deepseek-prover-v2:free"
+GEMINI_MODEL = "gemini-2.5-flash-lite-preview-06-17"
 
-        Actual Output:
-        {actual_output}
-
-        Tugas kamu adalah memberikan skor evaluasi antara 0 sampai 1 berdasarkan kesesuaian dan relevansi antara actual output dengan expected output.
-
-        Ikuti aturan berikut secara ketat:
+# Aturan penilaian yang dipakai bersama oleh prompt tunggal dan prompt batch
+EVALUATION_RULES = """        Ikuti aturan berikut secara ketat:
         1. Skor harus berada dalam rentang [0.0, 1.0].
         2. Jika actual output tidak relevan atau sangat berbeda konteks dari expected output, berikan skor 0.0 hingga 0.45 karena perbedaan makna utama.
         3. Jika actual output relevan sebagian tetapi tidak lengkap, berikan skor antara 0.5 hingga 0.95 tergantung seberapa besar bagian informasi penting yang hilang atau kurang akurat.
@@ -29,7 +24,21 @@ def prompt_evaluator():
         6. Untuk data expected dan actual output yang identik atau sangat mirip, skor evaluasi harus selalu konsisten jika evaluasi diulang.
         7. Penjelasan hasil evaluasi wajib mencantumkan minimal 1 kalimat jelas yang menyebutkan perbedaan atau kesalahan utama secara spesifik (contoh: “Nama produk salah, expected adalah BRINS ASRI tetapi yang disebut BRINS DIRI, sehingga makna utama berubah” atau “Output kurang menyebutkan jenis produk yang diminta” atau “Informasi tambahan tapi relevan tetap dapat diterima”) dan bisa ditambah kalimat kedua untuk memperjelas konteks perbedaan jika diperlukan.
 
-        Format keluaran wajib dan tidak boleh diubah:
+"""
+
+def prompt_evaluator():
+    PROMPT_TEMPLATE = """
+        Kamu adalah evaluator. Berikan skor dari 0 sampai 1 seberapa sesuai jawaban berikut dengan harapan.
+
+        Expected Output:
+        {expected_output}
+
+        Actual Output:
+        {actual_output}
+
+        Tugas kamu adalah memberikan skor evaluasi antara 0 sampai 1 berdasarkan kesesuaian dan relevansi antara actual output dengan expected output.
+
+""" + EVALUATION_RULES + """        Format keluaran wajib dan tidak boleh diubah:
         Skor: X.XX  
         Penjelasan: [Penjelasan detail sesuai perbedaan dan kelengkapan informasi].
 
@@ -40,19 +49,24 @@ def prompt_evaluator():
 
 def hit_llm_to_scoring(response_bot, respond_text):
 
-    AI = "OPENROUTER AI"
+    AI = AI_OPENROUTER
+    cached = envllmcache.get(OPENROUTER_MODEL, prompt_evaluator(), respond_text, response_bot)
+    if cached:
+        score, output, explanation = cached
+        return score, output, explanation, AI
+
     prompt = prompt_evaluator().format(
         expected_output=respond_text,
         actual_output=response_bot
     )
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    url = f"{envhttp.OPENROUTER_BASE_URL}/api/v1/chat/completions"
     headers = {
         "Authorization": "Bearer " + api_key_openruter,
         "Content-Type": "application/json"
     }
     data = {
-        "model": "deepseek/deepseek-prover-v2:free",
+        "model": OPENROUTER_MODEL,
         "temperature": 0,
         "top_p":0.5,
         "messages": [
@@ -67,7 +81,8 @@ def hit_llm_to_scoring(response_bot, respond_text):
 
     try:
 
-        result = requests.post(url, headers=headers, data=json.dumps(data))
+        result = envhttp.get_client("openrouter").post(url, headers=headers, data=json.dumps(data))
+        result.raise_for_status()
         result_json = result.json()
         output = result_json["choices"][0]["message"]["content"]
 
@@ -77,10 +92,16 @@ def hit_llm_to_scoring(response_bot, respond_text):
         # Ambil penjelasan
         match_exp = re.search(r"Penjelasan[:\s]+(.+)", output)
         explanation = match_exp.group(1).strip() if match_exp else "Tidak ditemukan penjelasan."
+
+        # Hanya hasil yang berhasil diparse yang disimpan ke cache
+        if match:
+            envllmcache.put(OPENROUTER_MODEL, prompt_evaluator(), respond_text, response_bot, score, output, explanation)
     
     except Exception as e:
+        # Request gagal (mis. retry habis): belum ada penilaian, bukan jawaban yang salah
         output = f"ERROR: {str(e)}"
-        score = 0.0
+        score = None
+        explanation = f"Skoring gagal: {e}"
 
     # print("OPENROUTER AI")
     # print("Score:", score)
@@ -89,19 +110,11 @@ def hit_llm_to_scoring(response_bot, respond_text):
 
     return score, output, explanation, AI
 
-def hit_llm_to_scoring_gemini(response_bot, respond_text):
+def gemini_request(prompt):
+    """Mengirim satu prompt ke Gemini (mode JSON) dan mengembalikan teks output."""
     api_key_gemini = os.getenv("API_KEY_GEMINI")
 
-    # response_bot = "Jenis asuransi ini memberikan perlindungan finansial terhadap risiko kehidupan dan kematian pemegang polis. Karakteristik utama asuransi jiwa adalah pemberian manfaat berupa uang pertanggungan kepada ahli waris jika pemegang polis berpulang. Apabila pemegang polis masih hidup dalam jangka waktu yang ditentukan, mereka akan mendapatkan manfaat dalam bentuk nilai tunai.Manfaat dan perlindungan yang diberikan asuransi jiwa berupa uang pertanggungan yang bisa digunakan untuk memenuhi kebutuhan sehari-hari.	"
-    # respond_text = "Asuransi jiwa adalah jenis asuransi yang memberikan perlindungan finansial terhadap risiko kehidupan dan kematian pemegang polis.Jika pemegang polis berpulang, ahli waris akan menerima uang pertanggungan.Kalau pemegang polis masih hidup dalam jangka waktu yang ditentukan, mereka bisa mendapatkan manfaat dalam bentuk nilai tunai.Jadi, asuransi jiwa membantu memenuhi kebutuhan sehari-hari keluarga yang ditinggalkan. Ada lagi yang ingin Anda tahu?	"
-
-    AI = "GEMINI AI"
-    prompt = prompt_evaluator().format(
-        expected_output=respond_text,
-        actual_output=response_bot
-    )
-    
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite-preview-06-17:generateContent?key=" + api_key_gemini
+    url = f"{envhttp.GEMINI_BASE_URL}/v1beta/models/{GEMINI_MODEL}:generateContent?key=" + api_key_gemini
     headers = {
         "Content-Type": "application/json"
     }
@@ -135,13 +148,37 @@ def hit_llm_to_scoring_gemini(response_bot, respond_text):
         }
     }
 
+    result = envhttp.get_client("gemini").post(url, headers=headers, data=json.dumps(data))
+    result.raise_for_status()
+    result_json = result.json()
+    return result_json["candidates"][0]["content"]["parts"][0]["text"]
+
+def hit_llm_to_scoring_gemini(response_bot, respond_text):
+    # response_bot = "Jenis asuransi ini memberikan perlindungan finansial terhadap risiko kehidupan dan kematian pemegang polis. Karakteristik utama asuransi jiwa adalah pemberian manfaat berupa uang pertanggungan kepada ahli waris jika pemegang polis berpulang. Apabila pemegang polis masih hidup dalam jangka waktu yang ditentukan, mereka akan mendapatkan manfaat dalam bentuk nilai tunai.Manfaat dan perlindungan yang diberikan asuransi jiwa berupa uang pertanggungan yang bisa digunakan untuk memenuhi kebutuhan sehari-hari.	"
+    # respond_text = "Asuransi jiwa adalah jenis asuransi yang memberikan perlindungan finansial terhadap risiko kehidupan dan kematian pemegang polis.Jika pemegang polis berpulang, ahli waris akan menerima uang pertanggungan.Kalau pemegang polis masih hidup dalam jangka waktu yang ditentukan, mereka bisa mendapatkan manfaat dalam bentuk nilai tunai.Jadi, asuransi jiwa membantu memenuhi kebutuhan sehari-hari keluarga yang ditinggalkan. Ada lagi yang ingin Anda tahu?	"
+
+    AI = AI_GEMINI
+    # Pasangan yang sudah diskor dalam batch tersimpan dengan key prompt batch
+    cached = envllmcache.get_any(GEMINI_MODEL, [prompt_evaluator(), prompt_evaluator_batch()], respond_text, response_bot)
+    if cached:
+        score, output, explanation = cached
+        return score, output, explanation, AI
+
+    return score_gemini(response_bot, respond_text)
+
+def score_gemini(response_bot, respond_text):
+    """Skoring satu pasangan lewat Gemini tanpa memeriksa cache terlebih dahulu."""
+    AI = AI_GEMINI
+    prompt = prompt_evaluator().format(
+        expected_output=respond_text,
+        actual_output=response_bot
+    )
+
     score = 0.0
     explanation = "Terjadi kesalahan saat memproses output."
 
     try:
-        result = requests.post(url, headers=headers, data=json.dumps(data))
-        result_json = result.json()
-        output = result_json["candidates"][0]["content"]["parts"][0]["text"]
+        output = gemini_request(prompt)
 
         # Ambil skor
         match = re.search(r'"Skor"\s*:\s*([0-1](?:\.\d+)?)', output, re.DOTALL | re.IGNORECASE)
@@ -151,20 +188,119 @@ def hit_llm_to_scoring_gemini(response_bot, respond_text):
         match_exp = re.search(r'"Penjelasan":\s*"(.+?)"', output, re.DOTALL | re.IGNORECASE)
         explanation = match_exp.group(1).strip() if match_exp else "Tidak ditemukan penjelasan."
 
+        # Hanya hasil yang berhasil diparse yang disimpan ke cache
+        if match:
+            envllmcache.put(GEMINI_MODEL, prompt_evaluator(), respond_text, response_bot, score, output, explanation)
     
     except Exception as e:
+        # Request gagal (mis. retry habis): belum ada penilaian, bukan jawaban yang salah
         output = f"ERROR: {str(e)}"
-        score = 0.0
+        score = None
+        explanation = f"Skoring gagal: {e}"
 
     # print("\n\n")
     # print("GEMINI AI")
-    # print("Output All", result_json)
     # print("Score:", score)
     # print("LLM Output:", output)
     # print("Explanation:", explanation)
 
     return score, output, explanation, AI
 
+def prompt_evaluator_batch():
+    PROMPT_TEMPLATE = """
+        Kamu adalah evaluator. Berikan skor dari 0 sampai 1 seberapa sesuai setiap jawaban berikut dengan harapan.
+
+        Daftar pasangan yang dinilai (JSON, setiap item punya id, expected_output dan actual_output):
+        {pairs}
+
+        Nilai setiap pasangan secara terpisah. Tugas kamu adalah memberikan skor evaluasi antara 0 sampai 1 berdasarkan kesesuaian dan relevansi antara actual output dengan expected output pada pasangan tersebut.
+
+""" + EVALUATION_RULES + """        Format keluaran wajib dan tidak boleh diubah, berupa JSON array dengan satu objek untuk setiap id:
+        [{{"id": 1, "Skor": X.XX, "Penjelasan": "[Penjelasan detail sesuai perbedaan dan kelengkapan informasi]"}}]
+
+        Jangan menambahkan apapun di luar JSON array tersebut, hasil harus tegas, konsisten, dan menjelaskan alasan penilaian secara cukup jelas agar mudah dipahami.
+        """
+    return PROMPT_TEMPLATE
+
+def parse_batch_output(output, count):
+    """
+    Mengambil skor per item dari output batch. Mengembalikan dict id -> (skor, penjelasan);
+    item yang tidak valid tidak dimasukkan sehingga bisa diskor ulang satu per satu.
+    """
+    parsed = {}
+    try:
+        items = json.loads(output)
+    except json.JSONDecodeError:
+        return parsed
+
+    if isinstance(items, dict):
+        items = items.get("results") or items.get("data") or []
+    if not isinstance(items, list):
+        return parsed
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            item_id = int(item.get("id"))
+            score = float(item.get("Skor", item.get("skor")))
+        except (TypeError, ValueError):
+            continue
+        explanation = str(item.get("Penjelasan", item.get("penjelasan", ""))).strip()
+        if 1 <= item_id <= count and 0.0 <= score <= 1.0 and explanation:
+            parsed[item_id] = (score, explanation)
+    return parsed
+
+def hit_llm_to_scoring_gemini_batch(pairs):
+    """
+    Skoring beberapa pasangan (response_bot, respond_text) dalam satu request Gemini.
+    Hasil dari cache dipakai langsung, dan item yang gagal diparse diskor ulang
+    satu per satu. Mengembalikan list (score, output, explanation, AI) sesuai urutan input.
+
+    Hasil batch di-cache dengan key template batch (prompt_evaluator_batch), terpisah
+    dari hasil prompt tunggal, sehingga perubahan salah satu prompt hanya
+    membatalkan cache miliknya sendiri. Jalur batch dan jalur tunggal
+    (hit_llm_to_scoring_gemini) sama-sama mencari di kedua key.
+    """
+    AI = AI_GEMINI
+    results = [None] * len(pairs)
+
+    pending = []
+    for i, (response_bot, respond_text) in enumerate(pairs):
+        # Item yang sebelumnya diskor satu per satu tersimpan dengan key prompt tunggal
+        cached = envllmcache.get_any(GEMINI_MODEL, [prompt_evaluator_batch(), prompt_evaluator()], respond_text, response_bot)
+        if cached:
+            score, output, explanation = cached
+            results[i] = (score, output, explanation, AI)
+        else:
+            pending.append(i)
+
+    if len(pending) > 1:
+        batch_items = [
+            {"id": n, "expected_output": pairs[i][1], "actual_output": pairs[i][0]}
+            for n, i in enumerate(pending, start=1)
+        ]
+        prompt = prompt_evaluator_batch().format(pairs=json.dumps(batch_items, ensure_ascii=False, indent=2))
+        try:
+            parsed = parse_batch_output(gemini_request(prompt), len(pending))
+        except Exception as e:
+            print(f"Batch scoring gagal, fallback ke skoring per item: {e}")
+            parsed = {}
+
+        for n, i in enumerate(pending, start=1):
+            if n in parsed:
+                score, explanation = parsed[n]
+                output = json.dumps({"Skor": score, "Penjelasan": explanation}, ensure_ascii=False)
+                response_bot, respond_text = pairs[i]
+                envllmcache.put(GEMINI_MODEL, prompt_evaluator_batch(), respond_text, response_bot, score, output, explanation)
+                results[i] = (score, output, explanation, AI)
+
+    for i in pending:
+        if results[i] is None:
+            results[i] = score_gemini(*pairs[i])
+
+    return results
+
 # response_bot = "Jenis asuransi ini memberikan perlindungan finansial terhadap risiko kehidupan dan kematian pemegang polis. Karakteristik utama asuransi jiwa adalah pemberian manfaat berupa uang pertanggungan kepada ahli waris jika pemegang polis berpulang. Apabila pemegang polis masih hidup dalam jangka waktu yang ditentukan, mereka akan mendapatkan manfaat dalam bentuk nilai tunai.Manfaat dan perlindungan yang diberikan asuransi jiwa berupa uang pertanggungan yang bisa digunakan untuk memenuhi kebutuhan sehari-hari.	"
 # respond_text = "testinng"
 # hit_llm_to_scoring_gemini(response_bot, respond_text)
@@ -0,0 +1,156 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URL provider bisa diarahkan ke server stub lokal untuk pengujian
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai")
+
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+# Retry-After dari server dihormati sampai batas ini (detik), terpisah dari LLM_BACKOFF_MAX
+LLM_RETRY_AFTER_MAX = float(os.getenv("LLM_RETRY_AFTER_MAX", "900"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+# Batas request per menit dan burst per provider (token bucket)
+PROVIDER_LIMITS = {
+    "gemini": (float(os.getenv("GEMINI_RPM", "60")), int(os.getenv("GEMINI_BURST", "5"))),
+    "openrouter": (float(os.getenv("OPENROUTER_RPM", "20")), int(os.getenv("OPENROUTER_BURST", "2"))),
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Rate limiter sederhana: `rate_per_minute` token diisi ulang, maksimum `capacity`."""
+
+    def __init__(self, rate_per_minute, capacity):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Mengambil satu token, menunggu jika perlu. Mengembalikan lama menunggu (detik)."""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def retry_after_seconds(response):
+    """Membaca header Retry-After (detik atau HTTP-date). None jika tidak ada."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt):
+    """Exponential backoff dengan jitter: base * 2^attempt, dibatasi LLM_BACKOFF_MAX."""
+    delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class EvaluatorClient:
+    """
+    Client HTTP bersama untuk evaluator LLM: koneksi keep-alive yang di-pool,
+    timeout connect/read, retry dengan backoff (menghormati Retry-After) dan
+    rate limit per provider.
+    """
+
+    def __init__(self, provider, rate_per_minute, burst):
+        self.provider = provider
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_POOL_SIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.metrics = {"requests": 0, "retries": 0, "throttle_wait": 0.0, "backoff_wait": 0.0, "errors": 0}
+        self._metrics_lock = threading.Lock()
+
+    def _record(self, key, value=1):
+        with self._metrics_lock:
+            self.metrics[key] += value
+
+    def post(self, url, **kwargs):
+        kwargs.setdefault("timeout", (LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT))
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            self._record("throttle_wait", self.bucket.acquire())
+            self._record("requests")
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == LLM_MAX_RETRIES:
+                    self._record("errors")
+                    raise
+                delay = backoff_seconds(attempt)
+                print(f"⚠️ {self.provider} request gagal ({e}), retry dalam {delay:.1f} detik")
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    return response
+                if attempt == LLM_MAX_RETRIES:
+                    self._record("errors")
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_seconds(attempt)
+                else:
+                    delay = min(delay, LLM_RETRY_AFTER_MAX)
+                print(f"⚠️ {self.provider} membalas {response.status_code}, retry dalam {delay:.1f} detik")
+
+            self._record("retries")
+            self._record("backoff_wait", delay)
+            time.sleep(delay)
+
+
+def get_client(provider):
+    """Mengambil client bersama untuk provider ('gemini' atau 'openrouter')."""
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            rate_per_minute, burst = PROVIDER_LIMITS[provider]
+            client = EvaluatorClient(provider, rate_per_minute, burst)
+            _clients[provider] = client
+        return client
+
+
+def metrics():
+    """Metrik gabungan semua provider untuk ditampilkan di summary report."""
+    result = {"llm_requests": 0, "llm_retries": 0, "llm_throttle_wait": 0.0, "llm_backoff_wait": 0.0, "llm_errors": 0}
+    for client in list(_clients.values()):
+        with client._metrics_lock:
+            for key, value in client.metrics.items():
+                result[f"llm_{key}"] += value
+    result["llm_throttle_wait"] = round(result["llm_throttle_wait"], 2)
+    result["llm_backoff_wait"] = round(result["llm_backoff_wait"], 2)
+    return result
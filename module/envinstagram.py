@@ -1,5 +1,8 @@
 import os
 import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from instagrapi import Client
 from instagrapi.exceptions import ClientError, LoginRequired
@@ -7,6 +10,23 @@ from instagrapi.exceptions import ClientError, LoginRequired
 # Shared Instagram client instance
 cl = None
 
+# Reply polling: start fast, back off while the bot is still typing
+INSTAGRAM_REPLY_TIMEOUT = float(os.getenv("INSTAGRAM_REPLY_TIMEOUT", "60"))
+INSTAGRAM_POLL_MIN = float(os.getenv("INSTAGRAM_POLL_MIN", "1"))
+INSTAGRAM_POLL_MAX = float(os.getenv("INSTAGRAM_POLL_MAX", "8"))
+INSTAGRAM_POLL_BACKOFF = 1.5
+# After the first reply, keep polling until the bot has been quiet this long (seconds)
+# so that multi-part replies are collected in full
+INSTAGRAM_QUIET_PERIOD = float(os.getenv("INSTAGRAM_QUIET_PERIOD", "3"))
+INSTAGRAM_FETCH_AMOUNT = 20
+
+# username -> user_id / thread_id, resolved once per run
+_user_ids = {}
+_thread_ids = {}
+
+# instagrapi is blocking and not thread-safe: all calls run on one dedicated thread
+_executor = None
+
 def initialize_instagram_api():
     """
     Initializes the Instagram client, logs in using a session file,
@@ -35,16 +55,46 @@ def initialize_instagram_api():
         print(f"An unexpected error occurred during session login: {e}")
         raise
 
+def get_user_id(username: str):
+    """
+    Resolves a username to its user id once and caches it.
+    """
+    if username not in _user_ids:
+        _user_ids[username] = cl.user_id_from_username(username)
+    return _user_ids[username]
+
+def get_thread_id(username: str):
+    """
+    Returns the DM thread id with a user. The id is normally learned from
+    direct_send; the inbox is scanned only if it is not known yet.
+    """
+    if username in _thread_ids:
+        return _thread_ids[username]
+
+    target_user_id = str(get_user_id(username))
+    for thread in cl.direct_threads(amount=20):
+        if target_user_id in [str(user.pk) for user in thread.users]:
+            _thread_ids[username] = thread.id
+            return thread.id
+    return None
+
 def send_message(username: str, text: str):
     """
-    Sends a direct message to a user.
+    Sends a direct message to a user, reusing the known thread when possible.
     """
     if not cl:
         raise Exception("Instagram client not initialized.")
     try:
-        user_id = cl.user_id_from_username(username)
-        print(f"Sending message to '{username}' (User ID: {user_id})...")
-        cl.direct_send(text, user_ids=[user_id])
+        thread_id = _thread_ids.get(username)
+        if thread_id:
+            print(f"Sending message to '{username}' (Thread ID: {thread_id})...")
+            message = cl.direct_send(text, thread_ids=[thread_id])
+        else:
+            user_id = get_user_id(username)
+            print(f"Sending message to '{username}' (User ID: {user_id})...")
+            message = cl.direct_send(text, user_ids=[user_id])
+            if getattr(message, "thread_id", None):
+                _thread_ids[username] = message.thread_id
         print("Message sent successfully.")
         # Return the current time to be used as a marker for the new message
         return time.time()
@@ -52,52 +102,117 @@ def send_message(username: str, text: str):
         print(f"Failed to send message to {username}: {e}")
         return None
 
-def get_latest_message(username: str, after_timestamp: float) -> str:
+def get_latest_message(username: str, after_timestamp: float, cancel_event: threading.Event = None) -> str:
     """
-    Gets the latest message from a user in a DM thread that arrived AFTER a specific timestamp.
-    This method is more robust by iterating through all threads to find the correct one.
+    Gets the messages from a user that arrived AFTER a specific timestamp.
+    Only the known DM thread is polled, with an interval that starts at
+    INSTAGRAM_POLL_MIN and grows up to INSTAGRAM_POLL_MAX. Once the first
+    message arrives, polling continues every INSTAGRAM_POLL_MIN until no new
+    message has arrived for INSTAGRAM_QUIET_PERIOD, and all parts are joined.
+    Polling stops early when `cancel_event` is set.
     """
+    cancel_event = cancel_event or threading.Event()
     if not cl:
         raise Exception("Instagram client not initialized.")
 
     try:
-        target_user_id = cl.user_id_from_username(username)
-        my_user_id = cl.user_id
-        
-        print(f"Polling for a new message from '{username}' for up to 60 seconds...")
-        timeout = 60  # seconds
+        target_user_id = str(get_user_id(username))
+        thread_id = get_thread_id(username)
+        if not thread_id:
+            print(f"No DM thread found with '{username}'.")
+            return ""
+
+        print(f"Polling thread {thread_id} for a new message from '{username}' for up to {INSTAGRAM_REPLY_TIMEOUT:.0f} seconds...")
         start_time = time.time()
+        interval = INSTAGRAM_POLL_MIN
+        polls = 0
+        # message id -> message, so parts seen in several polls are kept once
+        collected = {}
+        last_new = None
+
+        def joined():
+            parts = sorted(collected.values(), key=lambda message: message.timestamp)
+            return "\n".join(message.text or "" for message in parts).strip()
+
+        while True:
+            polls += 1
+            for message in cl.direct_messages(thread_id, amount=INSTAGRAM_FETCH_AMOUNT):
+                if (str(message.user_id) == target_user_id and message.timestamp.timestamp() > after_timestamp
+                        and message.id not in collected):
+                    collected[message.id] = message
+                    last_new = time.time()
 
-        while time.time() - start_time < timeout:
-            # Fetch the first few threads from the inbox
-            threads = cl.direct_threads(amount=20)
-            
-            target_thread = None
-            for thread in threads:
-                # Find the thread that involves the target user
-                user_pks = [user.pk for user in thread.users]
-                if target_user_id in user_pks:
-                    target_thread = thread
-                    break
-            
-            if target_thread:
-                # Fetch the latest message from the identified thread
-                latest_message = target_thread.messages[0] if target_thread.messages else None
-                
-                if latest_message:
-                    # Check if the message is from the target user and is new
-                    message_timestamp = latest_message.timestamp.timestamp()
-                    
-                    if str(latest_message.user_id) == str(target_user_id) and message_timestamp > after_timestamp:
-                        print(f"Success! Received response from {username}: {latest_message.text}")
-                        return latest_message.text
-
-            print(f"No new message from {username} yet, waiting 5 seconds...")
-            time.sleep(5)
-
-        print(f"Timeout: No new message received from {username} after {timeout} seconds.")
+            now = time.time()
+            if collected and now - last_new >= INSTAGRAM_QUIET_PERIOD:
+                text = joined()
+                print(f"Success! Received {len(collected)} message(s) from {username} after {now - start_time:.1f}s ({polls} polls): {text}")
+                return text
+
+            remaining = INSTAGRAM_REPLY_TIMEOUT - (now - start_time)
+            if remaining <= 0:
+                break
+            if collected:
+                # Bot has started replying: poll quickly until it goes quiet
+                wait = min(INSTAGRAM_POLL_MIN, INSTAGRAM_QUIET_PERIOD - (now - last_new), remaining)
+            else:
+                wait = min(interval, remaining)
+                interval = min(interval * INSTAGRAM_POLL_BACKOFF, INSTAGRAM_POLL_MAX)
+            if cancel_event.wait(max(wait, 0)):
+                print(f"Polling for {username} cancelled.")
+                return ""
+
+        if collected:
+            text = joined()
+            print(f"Reply from {username} still arriving after {INSTAGRAM_REPLY_TIMEOUT:.0f} seconds, using {len(collected)} message(s): {text}")
+            return text
+        print(f"Timeout: No new message received from {username} after {INSTAGRAM_REPLY_TIMEOUT:.0f} seconds ({polls} polls).")
         return ""
 
     except Exception as e:
         print(f"An error occurred while fetching the latest message from {username}: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+def get_executor():
+    """
+    Returns the dedicated single-thread executor for instagrapi calls.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="instagram")
+    return _executor
+
+async def _run(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), func, *args)
+
+async def initialize_instagram_api_async():
+    """
+    Awaitable initialize_instagram_api that does not block the event loop.
+    """
+    await _run(initialize_instagram_api)
+
+async def send_message_async(username: str, text: str):
+    """
+    Awaitable send_message that does not block the event loop.
+    """
+    return await _run(send_message, username, text)
+
+async def get_latest_message_async(username: str, after_timestamp: float) -> str:
+    """
+    Awaitable get_latest_message. Cancelling the awaiting task also stops
+    the polling loop on the executor thread.
+    """
+    cancel_event = threading.Event()
+    try:
+        return await _run(get_latest_message, username, after_timestamp, cancel_event)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        raise
+
+def shutdown():
+    """
+    Stops the executor thread after pending calls finish.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+from module import envfolder
+
+# Jumlah record yang ditulis sebelum journal di-fsync ke disk
+FSYNC_EVERY = int(os.getenv("JOURNAL_FSYNC_EVERY", "10"))
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+class ResultJournal:
+    """
+    Penyimpanan hasil test yang append-only.
+
+    Setiap pertanyaan ditambahkan sebagai satu baris JSON ke file
+    `report/json/<tanggal>/<nama>-<id>.jsonl`. Counter pass/failed disimpan di
+    memori, dan dokumen `{"summary", "chart", "data"}` hanya dibangun sekali
+    lewat `materialize()` di akhir run.
+
+    Record boleh membawa `order` (mis. [posisi topik, urutan pertanyaan]) agar
+    hasil dari beberapa worker paralel tetap tersusun sesuai urutan file uji,
+    dan `key` (mis. [no, key pertanyaan]) agar run yang dilanjutkan bisa
+    mengenali pertanyaan yang sudah dijawab.
+    """
+
+    def __init__(self, full_report_name):
+        self.name = full_report_name
+        self.journal_path = envfolder.journal(full_report_name)
+        self.report_path = envfolder.write_json_data_bot(full_report_name)
+        self.summary = {}
+        self.chart = []
+        self.data = []
+        self.chart_order = []
+        self.data_order = []
+        self.chart_keys = []
+        self.data_keys = []
+        self.pass_count = 0
+        self.failed_count = 0
+        self._lock = threading.RLock()
+        self._unsynced = 0
+        self._replay()
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        """Membaca ulang journal yang sudah ada (mis. setelah proses terhenti)."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Baris terakhir bisa terpotong jika proses mati saat menulis
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry):
+        kind = entry.get("type")
+        if kind == "data":
+            self.data.append(entry["record"])
+            self.data_order.append(entry.get("order") or [])
+            self.data_keys.append(entry.get("key"))
+            self._count(entry["record"].get("status"), 1)
+        elif kind == "update":
+            record = self.data[entry["index"]]
+            self._count(record.get("status"), -1)
+            record.update(entry["fields"])
+            self._count(record.get("status"), 1)
+        elif kind == "chart":
+            self.chart.append(entry["record"])
+            self.chart_order.append(entry.get("order") or [])
+            self.chart_keys.append(entry.get("key"))
+        elif kind == "summary":
+            self.summary.update(entry["record"])
+
+    def _count(self, status, delta):
+        if status == "pass":
+            self.pass_count += delta
+        elif status == "failed":
+            self.failed_count += delta
+
+    def _write(self, entry):
+        self._apply(entry)
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY:
+            self.sync()
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced and not self._file.closed:
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def append_data(self, data_bot, order=None, key=None):
+        """Menambahkan satu hasil pertanyaan, mengembalikan index record-nya."""
+        with self._lock:
+            entry = {"type": "data", "record": data_bot}
+            if order is not None:
+                entry["order"] = order
+            if key is not None:
+                entry["key"] = key
+            self._write(entry)
+            return len(self.data) - 1
+
+    def update_data(self, index, fields):
+        """Memperbarui field dari record yang sudah ditulis sebelumnya."""
+        with self._lock:
+            self._write({"type": "update", "index": index, "fields": fields})
+
+    def append_chart(self, chart_data, order=None, key=None):
+        with self._lock:
+            entry = {"type": "chart", "record": chart_data}
+            if order is not None:
+                entry["order"] = order
+            if key is not None:
+                entry["key"] = key
+            self._write(entry)
+
+    def update_summary(self, data_summary):
+        with self._lock:
+            self._write({"type": "summary", "record": data_summary})
+
+    def counts(self):
+        with self._lock:
+            return self.pass_count, self.failed_count
+
+    def snapshot(self):
+        """Membangun dokumen report dari state di memori tanpa membaca file."""
+        with self._lock:
+            summary = dict(self.summary)
+            if summary:
+                summary["success"] = self.pass_count
+                summary["failed"] = self.failed_count
+            return {
+                "summary": [summary] if summary else [],
+                "chart": _ordered(self.chart, self.chart_order),
+                "data": _ordered(self.data, self.data_order),
+            }
+
+    def materialize(self):
+        """Menulis dokumen JSON report lengkap, sekali, secara atomik."""
+        data = self.snapshot()
+        temp_path = f"{self.report_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=4)
+        os.replace(temp_path, self.report_path)
+        self.sync()
+        return self.report_path
+
+    def close(self):
+        with self._lock:
+            self.sync()
+            self._file.close()
+
+
+def _ordered(items, orders):
+    """Menyalin record, diurutkan berdasarkan `order` (stabil untuk record tanpa order)."""
+    positions = sorted(range(len(items)), key=lambda i: orders[i])
+    return [dict(items[i]) for i in positions]
+
+
+def get_journal(full_report_name):
+    """Mengambil (atau membuka) journal untuk report yang sedang berjalan."""
+    with _journals_lock:
+        journal = _journals.get(full_report_name)
+        if journal is None:
+            journal = ResultJournal(full_report_name)
+            _journals[full_report_name] = journal
+        return journal
+
+
+def is_active(full_report_name):
+    return full_report_name in _journals
+
+
+def close_journal(full_report_name):
+    with _journals_lock:
+        journal = _journals.pop(full_report_name, None)
+    if journal:
+        journal.close()
+
+
+def load_report(full_report_name):
+    """
+    Mengembalikan dokumen report. Jika journal masih aktif, data diambil dari
+    memori; jika tidak, dibaca dari file JSON report.
+    """
+    journal = _journals.get(full_report_name)
+    if journal is not None:
+        return journal.snapshot()
+    with open(envfolder.write_json_data_bot(full_report_name), 'r', encoding='utf-8') as file:
+        return json.load(file)
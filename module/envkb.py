@@ -0,0 +1,197 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections import Counter
+from functools import partial
+from module import envfolder, envprescore, envstatus
+
+# Snapshot knowledge base terkompilasi di cache/kb, dipakai ulang selama isi file uji
+# (dan konfigurasi normalizer) tidak berubah. KB_CACHE=0 untuk selalu membaca file sumber.
+KB_CACHE = os.getenv("KB_CACHE", "1") != "0"
+
+FORMAT_VERSION = 1
+MAGIC = b"KBC1"
+# Kolom yang disimpan per topik:
+#   row       baris asli (key huruf kecil), JSON
+#   context   jawaban KB setelah envstatus.normalize_response
+#   questions daftar [key, pertanyaan] yang tidak kosong, JSON
+#   features  fitur evaluator lokal [teks ternormalisasi, n-gram, norma], JSON
+COLUMNS = ("row", "context", "questions", "features")
+# Jumlah baris yang dinormalisasi sekaligus lewat envstatus.normalize_responses
+NORMALIZE_CHUNK = 500
+
+
+def file_digest(path):
+    """SHA-256 isi file, dibaca per blok."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_path(path):
+    """
+    Lokasi snapshot untuk file uji ini. Key mencakup hash isi file, versi
+    format dan konfigurasi normalizer, sehingga perubahan salah satunya
+    menghasilkan snapshot baru.
+    """
+    digest = hashlib.sha256(file_digest(path).encode("utf-8"))
+    digest.update(json.dumps([FORMAT_VERSION, envstatus.MARKUP_TOKENS, envprescore.NGRAM_SIZE]).encode("utf-8"))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return envfolder.kb_cache(f"{stem}-{digest.hexdigest()[:16]}")
+
+
+def row_questions(row):
+    return [
+        [key, str(value)] for key, value in row.items()
+        if key.startswith("pertanyaan") and value is not None and str(value).strip() != ""
+    ]
+
+
+class KBWriter:
+    """Membangun snapshot kolom demi kolom di memori, lalu menulisnya sekali secara atomik."""
+
+    def __init__(self, target_path):
+        self.target_path = target_path
+        self.columns = {name: bytearray() for name in COLUMNS}
+        self.offsets = {name: array("Q", [0]) for name in COLUMNS}
+        self.pending = []
+        self.stats = {"topics": 0, "questions": 0, "tokens": 0}
+        self.vocabulary = set()
+
+    def _append(self, name, value):
+        data = value.encode("utf-8")
+        self.columns[name] += data
+        self.offsets[name].append(len(self.columns[name]))
+
+    def _flush(self):
+        contexts = envstatus.normalize_responses([str(row.get("context", "")).strip() for row in self.pending])
+        for row, context in zip(self.pending, contexts):
+            questions = row_questions(row)
+            normalized, tokens, grams, norm = envprescore.features(context)
+            self._append("row", json.dumps(row, default=str))
+            self._append("context", context)
+            self._append("questions", json.dumps(questions))
+            self._append("features", json.dumps([normalized, grams, norm]))
+            self.stats["topics"] += 1
+            self.stats["questions"] += len(questions)
+            self.stats["tokens"] += len(normalized.split())
+            self.vocabulary.update(tokens)
+        self.pending = []
+
+    def add(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= NORMALIZE_CHUNK:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        layout, position = {}, 0
+        for name in COLUMNS:
+            offsets_size = len(self.offsets[name]) * self.offsets[name].itemsize
+            layout[name] = {"offsets": position, "data": position + offsets_size}
+            position += offsets_size + len(self.columns[name])
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "rows": self.stats["topics"],
+            "stats": {**self.stats, "vocabulary": len(self.vocabulary)},
+            "columns": layout,
+        }).encode("utf-8")
+
+        temp_path = f"{self.target_path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for name in COLUMNS:
+                self.offsets[name].tofile(file)
+                file.write(self.columns[name])
+        os.replace(temp_path, self.target_path)
+        return self.target_path
+
+
+class CompiledKB:
+    """
+    Snapshot KB yang di-memory-map. Hanya header yang dibaca saat dibuka;
+    setiap sel didekode saat baris tersebut diiterasi.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:4] != MAGIC:
+                raise ValueError(f"{path} bukan snapshot KB")
+            header_size = struct.unpack_from("<I", self._map, 4)[0]
+            header = json.loads(self._map[8:8 + header_size])
+        except Exception:
+            self._file.close()
+            raise
+        if header.get("version") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Versi snapshot {path} tidak didukung")
+        self.rows = header["rows"]
+        self.stats = header["stats"]
+        base = 8 + header_size
+        self._columns = {name: (base + pos["offsets"], base + pos["data"]) for name, pos in header["columns"].items()}
+
+    def _cell(self, name, index):
+        offsets_start, data_start = self._columns[name]
+        start, end = struct.unpack_from("<QQ", self._map, offsets_start + 8 * index)
+        return self._map[data_start + start:data_start + end].decode("utf-8")
+
+    def row(self, index, normalized=True):
+        """
+        Baris ke-`index`. Dengan `normalized`, context sudah dinormalisasi dan
+        fitur evaluator didaftarkan (didekode hanya jika topik ini dinilai lokal).
+        """
+        row = json.loads(self._cell("row", index))
+        if normalized:
+            context = self._cell("context", index)
+            envprescore.register_features(context, partial(self.features, index))
+            row["context"] = context
+        return row
+
+    def features(self, index):
+        """Fitur evaluator lokal dalam format envprescore.features."""
+        text, grams, norm = json.loads(self._cell("features", index))
+        return text, set(text.split()), Counter(grams), norm
+
+    def questions(self, index):
+        return json.loads(self._cell("questions", index))
+
+    def iter_rows(self, normalized=True):
+        for index in range(self.rows):
+            yield self.row(index, normalized)
+
+    def totals(self):
+        return self.stats["topics"], self.stats["questions"]
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_compiled(path):
+    """Membuka snapshot KB untuk file uji jika sudah ada. Mengembalikan (CompiledKB atau None, path snapshot)."""
+    if not KB_CACHE:
+        return None, None
+    target_path = artifact_path(path)
+    if not os.path.exists(target_path):
+        return None, target_path
+    try:
+        return CompiledKB(target_path), target_path
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Snapshot KB {target_path} tidak bisa dibaca ({e}), dibangun ulang")
+        return None, target_path
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from module import envfolder
+
+# Cache hasil evaluasi LLM di disk. LLM_CACHE=0 untuk menonaktifkan
+LLM_CACHE = os.getenv("LLM_CACHE", "1") != "0"
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Eviction dijalankan setiap sekian kali penulisan, bukan pada setiap put
+EVICT_EVERY = 100
+
+_connection = None
+_lock = threading.Lock()
+_puts = 0
+hits = 0
+misses = 0
+
+
+def normalize(text):
+    """Normalisasi ringan agar perbedaan spasi tidak menghasilkan key berbeda."""
+    return re.sub(r"\s+", " ", str(text or "")).strip()
+
+
+def cache_key(model, prompt_template, expected_output, actual_output):
+    """Hash SHA-256 dari (model, template prompt, expected, actual)."""
+    digest = hashlib.sha256()
+    for part in (model, prompt_template, normalize(expected_output), normalize(actual_output)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _connect():
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(envfolder.llm_cache(), check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, score REAL, output TEXT, explanation TEXT, "
+            "created_at REAL, last_used REAL)"
+        )
+        _evict(_connection)
+        _connection.commit()
+    return _connection
+
+
+def _evict(connection):
+    """Menghapus entri kedaluwarsa (TTL), lalu entri paling lama tidak dipakai (ukuran)."""
+    connection.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - LLM_CACHE_TTL_DAYS * 86400,))
+    connection.execute(
+        "DELETE FROM llm_cache WHERE key IN ("
+        "SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+        (LLM_CACHE_MAX_ENTRIES,)
+    )
+
+
+def get(model, prompt_template, expected_output, actual_output):
+    """Mengembalikan (score, output, explanation) dari cache atau None."""
+    return get_any(model, [prompt_template], expected_output, actual_output)
+
+
+def get_any(model, prompt_templates, expected_output, actual_output):
+    """
+    Mencari satu pasangan dengan beberapa template prompt secara berurutan dan
+    mengembalikan hasil pertama yang ditemukan. Dihitung sebagai satu hit/miss.
+    """
+    global hits, misses
+    if not LLM_CACHE:
+        return None
+
+    expired_before = time.time() - LLM_CACHE_TTL_DAYS * 86400
+    with _lock:
+        connection = _connect()
+        for prompt_template in prompt_templates:
+            key = cache_key(model, prompt_template, expected_output, actual_output)
+            row = connection.execute(
+                "SELECT score, output, explanation, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[3] < expired_before:
+                continue
+
+            connection.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            connection.commit()
+            hits += 1
+            return row[0], row[1], row[2]
+        misses += 1
+        return None
+
+
+def put(model, prompt_template, expected_output, actual_output, score, output, explanation):
+    """Menyimpan hasil evaluasi yang berhasil diparse ke cache."""
+    global _puts
+    if not LLM_CACHE:
+        return
+
+    key = cache_key(model, prompt_template, expected_output, actual_output)
+    now = time.time()
+    with _lock:
+        connection = _connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (key, score, output, explanation, now, now)
+        )
+        _puts += 1
+        if _puts % EVICT_EVERY == 0:
+            _evict(connection)
+        connection.commit()
+
+
+def stats():
+    """Counter hit/miss untuk ditampilkan di summary report."""
+    return {"llm_cache_hit": hits, "llm_cache_miss": misses}
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import threading
+import time
+from queue import Queue, Empty
+from module import envjournal, envllmscore, envprescore, envstatus
+
+# Jumlah worker skoring di background. 0 = skoring dijalankan inline (tanpa antrian)
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "3"))
+# Batas antrian; jika penuh, loop percakapan menunggu (backpressure)
+SCORING_QUEUE_SIZE = int(os.getenv("SCORING_QUEUE_SIZE", "50"))
+# Jumlah pasangan yang dikirim dalam satu request evaluator (1 = tanpa batch)
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "5"))
+# Lama worker menunggu item tambahan sebelum mengirim batch yang belum penuh (detik)
+SCORING_BATCH_WAIT = float(os.getenv("SCORING_BATCH_WAIT", "2"))
+
+# Status record yang skoringnya gagal (bukan jawaban yang salah); diskor ulang oleh
+# enqueue_unscored_data, mis. saat run dilanjutkan dengan --resume
+STATUS_ERROR = "error"
+
+scoring_queue = None
+worker_threads = []
+
+
+def score_fields(skor, explanation, tier, response_bot, respond_text):
+    """
+    Field journal untuk hasil skoring; record failed juga mendapat diff kata (HTML).
+    Skor None berarti evaluator gagal dihubungi, sehingga record berstatus 'error'.
+    """
+    if skor is None:
+        return {"skor": None, "status": STATUS_ERROR, "explanation": explanation, "tier": tier}
+    fields = {
+        "skor": skor,
+        "status": envstatus.status(skor),
+        "explanation": explanation,
+        "tier": tier
+    }
+    if fields["status"] == "failed":
+        fields["diff_html"] = envstatus.word_diff_html(response_bot, respond_text)
+    return fields
+
+
+def error_fields(error):
+    """Field journal untuk record yang gagal diskor."""
+    return {"skor": None, "status": STATUS_ERROR, "explanation": f"Skoring gagal: {error}"}
+
+
+def apply_scores(report_filename, id_test, items):
+    """Menghitung skor LLM untuk beberapa item lalu mengisi skor dan status ke journal."""
+    if len(items) == 1:
+        results = [envllmscore.llm_score(items[0]["response_bot"], items[0]["respond_text"])]
+    else:
+        results = envllmscore.llm_score_batch([(item["response_bot"], item["respond_text"]) for item in items])
+
+    journal = envjournal.get_journal(f"{report_filename}-{id_test}")
+    for item, (skor, _, explanation, AI) in zip(items, results):
+        journal.update_data(item["index"], score_fields(
+            skor, explanation, envprescore.TIER_LLM, item["response_bot"], item["respond_text"]
+        ))
+    return [result[0] for result in results]
+
+
+def apply_prescore(report_filename, id_test, index, response_bot, respond_text):
+    """
+    Menilai pasangan dengan evaluator lokal. Jika bisa diputuskan, skor langsung
+    ditulis ke journal dan True dikembalikan; pasangan ambigu tetap ke LLM.
+    """
+    decision = envprescore.evaluate(response_bot, respond_text)
+    if decision is None:
+        return False
+    skor, explanation, tier = decision
+    envjournal.get_journal(f"{report_filename}-{id_test}").update_data(
+        index, score_fields(skor, explanation, tier, response_bot, respond_text)
+    )
+    return True
+
+
+def apply_score(report_filename, id_test, index, response_bot, respond_text):
+    """Menghitung skor LLM satu item lalu mengisi skor dan status ke journal."""
+    item = {"index": index, "response_bot": response_bot, "respond_text": respond_text}
+    return apply_scores(report_filename, id_test, [item])[0]
+
+
+def _collect_batch(first_item, scoring_queue):
+    """
+    Mengambil item tambahan dari antrian sampai SCORING_BATCH_SIZE atau
+    SCORING_BATCH_WAIT habis. Mengembalikan (batch, stop) jika sinyal berhenti ikut terambil.
+    """
+    batch = [first_item]
+    deadline = time.monotonic() + SCORING_BATCH_WAIT
+    while len(batch) < SCORING_BATCH_SIZE:
+        try:
+            item = scoring_queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+        except Empty:
+            break
+        if item is None:
+            scoring_queue.task_done()
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+def scoring_worker(report_filename, id_test, scoring_queue):
+    stop = False
+    while not stop:
+        item = scoring_queue.get()
+        if item is None:
+            scoring_queue.task_done()
+            break
+
+        batch, stop = _collect_batch(item, scoring_queue)
+        try:
+            apply_scores(report_filename, id_test, batch)
+        except Exception as e:
+            print(f"❌ Error scoring records {[item['index'] for item in batch]}: {e}")
+            # Ditandai agar tidak tertinggal sebagai 'pending' dan bisa diskor ulang
+            journal = envjournal.get_journal(f"{report_filename}-{id_test}")
+            for failed_item in batch:
+                journal.update_data(failed_item["index"], error_fields(e))
+        finally:
+            for _ in batch:
+                scoring_queue.task_done()
+
+
+def start_workers(report_filename, id_test, workers=SCORING_WORKERS):
+    """Menyalakan worker skoring di background untuk satu run."""
+    global scoring_queue, worker_threads
+    if workers <= 0 or scoring_queue is not None:
+        return
+
+    scoring_queue = Queue(maxsize=SCORING_QUEUE_SIZE)
+    worker_threads = []
+    for i in range(workers):
+        worker_thread = threading.Thread(
+            target=scoring_worker,
+            args=(report_filename, id_test, scoring_queue),
+            name=f"scoring-worker-{i}",
+            daemon=True
+        )
+        worker_thread.start()
+        worker_threads.append(worker_thread)
+
+
+def submit(report_filename, id_test, index, response_bot, respond_text):
+    """
+    Mendaftarkan satu record untuk diskor. Kasus yang jelas diputuskan
+    evaluator lokal (envprescore); sisanya masuk antrian jika worker aktif,
+    atau langsung diskor LLM jika tidak.
+    """
+    if apply_prescore(report_filename, id_test, index, response_bot, respond_text):
+        return
+    item = {"index": index, "response_bot": response_bot, "respond_text": respond_text}
+    if scoring_queue is None:
+        apply_score(report_filename, id_test, **item)
+    else:
+        scoring_queue.put(item)
+
+
+async def submit_async(report_filename, id_test, index, response_bot, respond_text):
+    """
+    Versi submit untuk loop asyncio (Telegram, Instagram, Facebook). Antrian yang
+    penuh atau skoring inline dijalankan di thread agar event loop, termasuk
+    collector balasan, tidak ikut berhenti.
+    """
+    await asyncio.to_thread(submit, report_filename, id_test, index, response_bot, respond_text)
+
+
+def enqueue_unscored_data(report_filename, id_test):
+    """Memasukkan ulang record yang belum punya skor (status 'pending' atau 'error')."""
+    journal = envjournal.get_journal(f"{report_filename}-{id_test}")
+    pending = [(index, item) for index, item in enumerate(journal.data) if item.get("status") in ("pending", STATUS_ERROR)]
+    for index, item in pending:
+        submit(report_filename, id_test, index, item.get("response_llm", ""), item.get("response_kb", ""))
+    return len(pending)
+
+
+def stop_all_workers():
+    """Menunggu semua skor selesai diproses, lalu menghentikan worker."""
+    global scoring_queue, worker_threads
+    if scoring_queue is None:
+        return
+
+    # Sinyal berhenti masuk setelah semua item (FIFO), sehingga worker yang sedang
+    # mengumpulkan batch langsung mengirim batch terakhirnya tanpa menunggu SCORING_BATCH_WAIT
+    for _ in worker_threads:
+        scoring_queue.put(None)
+    for worker_thread in worker_threads:
+        worker_thread.join()
+
+    scoring_queue = None
+    worker_threads = []
@@ -1,6 +1,9 @@
 import time
 from module import envhitllm
 
+# Nama evaluator yang ditampilkan di summary report
+ai_evaluation = envhitllm.AI_GEMINI
+
 
 def llm_score(respond_bot, respond_text):
 
@@ -14,3 +17,12 @@ def llm_score(respond_bot, respond_text):
     return result_skor, output, explanation, AI
 
 
+def llm_score_batch(pairs):
+    """Skoring beberapa pasangan (respond_bot, respond_text) dalam satu request."""
+    start_time = time.time()
+    results = envhitllm.hit_llm_to_scoring_gemini_batch(pairs)
+    print(f"Result: {[result[0] for result in results]}")
+
+    end_time = time.time() - start_time
+    print(f"Skoring API ({len(pairs)} item) took {end_time:.2f} seconds")
+    return results
@@ -0,0 +1,32 @@
+import importlib
+import threading
+
+# Adapter per platform. Modul hanya diimpor saat platform tersebut dipakai,
+# sehingga run webchat tidak ikut memuat telethon/instagrapi (dan sebaliknya).
+PLATFORMS = {
+    "webchat": "module.envwebchat",
+    "telegram": "module.envtelegram",
+    "instagram": "module.envinstagram",
+    "facebook": "module.envfacebook",
+}
+
+_adapters = {}
+_lock = threading.Lock()
+
+
+def supported():
+    """Nama platform yang didukung, sesuai urutan registrasi."""
+    return list(PLATFORMS)
+
+
+def adapter(name):
+    """Mengimpor (sekali) dan mengembalikan modul adapter untuk platform `name`."""
+    name = name.lower()
+    if name not in PLATFORMS:
+        raise ValueError(f"Platform '{name}' tidak didukung. Pilihan: {', '.join(PLATFORMS)}")
+    with _lock:
+        module = _adapters.get(name)
+        if module is None:
+            module = importlib.import_module(PLATFORMS[name])
+            _adapters[name] = module
+        return module
@@ -0,0 +1,156 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+# Evaluator lokal sebelum LLM: kasus yang jelas (identik, jawaban kosong/error,
+# sangat mirip atau sama sekali berbeda) diputuskan di sini tanpa request API.
+# PRESCORE=0 untuk mengirim semua pasangan ke LLM seperti sebelumnya.
+PRESCORE = os.getenv("PRESCORE", "1") != "0"
+# Pass lokal hanya untuk himpunan kata yang sama persis dengan KB (urutan/pengulangan
+# boleh beda) dan n-gram minimal PRESCORE_PASS_THRESHOLD; satu kata yang hilang atau
+# bertambah (mis. "tidak", nama produk lain) selalu diteruskan ke LLM.
+# Kemiripan maksimum untuk langsung failed; di antaranya pasangan dianggap ambigu.
+PRESCORE_PASS_THRESHOLD = float(os.getenv("PRESCORE_PASS_THRESHOLD", "0.97"))
+PRESCORE_FAIL_THRESHOLD = float(os.getenv("PRESCORE_FAIL_THRESHOLD", "0.1"))
+NGRAM_SIZE = 3
+
+TIER_EXACT = "exact"
+TIER_EMPTY = "empty"
+TIER_LEXICAL = "lexical"
+TIER_LLM = "llm"
+
+# Jawaban pengganti yang ditulis action saat bot tidak membalas atau pesan gagal terkirim
+NO_ANSWER_PATTERN = re.compile(r"^error: (tidak ada balasan|gagal mengirim pesan)", re.IGNORECASE)
+
+# Fitur teks knowledge base (hasil normalize + n-gram) per jawaban KB, dihitung sekali
+FEATURE_CACHE_SIZE = 50000
+
+_counts = Counter()
+_lock = threading.Lock()
+_features = {}
+
+
+def normalize(text):
+    """Huruf kecil, tanpa tanda baca, spasi dirapikan."""
+    text = re.sub(r"[^\w\s]", " ", str(text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def ngrams(normalized, size=NGRAM_SIZE):
+    return Counter(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def features(text):
+    """(teks ternormalisasi, himpunan kata, frekuensi n-gram, norma vektor n-gram) dari satu teks."""
+    normalized = normalize(text)
+    grams = ngrams(normalized)
+    return normalized, set(normalized.split()), grams, math.sqrt(sum(c * c for c in grams.values()))
+
+
+def register_features(text, text_features):
+    """
+    Menyimpan fitur jawaban KB yang sudah dihitung sebelumnya (mis. dari
+    snapshot envkb). Boleh berupa fungsi tanpa argumen yang baru dipanggil
+    saat fitur tersebut dibutuhkan.
+    """
+    with _lock:
+        if len(_features) >= FEATURE_CACHE_SIZE:
+            _features.clear()
+        _features[text] = text_features
+
+
+def kb_features(text):
+    """Fitur jawaban KB, dihitung sekali per teks lalu dipakai ulang untuk setiap pertanyaan topik tersebut."""
+    text = str(text or "")
+    with _lock:
+        cached = _features.get(text)
+    if callable(cached):
+        try:
+            cached = cached()
+        except (ValueError, TypeError):
+            # Snapshot KB sudah ditutup: fitur dihitung ulang dari teks
+            cached = None
+        else:
+            register_features(text, cached)
+    if cached is None:
+        cached = features(text)
+        register_features(text, cached)
+    return cached
+
+
+def _overlap(tokens_bot, tokens_kb):
+    if not tokens_bot or not tokens_kb:
+        return 0.0
+    return len(tokens_bot & tokens_kb) / len(tokens_bot | tokens_kb)
+
+
+def _cosine(grams_bot, norm_bot, grams_kb, norm_kb):
+    if not norm_bot or not norm_kb:
+        return 0.0
+    return sum(count * grams_kb[gram] for gram, count in grams_bot.items()) / (norm_bot * norm_kb)
+
+
+def token_overlap(normalized_bot, normalized_kb):
+    """Jaccard dari himpunan kata kedua teks."""
+    return _overlap(set(normalized_bot.split()), set(normalized_kb.split()))
+
+
+def ngram_cosine(normalized_bot, normalized_kb, size=NGRAM_SIZE):
+    """Cosine similarity dari frekuensi n-gram karakter kedua teks."""
+    grams_bot, grams_kb = ngrams(normalized_bot, size), ngrams(normalized_kb, size)
+    norm_bot = math.sqrt(sum(c * c for c in grams_bot.values()))
+    norm_kb = math.sqrt(sum(c * c for c in grams_kb.values()))
+    return _cosine(grams_bot, norm_bot, grams_kb, norm_kb)
+
+
+def _record(tier):
+    with _lock:
+        _counts[tier] += 1
+
+
+def evaluate(respond_bot, respond_text):
+    """
+    Mengembalikan (skor, explanation, tier) jika pasangan bisa diputuskan
+    secara lokal, atau None jika ambigu dan perlu dinilai LLM.
+    """
+    if not PRESCORE:
+        _record(TIER_LLM)
+        return None
+
+    answer = str(respond_bot or "").strip()
+    if not answer or NO_ANSWER_PATTERN.match(answer):
+        _record(TIER_EMPTY)
+        return 0.0, "Bot tidak memberikan jawaban.", TIER_EMPTY
+
+    normalized_kb, tokens_kb, grams_kb, norm_kb = kb_features(respond_text)
+    normalized_bot, tokens_bot, grams_bot, norm_bot = features(answer)
+    if not normalized_kb:
+        # Tanpa jawaban acuan, penilaian diserahkan ke LLM
+        _record(TIER_LLM)
+        return None
+    if normalized_bot == normalized_kb:
+        _record(TIER_EXACT)
+        return 1.0, "Jawaban bot sama dengan jawaban knowledge base.", TIER_EXACT
+
+    overlap = _overlap(tokens_bot, tokens_kb)
+    cosine = _cosine(grams_bot, norm_bot, grams_kb, norm_kb)
+    # Pass hanya jika tidak ada kata KB yang hilang atau bertambah, failed hanya jika keduanya rendah
+    if tokens_bot == tokens_kb and cosine >= PRESCORE_PASS_THRESHOLD:
+        _record(TIER_LEXICAL)
+        skor = round(cosine, 2)
+        return skor, f"Jawaban bot memakai kata yang sama dengan knowledge base (n-gram {cosine:.2f}).", TIER_LEXICAL
+    if max(overlap, cosine) <= PRESCORE_FAIL_THRESHOLD:
+        _record(TIER_LEXICAL)
+        skor = round(max(overlap, cosine), 2)
+        return skor, f"Jawaban bot tidak berkaitan dengan knowledge base (kata {overlap:.2f}, n-gram {cosine:.2f}).", TIER_LEXICAL
+
+    _record(TIER_LLM)
+    return None
+
+
+def stats():
+    """Jumlah pasangan yang diputuskan per tier, untuk summary report."""
+    with _lock:
+        return {f"tier_{tier}": _counts[tier] for tier in (TIER_EXACT, TIER_EMPTY, TIER_LEXICAL, TIER_LLM)}
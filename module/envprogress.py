@@ -0,0 +1,174 @@
+import os
+import sys
+import threading
+import time
+from colorama import Fore, Style
+
+# auto = bar live jika stdout adalah terminal dan bukan CI, selain itu baris log biasa.
+# Pilihan lain: bar, log, off
+PROGRESS_MODE = os.getenv("PROGRESS_MODE", "auto").lower()
+# Interval render bar live (detik)
+PROGRESS_INTERVAL = float(os.getenv("PROGRESS_INTERVAL", "0.5"))
+BAR_WIDTH = 24
+
+_lock = threading.RLock()
+_state = None
+_thread = None
+_stop_event = threading.Event()
+_stdout = None
+
+
+def _mode():
+    if PROGRESS_MODE in ("bar", "log", "off"):
+        return PROGRESS_MODE
+    is_tty = hasattr(sys.__stdout__, "isatty") and sys.__stdout__.isatty()
+    return "bar" if is_tty and not os.getenv("CI") else "log"
+
+
+class _StdoutProxy:
+    """Menghapus bar live sebelum output lain ditulis agar baris tidak bertumpuk."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bar_visible = False
+        self.at_line_start = True
+
+    def write(self, text):
+        with _lock:
+            if self.bar_visible:
+                self.stream.write("\r\033[K")
+                self.bar_visible = False
+            if text:
+                self.at_line_start = text.endswith("\n")
+            return self.stream.write(text)
+
+    def draw(self, line):
+        """Menggambar ulang bar, hanya jika kursor berada di awal baris."""
+        with _lock:
+            if not self.at_line_start and not self.bar_visible:
+                return
+            self.stream.write("\r\033[K" + line)
+            self.stream.flush()
+            self.bar_visible = True
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _format_eta(seconds):
+    if seconds is None:
+        return "--:--:--"
+    return time.strftime("%H:%M:%S", time.gmtime(seconds))
+
+
+def render_line(plain=False):
+    """
+    Baris progress: jumlah selesai, pertanyaan/detik, ETA dan counter pass/failed.
+    `plain` = tanpa bar dan warna, untuk log CI.
+    """
+    with _lock:
+        if _state is None:
+            return ""
+        done, total = _state["done"], _state["total"]
+        skipped = _state["skipped"]
+        elapsed = max(time.monotonic() - _state["started"], 1e-6)
+        pass_count, failed_count = _state["pass"], _state["failed"]
+
+    # Pertanyaan yang dilewati (run yang dilanjutkan) tidak dihitung ke kecepatan
+    rate = (done - skipped) / elapsed
+    eta = (total - done) / rate if rate > 0 and total else None
+    # Total belum diketahui selama file uji masih dibaca secara streaming
+    total_label = total if total else "?"
+    if plain:
+        return f"{done}/{total_label} | {rate:.2f} q/s | ETA {_format_eta(eta)} | pass {pass_count} failed {failed_count}"
+
+    filled = min(BAR_WIDTH, int(BAR_WIDTH * done / total)) if total else 0
+    bar = "█" * filled + "░" * (BAR_WIDTH - filled)
+    return (
+        f"{bar} {done}/{total_label} | {rate:.2f} q/s | ETA {_format_eta(eta)} | "
+        f"{Fore.GREEN}pass {pass_count}{Style.RESET_ALL} {Fore.RED}failed {failed_count}{Style.RESET_ALL}"
+    )
+
+
+def _render_loop():
+    while not _stop_event.wait(PROGRESS_INTERVAL):
+        _stdout.draw(render_line())
+
+
+def start(total):
+    """Memulai progress untuk `total` pertanyaan. Panggilan berikutnya diabaikan selama masih aktif."""
+    global _state, _thread, _stdout
+    with _lock:
+        if _state is not None:
+            return
+        _state = {"mode": _mode(), "total": total, "done": 0, "skipped": 0, "pass": 0, "failed": 0, "started": time.monotonic()}
+        if _state["mode"] != "bar":
+            return
+
+        _stdout = _StdoutProxy(sys.stdout)
+        sys.stdout = _stdout
+        _stop_event.clear()
+        _thread = threading.Thread(target=_render_loop, name="progress-renderer", daemon=True)
+        _thread.start()
+
+
+def set_total(total):
+    """Memperbarui total pertanyaan, mis. saat file uji masih dibaca secara streaming."""
+    with _lock:
+        if _state is not None:
+            _state["total"] = total
+
+
+def advance(pass_count=None, failed_count=None, step=1):
+    """Menandai pertanyaan selesai dan memperbarui counter pass/failed."""
+    with _lock:
+        if _state is None:
+            return
+        _state["done"] += step
+        if pass_count is not None:
+            _state["pass"] = pass_count
+        if failed_count is not None:
+            _state["failed"] = failed_count
+        mode = _state["mode"]
+    if mode == "log":
+        print(f"[progress] {render_line(plain=True)}")
+
+
+def skip(step=1):
+    """Menandai pertanyaan yang sudah dijawab pada run sebelumnya sebagai selesai."""
+    with _lock:
+        if _state is None:
+            return
+        _state["done"] += step
+        _state["skipped"] += step
+
+
+def message(text, color=""):
+    """Menulis satu baris status tanpa animasi dan tanpa jeda."""
+    print(f"{color}{text}{Style.RESET_ALL}" if color else text)
+
+
+def stop():
+    """Menghentikan renderer dan menulis baris progress terakhir."""
+    global _state, _thread, _stdout
+    with _lock:
+        if _state is None:
+            return
+        mode = _state["mode"]
+    if _thread is not None:
+        _stop_event.set()
+        _thread.join()
+        _thread = None
+    if mode in ("bar", "log"):
+        line = render_line(plain=mode == "log")
+        with _lock:
+            if _stdout is not None:
+                _stdout.write("")  # hapus bar terakhir
+                sys.stdout = _stdout.stream
+                _stdout = None
+        print(line)
+    with _lock:
+        _state = None
@@ -1,20 +1,36 @@
 from jinja2 import Environment, FileSystemLoader
-import json
 from colorama import Fore, Style
-from module import modul, envfolder
+from module import modul, envfolder, envjournal
 import os
 import re
-from jinja2 import Environment, FileSystemLoader
+import threading
+import time
+
+# Laporan live dirender ulang paling cepat setiap N detik atau setiap M baris baru
+LIVE_REPORT_INTERVAL = float(os.getenv("LIVE_REPORT_INTERVAL", "15"))
+LIVE_REPORT_EVERY = int(os.getenv("LIVE_REPORT_EVERY", "10"))
+
+_template = None
+_live_state = {}
+# Worker webchat paralel bisa memicu render bersamaan
+_live_lock = threading.Lock()
+_render_lock = threading.Lock()
+
+def get_template():
+    """Mengompilasi template report sekali per proses."""
+    global _template
+    if _template is None:
+        env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), '..')))
+        _template = env.get_template('report/template/template.html')
+    return _template
 
 def render_report(report_filename, id_test):
     """Fungsi helper untuk merender laporan HTML dari data JSON."""
     report_file_id = f"{report_filename}-{id_test}"
     result_path = envfolder.report_html(report_file_id)
-    file_json_report = envfolder.write_json_data_bot(report_file_id)
     
     try:
-        with open(file_json_report, 'r') as file:
-            data = json.load(file)
+        data = envjournal.load_report(report_file_id)
             
         # Memastikan data summary selalu dalam bentuk list untuk template
         summary_data = data.get('summary', {})
@@ -24,8 +40,7 @@ def render_report(report_filename, id_test):
         chart_data = data.get('chart', {})
         test_data = data.get('data', [])
 
-        env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), '..')))
-        template = env.get_template('report/template/template.html')
+        template = get_template()
 
         # Ensure image_capture is not None for the template
         for item in test_data:
@@ -34,8 +49,9 @@ def render_report(report_filename, id_test):
 
         html_output = template.render(summary=summary_data, chart=chart_data, test_data=test_data)
 
-        with open(result_path, 'w') as output_file:
-            output_file.write(html_output)
+        with _render_lock:
+            with open(result_path, 'w') as output_file:
+                output_file.write(html_output)
         
         return True, "HTML report generated successfully."
     except FileNotFoundError as e:
@@ -57,8 +73,25 @@ def report(report_filename, id_test):
         print(f"✅ {message}\n")
     
 def report_action(report_filename, id_test):
-    """Fungsi untuk membuat laporan selama eksekusi (per aksi)."""
-    render_report(report_filename, id_test)
+    """
+    Fungsi untuk membuat laporan selama eksekusi (per aksi).
+    Render hanya dilakukan jika sudah lewat LIVE_REPORT_INTERVAL detik atau
+    sudah ada LIVE_REPORT_EVERY baris baru sejak render terakhir.
+    """
+    report_file_id = f"{report_filename}-{id_test}"
+    rows = len(envjournal.get_journal(report_file_id).data) if envjournal.is_active(report_file_id) else 0
+    now = time.monotonic()
+
+    with _live_lock:
+        last = _live_state.get(report_file_id)
+        if last is not None:
+            last_time, last_rows = last
+            if now - last_time < LIVE_REPORT_INTERVAL and rows - last_rows < LIVE_REPORT_EVERY:
+                return False
+
+        _live_state[report_file_id] = (now, rows)
+    success, _ = render_report(report_filename, id_test)
+    return success
     
 def take_screenshot(driver, id_test, key, question):
     """Mengambil screenshot dari halaman web."""
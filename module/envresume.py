@@ -0,0 +1,101 @@
+import os
+from collections import Counter
+from module import envfolder, envjournal, modul
+
+# Melanjutkan run yang terhenti: `python main.py --resume <id_test>` atau RESUME_ID=<id_test>.
+# Journal lama dibaca ulang, pertanyaan yang sudah dijawab dilewati, dan durasinya
+# digabung ke chart serta summary.
+RESUME_ID = os.getenv("RESUME_ID", "").strip()
+
+_state = None
+
+
+def question_key(element, key):
+    """Key journal untuk satu pertanyaan: [no, key pertanyaan] (mis. ["3", "pertanyaan2"])."""
+    return [str(element.get("no", "")), key]
+
+
+def topic_key(element):
+    """Key journal untuk chart satu topik: [no]."""
+    return [str(element.get("no", ""))]
+
+
+def start(report_filename, id_test):
+    """
+    Menyiapkan run lanjutan dari journal `<report_filename>-<id_test>` di folder
+    tanggal mana pun. Folder report/log dipatok ke tanggal tersebut. Mengembalikan
+    summary run lama (bisa kosong), atau None jika journal tidak ditemukan.
+    """
+    global _state
+    full_report_name = f"{report_filename}-{id_test}"
+    journal_path = envfolder.find_journal(full_report_name)
+    if journal_path is None:
+        return None
+    envfolder.use_run_date(os.path.basename(os.path.dirname(journal_path)))
+    journal = envjournal.get_journal(full_report_name)
+
+    state = {
+        "questions": set(), "question_texts": set(),
+        "topics": set(), "topic_titles": set(),
+        "topic_seconds": Counter(), "chart_seconds": 0,
+    }
+    # Record dari journal lama tanpa key dikenali lewat (no, teks pertanyaan) / judul topik
+    for record, key in zip(journal.data, journal.data_keys):
+        if key:
+            state["questions"].add(tuple(key))
+        else:
+            state["question_texts"].add((str(record.get("no", "")), record.get("question")))
+    for record, key in zip(journal.chart, journal.chart_keys):
+        title = next(iter(record), None)
+        if key:
+            state["topics"].add(tuple(key))
+        else:
+            state["topic_titles"].add(title)
+        state["chart_seconds"] += modul.duration_seconds(record.get(title))
+    # Topik yang terhenti di tengah belum punya chart; durasinya dari record pertanyaannya
+    for record, key in zip(journal.data, journal.data_keys):
+        no = key[0] if key else str(record.get("no", ""))
+        if (no,) not in state["topics"] and record.get("title") not in state["topic_titles"]:
+            state["topic_seconds"][no] += modul.duration_seconds(record.get("duration"))
+
+    summary = dict(journal.summary)
+    if summary.get("duration"):
+        state["elapsed"] = modul.duration_seconds(summary["duration"])
+    else:
+        state["elapsed"] = state["chart_seconds"] + sum(state["topic_seconds"].values())
+    _state = state
+    print(f"Melanjutkan run {id_test}: {len(journal.data)} pertanyaan dan {len(journal.chart)} topik sudah selesai\n")
+    return summary
+
+
+def active():
+    return _state is not None
+
+
+def is_answered(element, key, question):
+    """True jika pertanyaan ini sudah dijawab pada run sebelumnya."""
+    if _state is None:
+        return False
+    no = str(element.get("no", ""))
+    return (no, key) in _state["questions"] or (no, question) in _state["question_texts"]
+
+
+def topic_done(element):
+    """True jika seluruh topik sudah selesai (chart-nya sudah ditulis) pada run sebelumnya."""
+    if _state is None:
+        return False
+    return tuple(topic_key(element)) in _state["topics"] or element.get("title", "Untitled") in _state["topic_titles"]
+
+
+def topic_offset(element):
+    """Detik yang sudah dihabiskan untuk topik ini sebelum run terhenti."""
+    if _state is None:
+        return 0
+    return _state["topic_seconds"][str(element.get("no", ""))]
+
+
+def elapsed():
+    """Durasi run sebelumnya (detik), ditambahkan ke duration di summary."""
+    if _state is None:
+        return 0
+    return _state["elapsed"]
@@ -2,8 +2,29 @@ import difflib
 import json
 import asyncio
 from module.modul import log_function_status
-from module import envfolder
+from module import envfolder, envjournal
+import html
+import os
 import re
+import unicodedata
+
+# Token markup dari knowledge base/bot yang dihapus sebelum jawaban dibandingkan (regex, tanpa
+# memperhatikan huruf besar/kecil). Token tambahan bisa diberikan lewat RESPONSE_MARKUP_TOKENS,
+# dipisah koma, mis. "[video],[quick reply]"
+MARKUP_TOKENS = [
+    r"\(bubble\d*\)",
+    r"\[button\]",
+    r"\(button\)",
+    r"\[List Menu\]",
+    r"\[carousel button\]",
+    r"\[carousel\]",
+    r"\[image\]",
+] + [re.escape(token.strip()) for token in os.getenv("RESPONSE_MARKUP_TOKENS", "").split(",") if token.strip()]
+ZERO_WIDTH = "\u200b\u200c\u200d\u2060\ufeff"
+# Pemisah antar teks pada normalize_responses; bukan whitespace dan bukan bagian token markup
+BATCH_SEPARATOR = "\x00"
+# Batas jumlah kata per jawaban yang dibandingkan pada diff kata; sisanya ditandai "…"
+DIFF_MAX_WORDS = int(os.getenv("DIFF_MAX_WORDS", "300"))
 
 @log_function_status
 def status(skor):
@@ -13,14 +34,52 @@ def status(skor):
         status = "failed"
     return status
 
+def word_opcodes(text_a, text_b, max_words=DIFF_MAX_WORDS):
+    """
+    Opcode SequenceMatcher di level kata (bukan karakter). Jumlah kata per
+    teks dibatasi `max_words` dan autojunk aktif, sehingga biaya tetap kecil
+    untuk jawaban panjang. Mengembalikan (kata_a, kata_b, opcodes, terpotong).
+    """
+    words_a, words_b = str(text_a or "").split(), str(text_b or "").split()
+    truncated = len(words_a) > max_words or len(words_b) > max_words
+    words_a, words_b = words_a[:max_words], words_b[:max_words]
+    matcher = difflib.SequenceMatcher(None, words_a, words_b, autojunk=True)
+    return words_a, words_b, matcher.get_opcodes(), truncated
+
 @log_function_status
 def compare_strings(respond_bot, respond_text):
-    differences = list(difflib.ndiff(str(respond_bot), respond_text))
-    # Menyusun kembali hasil perbandingan dalam format yang diinginkan
-    formatted_diff = ' '.join([f'{diff[2:]}' if diff.startswith(' ') else f'[{diff[2:]}]' if diff.startswith('-') else f'({diff[2:]})' for diff in differences])
-    # Menghilangkan entri baru dari hasil pemformatan
-    compare_strings = formatted_diff.replace('\n', '')
-    return compare_strings
+    # Kata yang hanya ada di jawaban bot ditulis [..], yang hanya ada di respond_text (..)
+    words_bot, words_text, opcodes, _ = word_opcodes(respond_bot, respond_text)
+    parts = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            parts.append(" ".join(words_bot[i1:i2]))
+            continue
+        if i2 > i1:
+            parts.append(f"[{' '.join(words_bot[i1:i2])}]")
+        if j2 > j1:
+            parts.append(f"({' '.join(words_text[j1:j2])})")
+    return " ".join(parts)
+
+def word_diff_html(respond_bot, respond_text, max_words=DIFF_MAX_WORDS):
+    """
+    Diff kata antara jawaban knowledge base dan jawaban bot sebagai HTML:
+    kata knowledge base yang tidak ada di jawaban bot dalam <del>, kata
+    tambahan dari bot dalam <ins>. Teks di-escape, aman dirender dengan `| safe`.
+    """
+    words_kb, words_bot, opcodes, truncated = word_opcodes(respond_text, respond_bot, max_words)
+    parts = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            parts.append(html.escape(" ".join(words_kb[i1:i2])))
+            continue
+        if i2 > i1:
+            parts.append(f'<del class="diff-del">{html.escape(" ".join(words_kb[i1:i2]))}</del>')
+        if j2 > j1:
+            parts.append(f'<ins class="diff-ins">{html.escape(" ".join(words_bot[j1:j2]))}</ins>')
+    if truncated:
+        parts.append('<span class="diff-more">…</span>')
+    return " ".join(parts)
 
 @log_function_status
 def probability(respond_bot, respond_text):
@@ -31,10 +90,12 @@ def probability(respond_bot, respond_text):
 @log_function_status
 def calculate(report_filename, id_test):
     report_filename = f"{report_filename}-{id_test}"
-    # result = f'assets/json/result/{report_filename}.json'
-    
-    result_path = envfolder.calculate(report_filename)
 
+    # Counter pass/failed disimpan di memori oleh journal, tidak perlu membaca ulang file
+    if envjournal.is_active(report_filename):
+        return envjournal.get_journal(report_filename).counts()
+
+    result_path = envfolder.calculate(report_filename)
 
     try:
         with open(result_path) as file:
@@ -59,61 +120,101 @@ def calculate(report_filename, id_test):
 
 @log_function_status
 def diff_strings(respond_bot, respond_text):
-    # Membuat objek Diff
-    differ = difflib.Differ()
+    # Teks respond_text dengan kata yang berbeda dari jawaban bot ditandai (..); "" jika sama
+    _, words_text, opcodes, _ = word_opcodes(respond_bot, respond_text)
+    if all(tag == "equal" for tag, *_ in opcodes):
+        return ""
+    parts = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if j2 > j1:
+            words = " ".join(words_text[j1:j2])
+            parts.append(words if tag == "equal" else f"({words})")
+    return " ".join(parts)
+    
+def _first_chars(tokens):
+    """
+    Karakter pertama yang mungkin dari setiap token (huruf kecil dan besar, karena
+    regex-nya IGNORECASE), None jika tidak bisa ditentukan.
+    """
+    chars = set()
+    for token in tokens:
+        if len(token) > 1 and token[0] == "\\" and not token[1].isalnum():
+            chars.add(token[1])
+        elif token and token[0] not in ".^$*+?{}[]|()\\":
+            chars.update((token[0].lower(), token[0].upper()))
+        else:
+            return None
+    return chars
 
-    # Membuat perbandingan
-    diff = list(differ.compare(respond_bot, respond_text))
 
-    # Menyusun teks dengan penambahan kurung
-    modified_text = ''
-    prev_op = None
-    current_word = ''
-    has_difference = False
+def _markup_pattern(tokens):
+    """
+    Satu regex untuk semua token markup dan karakter zero-width. Lookahead
+    pada karakter pertama token membuat regex hanya mencoba mencocokkan di
+    posisi '(' atau '[', bukan di setiap karakter. Mengembalikan (regex,
+    karakter pertama token).
+    """
+    alternation = "|".join(tokens + [f"[{ZERO_WIDTH}]+"])
+    chars = _first_chars(tokens)
+    guard = f"(?=[{re.escape(''.join(sorted(chars)))}{ZERO_WIDTH}])" if chars else ""
+    return re.compile(f"{guard}(?:{alternation})", re.IGNORECASE), chars
+
+_markup_regex, _markup_chars = _markup_pattern(MARKUP_TOKENS)
+
+
+def set_markup_tokens(tokens):
+    """Mengganti daftar token markup (regex) dan mengompilasi ulang normalizer."""
+    global MARKUP_TOKENS, _markup_regex, _markup_chars
+    MARKUP_TOKENS = list(tokens)
+    _markup_regex, _markup_chars = _markup_pattern(MARKUP_TOKENS)
+
+
+def _unicode(text):
+    text = str(text)
+    return text if text.isascii() else unicodedata.normalize("NFKC", text)
+
+
+def _may_have_markup(text):
+    # Teks ASCII tanpa karakter pembuka token (mayoritas jawaban) tidak perlu melewati regex
+    return _markup_chars is None or not text.isascii() or any(char in text for char in _markup_chars)
+
+
+def _strip_markup(text):
+    return _markup_regex.sub(" ", text) if _may_have_markup(text) else text
+
+
+def normalize_response(text):
+    """
+    Normalisasi jawaban bot/knowledge base: Unicode NFKC, token markup dan
+    karakter zero-width dihapus dalam satu pass regex, lalu semua whitespace
+    (termasuk baris baru) dirapikan menjadi satu spasi.
+
+    Berbeda dari chain re.sub lama yang menghapus "\n" (sehingga "a\nb" menjadi
+    "ab" dan kata di akhir baris menempel ke baris berikutnya), baris baru di
+    sini menjadi spasi: "a\nb" -> "a b".
+    """
+    return " ".join(_strip_markup(_unicode(text)).split())
+
+
+def normalize_responses(texts):
+    """
+    Versi batch dari normalize_response untuk satu kolom penuh (mis. kolom
+    context di file uji). Hanya teks yang mengandung kandidat token yang
+    digabung dan diproses dengan satu panggilan regex, lalu dipisah kembali.
+    """
+    texts = [_unicode(text) for text in texts]
+    marked = [index for index, text in enumerate(texts) if _may_have_markup(text)]
+    if marked:
+        joined = _markup_regex.sub(" ", BATCH_SEPARATOR.join(texts[index].replace(BATCH_SEPARATOR, " ") for index in marked))
+        for index, part in zip(marked, joined.split(BATCH_SEPARATOR)):
+            texts[index] = part
+    return [" ".join(text.split()) for text in texts]
 
-    for line in diff:
-        op, word = line[:1], line[2:]
 
-        if op in ('-', '+'):
-            current_word += word
-            prev_op = op
-            has_difference = True
-        else:
-            if prev_op in ('-', '+'):
-                modified_text += f'({current_word})'
-                current_word = ''
-            modified_text += word
-            prev_op = None
-
-    if current_word:
-        modified_text += f'({current_word})'
-
-    if has_difference:
-        return modified_text
-    else:
-        return ""
-    
 @log_function_status
 def respond_csv_correction(respond_csv):
-    respond_csv = re.sub(r'\(bubble\d*\)', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\[button\]', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\(button\)', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\[List Menu\]', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\[carousel\]', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\[carousel button\]', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\[image\]', ' ', respond_csv, flags=re.IGNORECASE)
-    respond_csv = re.sub(r'\n', '', respond_csv, flags=re.IGNORECASE)
-    
-    return respond_csv
+    return normalize_response(respond_csv)
 
 def respond_bot_correction(respond_bot):
-    respond_bot = re.sub(r'\(bubble\d*\)', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\[button\]', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\(button\)', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\[List Menu\]', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\[carousel\]', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\[carousel button\]', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\[image\]', ' ', respond_bot, flags=re.IGNORECASE)
-    respond_bot = re.sub(r'\n', '', respond_bot, flags=re.IGNORECASE)
-    
-    return respond_bot   
+    return normalize_response(respond_bot)
+
@@ -1,41 +1,118 @@
 import os
+import asyncio
+import time
+import weakref
+from telethon import errors, events
 from telethon.sync import TelegramClient
 from telethon.sessions import StringSession
 from telethon.tl.types import User, Chat, Channel
 
 API_ID = os.getenv("API_ID")
 API_HASH = os.getenv("API_HASH")
-SESSION_STRING = os.getenv("TELEGRAM_SESSION")
+# Beberapa session (dipisah koma) untuk mode paralel; session pertama dipakai sebagai client utama
+SESSION_STRINGS = [item.strip() for item in os.getenv("TELEGRAM_SESSIONS", "").split(",") if item.strip()]
+SESSION_STRING = os.getenv("TELEGRAM_SESSION") or (SESSION_STRINGS[0] if SESSION_STRINGS else None)
 
-# Validasi kredensial
-if not all([API_ID, API_HASH, SESSION_STRING]):
-    platform = os.getenv('PLATFORM', 'webchat').lower()
-    if platform in ['telegram']:
-        raise ValueError("API_ID, API_HASH, atau TELEGRAM_SESSION tidak ditemukan. Pastikan sudah diatur di GitHub Secrets atau environment variables lokal.")
+# Batas waktu menunggu balasan pertama (detik) dan jeda tanpa pesan baru sebelum balasan dianggap selesai (detik)
+TELEGRAM_REPLY_TIMEOUT = float(os.getenv("TELEGRAM_REPLY_TIMEOUT", "60"))
+TELEGRAM_QUIET_PERIOD = float(os.getenv("TELEGRAM_QUIET_PERIOD", "3"))
+# Jumlah pertanyaan yang boleh menunggu balasan bersamaan (semua session) dan batas tidur FloodWait (detik)
+TELEGRAM_CONCURRENCY = int(os.getenv("TELEGRAM_CONCURRENCY", "4"))
+TELEGRAM_FLOOD_WAIT_MAX = float(os.getenv("TELEGRAM_FLOOD_WAIT_MAX", "300"))
+TELEGRAM_SEND_RETRIES = 3
 
-# Inisialisasi client menggunakan StringSession
-client = TelegramClient(StringSession(SESSION_STRING), API_ID, API_HASH) if all([API_ID, API_HASH, SESSION_STRING]) else None
+def telethon_client_factory(session_string):
+    return TelegramClient(StringSession(session_string), API_ID, API_HASH)
 
-async def send_message_to_bot(bot_username, text):
-    """Mengirim pesan ke bot target."""
-    if not client:
+# Factory pembuat client; bisa diganti lewat set_client_factory (mis. client palsu di tests/)
+client_factory = telethon_client_factory
+
+def set_client_factory(factory):
+    global client_factory
+    client_factory = factory
+
+def create_client(session_string):
+    return client_factory(session_string)
+
+def session_strings():
+    """Semua session yang tersedia: TELEGRAM_SESSIONS, atau TELEGRAM_SESSION saja."""
+    return SESSION_STRINGS or ([SESSION_STRING] if SESSION_STRING else [])
+
+def bot_usernames(default_username=None):
+    """Daftar bot target dari TARGET_BOT_USERNAMES (dipisah koma), atau satu bot default."""
+    usernames = [item.strip() for item in os.getenv("TARGET_BOT_USERNAMES", "").split(",") if item.strip()]
+    return usernames or ([default_username] if default_username else [])
+
+# Client utama dibuat saat pertama kali dipakai (lihat get_client), bukan saat modul diimpor
+client = None
+
+def get_client():
+    """Client utama (TELEGRAM_SESSION), dibuat sekali saat pertama kali dibutuhkan."""
+    global client
+    if client is None:
+        # Validasi kredensial
+        if client_factory is telethon_client_factory and not all([API_ID, API_HASH, SESSION_STRING]):
+            raise ValueError("API_ID, API_HASH, atau TELEGRAM_SESSION tidak ditemukan. Pastikan sudah diatur di GitHub Secrets atau environment variables lokal.")
+        # Inisialisasi client menggunakan StringSession
+        client = create_client(SESSION_STRING)
+    return client
+
+# Batas akhir FloodWait per client (session), dalam waktu time.monotonic()
+_flood_until = weakref.WeakKeyDictionary()
+
+def flood_remaining(telegram_client):
+    """Sisa detik FloodWait untuk session ini (0 jika tidak sedang dibatasi)."""
+    return max(0.0, _flood_until.get(telegram_client, 0.0) - time.monotonic())
+
+async def wait_flood(telegram_client):
+    """Menunggu sampai FloodWait session ini berakhir; batasnya bisa diperpanjang jalur lain."""
+    while (remaining := flood_remaining(telegram_client)) > 0:
+        await asyncio.sleep(remaining)
+
+def _record_flood(telegram_client, seconds):
+    _flood_until[telegram_client] = max(_flood_until.get(telegram_client, 0.0), time.monotonic() + seconds)
+
+async def send_message_to_bot(bot_username, text, telegram_client=None, retry_flood=True):
+    """
+    Mengirim pesan ke bot target. FloodWait dicatat per session sehingga semua
+    percakapan pada session tersebut menunggu, bukan ikut mengirim. Dengan
+    retry_flood=False pesan tidak ditunggu dan dikirim ulang di sini (False
+    dikembalikan), agar pemanggil bisa melepas slot semaphore dulu (lihat ask_bot).
+    """
+    telegram_client = telegram_client or get_client()
+    if not telegram_client:
         print("Telegram client tidak terinisialisasi.")
         return False
-    try:
-        await client.send_message(bot_username, text)
-        print(f"Pesan terkirim ke '{bot_username}': {text}")
-        return True
-    except Exception as e:
-        print(f"Error saat mengirim pesan ke '{bot_username}': {e}")
-        return False
+    for attempt in range(TELEGRAM_SEND_RETRIES + 1):
+        if flood_remaining(telegram_client) > 0:
+            if not retry_flood:
+                return False
+            await wait_flood(telegram_client)
+        try:
+            await telegram_client.send_message(bot_username, text)
+            print(f"Pesan terkirim ke '{bot_username}': {text}")
+            return True
+        except errors.FloodWaitError as e:
+            if e.seconds > TELEGRAM_FLOOD_WAIT_MAX or (retry_flood and attempt == TELEGRAM_SEND_RETRIES):
+                print(f"Error saat mengirim pesan ke '{bot_username}': FloodWait {e.seconds} detik")
+                return False
+            print(f"FloodWait {e.seconds} detik untuk '{bot_username}', menunggu sebelum mengirim ulang")
+            _record_flood(telegram_client, e.seconds)
+            if not retry_flood:
+                return False
+        except Exception as e:
+            print(f"Error saat mengirim pesan ke '{bot_username}': {e}")
+            return False
+    return False
 
 async def get_latest_message_from_bot(bot_username):
     """Mendapatkan pesan terakhir dari bot target."""
-    if not client:
+    telegram_client = get_client()
+    if not telegram_client:
         print("Telegram client tidak terinisialisasi.")
         return None
     try:
-        messages = await client.get_messages(bot_username, limit=1)
+        messages = await telegram_client.get_messages(bot_username, limit=1)
         if messages:
             latest_message = messages[0]
             print(f"Pesan diterima dari '{bot_username}': {latest_message.text}")
@@ -43,3 +120,97 @@ async def get_latest_message_from_bot(bot_username):
         return "Tidak ada pesan ditemukan."
     except Exception as e:
         print(f"Error saat mengambil pesan dari '{bot_username}': {e}")
+
+
+class ReplyCollector:
+    """
+    Menampung pesan masuk dari satu bot lewat handler events.NewMessage,
+    sehingga balasan ditunggu berdasarkan event, bukan sleep tetap.
+    """
+
+    def __init__(self, telegram_client, bot_username):
+        self.client = telegram_client
+        self.bot_username = bot_username
+        self.queue = asyncio.Queue()
+        self.event = None
+
+    async def start(self):
+        chat_id = await self.client.get_peer_id(self.bot_username)
+        self.event = events.NewMessage(chats=[chat_id], incoming=True)
+        self.client.add_event_handler(self._on_message, self.event)
+        return self
+
+    async def _on_message(self, event):
+        self.queue.put_nowait((time.monotonic(), event.message.text or ""))
+
+    def drain(self):
+        """Membuang pesan yang datang terlambat dari pertanyaan sebelumnya."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def wait_reply(self, sent_at, timeout=None, quiet_period=None):
+        """
+        Mengumpulkan semua pesan bot sampai tidak ada pesan baru selama
+        `quiet_period` detik atau `timeout` habis (default TELEGRAM_QUIET_PERIOD
+        dan TELEGRAM_REPLY_TIMEOUT, dibaca saat dipanggil).
+        Mengembalikan (teks balasan, latensi balasan pertama dalam detik atau None).
+        """
+        timeout = TELEGRAM_REPLY_TIMEOUT if timeout is None else timeout
+        quiet_period = TELEGRAM_QUIET_PERIOD if quiet_period is None else quiet_period
+        messages = []
+        first_reply_at = None
+        deadline = sent_at + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            wait = min(quiet_period, remaining) if messages else remaining
+            if wait <= 0:
+                break
+            try:
+                received_at, text = await asyncio.wait_for(self.queue.get(), wait)
+            except asyncio.TimeoutError:
+                break
+            if first_reply_at is None:
+                first_reply_at = received_at
+            messages.append(text)
+
+        latency = first_reply_at - sent_at if first_reply_at is not None else None
+        if messages:
+            print(f"Pesan diterima dari '{self.bot_username}' ({len(messages)} pesan, {latency:.2f} detik)")
+        else:
+            print(f"Tidak ada balasan dari '{self.bot_username}' setelah {timeout:.0f} detik")
+        return "\n".join(messages).strip(), latency
+
+    def stop(self):
+        if self.event is not None:
+            self.client.remove_event_handler(self._on_message, self.event)
+            self.event = None
+
+
+async def start_reply_collector(bot_username, telegram_client=None):
+    """Mendaftarkan handler pesan masuk untuk bot target."""
+    telegram_client = telegram_client or get_client()
+    if not telegram_client:
+        print("Telegram client tidak terinisialisasi.")
+        return None
+    return await ReplyCollector(telegram_client, bot_username).start()
+
+async def ask_bot(bot_username, text, telegram_client=None, semaphore=None, collector=None):
+    """
+    Mengirim satu pertanyaan dan menunggu balasannya di dalam slot `semaphore`.
+    FloodWait session ditunggu sebelum slot diambil, sehingga percakapan di
+    session lain tetap berjalan. Mengembalikan (teks balasan, latensi) atau (None, None).
+    """
+    telegram_client = telegram_client or get_client()
+    semaphore = semaphore or asyncio.Semaphore(1)
+    for attempt in range(TELEGRAM_SEND_RETRIES + 1):
+        await wait_flood(telegram_client)
+        async with semaphore:
+            if collector:
+                collector.drain()
+            sent_at = time.monotonic()
+            sent = await send_message_to_bot(bot_username, text, telegram_client, retry_flood=False)
+            if sent:
+                return await collector.wait_reply(sent_at) if collector else (None, None)
+        if flood_remaining(telegram_client) <= 0:
+            break
+    return None, None
@@ -10,6 +10,117 @@ from selenium.webdriver.common.keys import Keys
 from module import modul
 from colorama import Fore, Style
 import sys
+import os
+import logging
+
+# Batas waktu menunggu balasan bot (detik) dan jeda tanpa bubble baru sebelum balasan dianggap selesai (ms)
+WEBCHAT_REPLY_TIMEOUT = float(os.getenv("WEBCHAT_REPLY_TIMEOUT", "120"))
+WEBCHAT_SETTLE_MS = int(os.getenv("WEBCHAT_SETTLE_MS", "1500"))
+# JavaScript opsional untuk mereset percakapan lewat API widget (mis. "window.BotikaChat.reset()").
+# Kosong = halaman di-refresh per topik agar bot memulai sesi baru
+WEBCHAT_RESET_SCRIPT = os.getenv("WEBCHAT_RESET_SCRIPT", "")
+
+# MutationObserver pada container chat. Selesai jika sudah ada bubble berisi teks setelah
+# bubble pesan yang baru dikirim dan tidak ada perubahan DOM selama settleMs, atau jika
+# timeoutMs habis. Timer settle dibatalkan selama balasan belum ada.
+WAIT_REPLY_SCRIPT = """
+const [className, contentClass, sentText, settleMs, timeoutMs, done] = arguments;
+const norm = (text) => (text || '').trim().toLowerCase();
+const wrappers = document.getElementsByClassName(className);
+const root = (wrappers.length && wrappers[0].parentElement) || document.body;
+const start = Date.now();
+let settleTimer = null;
+let finished = false;
+
+const textAt = (index) => {
+  const content = wrappers[index].getElementsByClassName(contentClass)[0];
+  return content ? norm(content.innerText) : '';
+};
+// Balasan = bubble tidak kosong setelah bubble user terakhir dengan teks yang dikirim
+const hasReply = () => {
+  const sent = norm(sentText);
+  let sentIndex = -1;
+  for (let i = wrappers.length - 1; i >= 0; i--) {
+    if (textAt(i) === sent) {
+      sentIndex = i;
+      break;
+    }
+  }
+  if (sentIndex < 0) return false;
+  for (let i = sentIndex + 1; i < wrappers.length; i++) {
+    if (textAt(i) !== '') return true;
+  }
+  return false;
+};
+const finish = (status) => {
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearTimeout(settleTimer);
+  clearTimeout(timeoutTimer);
+  done({status: status, elapsed_ms: Date.now() - start, wrappers: wrappers.length});
+};
+const check = () => {
+  clearTimeout(settleTimer);
+  if (!hasReply()) return;
+  settleTimer = setTimeout(() => finish('settled'), settleMs);
+};
+
+const observer = new MutationObserver(check);
+observer.observe(root, {childList: true, subtree: true, characterData: true});
+const timeoutTimer = setTimeout(() => finish(hasReply() ? 'settled' : 'timeout'), timeoutMs);
+check();
+"""
+
+# Mengambil teks semua bubble bot setelah pesan user terakhir (pesan yang sama dengan teks yang dikirim)
+GET_REPLY_SCRIPT = """
+const [className, contentClass, bubbleClass, sentText] = arguments;
+const start = performance.now();
+const norm = (text) => (text || '').trim().toLowerCase();
+const wrappers = Array.from(document.getElementsByClassName(className));
+
+let sentIndex = -1;
+for (let i = wrappers.length - 1; i >= 0; i--) {
+  const content = wrappers[i].getElementsByClassName(contentClass)[0];
+  if (content && norm(content.innerText) === norm(sentText)) {
+    sentIndex = i;
+    break;
+  }
+}
+
+const replies = sentIndex < 0 ? [] : wrappers.slice(sentIndex + 1);
+const bubbles = [];
+for (const wrapper of replies) {
+  for (const bubble of wrapper.getElementsByClassName(bubbleClass)) {
+    bubbles.push(bubble.innerText);
+  }
+}
+return {bubbles: bubbles, wrappers: replies.length, script_ms: Math.round(performance.now() - start)};
+"""
+
+# Reset percakapan lewat API widget (WEBCHAT_RESET_SCRIPT), lalu sembunyikan bubble lama
+# agar tidak terbaca sebagai balasan. Node tidak dihapus agar tidak merusak render widget.
+# Menyembunyikan bubble saja bukan reset: konteks percakapan di server bot tetap ada.
+RESET_CONVERSATION_SCRIPT = """
+const [className, resetScript] = arguments;
+try {
+  (new Function(resetScript))();
+} catch (e) {
+  return {ok: false, method: 'widget', error: String(e)};
+}
+const wrappers = document.getElementsByClassName(className);
+for (const wrapper of wrappers) {
+  wrapper.style.display = 'none';
+}
+return {ok: true, method: 'widget', cleared: wrappers.length};
+"""
+
+# Widget dianggap sehat jika halaman selesai dimuat dan input serta tombol kirim tersedia
+HEALTH_CHECK_SCRIPT = """
+const input = document.getElementById('input-message');
+const button = document.getElementById('button-send');
+return document.readyState === 'complete' && !!input && !input.disabled && !!button;
+"""
 
 def wait_time(numbres=1):
     time.sleep(numbres)
@@ -62,12 +173,69 @@ def prechat_form(driver, greeting, name, email, phone):
         pass
 
 
+def health_check(driver):
+    """Memeriksa apakah widget webchat masih bisa dipakai tanpa reload."""
+    try:
+        return bool(driver.execute_script(HEALTH_CHECK_SCRIPT))
+    except Exception:
+        return False
+
+def reset_conversation(driver, class_name="message-content-wrapper"):
+    """
+    Memulai percakapan baru. Dengan WEBCHAT_RESET_SCRIPT, percakapan direset
+    lewat API widget di halaman yang sama; tanpa script tersebut, atau jika
+    reset gagal / health check tidak lolos, halaman di-refresh seperti
+    sebelumnya (URL history=false membuka sesi baru).
+    Mengembalikan (metode, durasi dalam detik).
+    """
+    start = time.perf_counter()
+    result = None
+    if WEBCHAT_RESET_SCRIPT:
+        try:
+            result = driver.execute_script(RESET_CONVERSATION_SCRIPT, class_name, WEBCHAT_RESET_SCRIPT)
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+
+    if result and result.get("ok") and health_check(driver):
+        method = result.get("method", "widget")
+    else:
+        if result is not None:
+            print(Fore.YELLOW + f"Reset percakapan gagal ({result.get('error', 'health check')}), refresh halaman" + Style.RESET_ALL)
+        modul.refresh(driver)
+        modul.wait_time(3)
+        method = "refresh"
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"reset_conversation: {method} dalam {elapsed:.2f} detik")
+    return method, elapsed
+
 def wait_reply(driver, class_name="message-content-wrapper", content="content", msgs="hello"):
+    """
+    Menunggu balasan bot dengan MutationObserver di browser (satu round trip
+    WebDriver). Jika script gagal dijalankan, kembali ke metode polling.
+    """
+    driver.implicitly_wait(0)
+    driver.set_script_timeout(WEBCHAT_REPLY_TIMEOUT + 5)
+    try:
+        result = driver.execute_async_script(
+            WAIT_REPLY_SCRIPT, class_name, content, msgs, WEBCHAT_SETTLE_MS, int(WEBCHAT_REPLY_TIMEOUT * 1000)
+        )
+    except Exception as e:
+        print(Fore.YELLOW + f"MutationObserver gagal ({e}), kembali ke polling" + Style.RESET_ALL)
+        wait_reply_polling(driver, class_name, content, msgs)
+        return None
+
+    if result.get("status") == "timeout":
+        print(Fore.RED + f"Tidak ada balasan setelah {WEBCHAT_REPLY_TIMEOUT:.0f} detik" + Style.RESET_ALL)
+    else:
+        print(f"Balasan terdeteksi dalam {result.get('elapsed_ms')} ms")
+    return result
+
+def wait_reply_polling(driver, class_name="message-content-wrapper", content="content", msgs="hello"):
     send_msgs = msgs
     stoper = True
     start_time = time.time()
-    seconds = 120
-    driver.implicitly_wait(120)
+    seconds = WEBCHAT_REPLY_TIMEOUT
     while stoper:
         time.sleep(0.5)
         current_time = time.time()
@@ -75,7 +243,6 @@ def wait_reply(driver, class_name="message-content-wrapper", content="content",
         # print("Elapsed Time :",round(float(elapsed_time),3))
         try:
             len_last_chat = driver.find_elements(By.CLASS_NAME, class_name)[-1]
-            driver.implicitly_wait(120)
             elem_last_chat = len_last_chat.find_element(By.CLASS_NAME ,content)
             elem_text = elem_last_chat.text
             # print("elem_text", elem_text)
@@ -125,251 +292,22 @@ def send_message(driver, question):
         pass
 
 def get_reply_chat(driver, class_name="message-content-wrapper", content="content", messages="hai", message_content="message-content"):
-    message = messages
-    reply = []
-    try:
-        len_last_second = driver.find_elements(By.CLASS_NAME, class_name)[-2]
-        elem_last_second = len_last_second.find_element(By.CLASS_NAME, content)
-        elem_second_text = elem_last_second.text
-        # jika elemen kedua terakhir sama dengan text yang dikirim
-        if elem_second_text.lower().strip() == message.lower().strip():
-            # jika balasan chat hanya ada satu pesan
-            try:
-                first_text = driver.find_elements(By.CLASS_NAME, class_name)[-1]
-                elem_first_text = first_text.find_elements(By.CLASS_NAME, message_content)
-                len_msg_content = len(elem_first_text)
-                print("Jumlah bubble:", len_msg_content, "bubble")
-                # reply = []
-                for i, val in enumerate(elem_first_text):
-                    time.sleep(0.3)
-                    # driver.implicitly_wait(30)
-                    text_list = val.text
-                    reply.append(text_list)
-                    # log
-                    # print("text_data {} :".format(i), text_list)
-                # log
-                # print(reply)
-                # get_reply = "\n".join(reply)
-                # print("Balasan Chat hanya satu:\n---\n",
-                #       get_reply.strip(), "\n---")
-                # print("+Balasan Chat 1 pesan+")
-            except IndexError:
-                print("excep handling response.py file")
-                pass
-        else:
-            pass
-    except:
-        pass
-    # jika balasan chat ada 2 response
-    try:
-        len_last_third = driver.find_elements(By.CLASS_NAME, class_name)[-3]
-        elem_last_third = len_last_third.find_element(By.CLASS_NAME, content)
-        elem_last_third = elem_last_third.text
-        # jika elemen ketiga terakhir sama dengan text yang dikirim
-        if elem_last_third.lower().strip() == message.lower().strip():
-            try:
-                # reply = []
-                loop = -2  # -2,-1 < 0
-                while loop < 0:
-                    try:
-                        time.sleep(2)
-                        first_text = driver.find_elements(By.CLASS_NAME, class_name)[loop]
-                        elem_first_text = first_text.find_elements(By.CLASS_NAME, message_content)
-                        # log
-                        len_msg_content = len(elem_first_text)
-                        print("Jumlah bubble:", len_msg_content, "bubble")
-                        for i, val in enumerate(elem_first_text):
-                            time.sleep(0.5)
-                            text_list = val.text
-                            reply.append(text_list)
-                            # log
-                            # print("text_data {} :".format(i), text_list)
-                        loop += 1
-                        # jika 0 < 0 = Flase [stop]
-                    except:
-                        pass
-                # log
-                # print(reply)
-                # get_reply = "\n".join(reply)
-                # print("Balasan Chat Ada 2:\n---\n",
-                #       get_reply.strip(), "\n---")
-                # print("+Balasan Chat 2 pesan+")
-            except:
-                pass
-        else:
-            pass
-    except:
-        pass
-    # jika balasan chat ada 3 response
+    """
+    Mengambil semua bubble balasan bot setelah pesan user terakhir dalam satu
+    panggilan execute_script. Mendukung jumlah bubble berapa pun.
+    """
+    start = time.perf_counter()
     try:
-        len_last_third = driver.find_elements(By.CLASS_NAME, class_name)[-4]
-        elem_last_third = len_last_third.find_element(By.CLASS_NAME, content)
-        elem_last_third = elem_last_third.text
-        # jika elemen keempat terakhir sama dengan text yang dikirim
-        if elem_last_third.lower().strip() == message.lower().strip():
-            try:
-                # reply = []
-                loop = -3  # -2,-1 < 0
-                while loop < 0:
-                    try:
-                        time.sleep(2)
-                        first_text = driver.find_elements(By.CLASS_NAME, class_name)[loop]
-                        elem_first_text = first_text.find_elements(By.CLASS_NAME, message_content)
-                        # log
-                        len_msg_content = len(elem_first_text)
-                        print("Jumlah bubble:", len_msg_content, "bubble")
-                        for i, val in enumerate(elem_first_text):
-                            time.sleep(0.5)
-                            text_list = val.text
-                            reply.append(text_list)
-                            # log
-                            # print("text_data {} :".format(i), text_list)
-                        loop += 1
-                        # jika 0 < 0 = Flase [stop]
-                    except:
-                        pass
-                # log
-                # print(reply)
-                # get_reply = "\n".join(reply)
-                # print("Balasan Chat Ada 3:\n---\n",
-                #       get_reply.strip(), "\n---")
-                # print("+Balasan Chat 3 pesan+")
-            except:
-                pass
-        else:
-            pass
-    except:
-        pass
-    # jika balasan chat ada 4 response
-    try:
-        len_last_third = driver.find_elements(By.CLASS_NAME, class_name)[-5]
-        elem_last_third = len_last_third.find_element(By.CLASS_NAME, content)
-        elem_last_third = elem_last_third.text
-        # jika elemen keempat terakhir sama dengan text yang dikirim
-        if elem_last_third.lower().strip() == message.lower().strip():
-            try:
-                # reply = []
-                loop = -4  # -2,-1 < 0
-                while loop < 0:
-                    try:
-                        time.sleep(2)
-                        first_text = driver.find_elements(By.CLASS_NAME, class_name)[loop]
-                        elem_first_text = first_text.find_elements(By.CLASS_NAME, message_content)
-                        # log
-                        len_msg_content = len(elem_first_text)
-                        print("Jumlah bubble:", len_msg_content, "bubble")
-                        for i, val in enumerate(elem_first_text):
-                            time.sleep(0.5)
-                            text_list = val.text
-                            reply.append(text_list)
-                            # log
-                            # print("text_data {} :".format(i), text_list)
-                        loop += 1
-                        # jika 0 < 0 = Flase [stop]
-                    except:
-                        pass
-                # log
-                # print(reply)
-                # get_reply = "\n".join(reply)
-                # print("Balasan Chat Ada 4:\n---\n",
-                #       get_reply.strip(), "\n---")
-                # print("+Balasan Chat 4 pesan+")
-            except:
-                pass
-        else:
-            pass
-    except:
-        pass
-    # jika balasan chat ada 5 response
-    try:
-        len_last_third = driver.find_elements(By.CLASS_NAME, class_name)[-6]
-        elem_last_third = len_last_third.find_element(By.CLASS_NAME, content)
-        elem_last_third = elem_last_third.text
-        # jika elemen keempat terakhir sama dengan text yang dikirim
-        if elem_last_third.lower().strip() == message.lower().strip():
-            try:
-                # reply = []
-                loop = -5  # -2,-1 < 0
-                while loop < 0:
-                    try:
-                        time.sleep(2)
-                        first_text = driver.find_elements(By.CLASS_NAME, class_name)[loop]
-                        elem_first_text = first_text.find_elements(By.CLASS_NAME, message_content)
-                        # log
-                        len_msg_content = len(elem_first_text)
-                        print("Jumlah bubble:", len_msg_content, "bubble")
-                        for i, val in enumerate(elem_first_text):
-                            time.sleep(0.5)
-                            text_list = val.text
-                            reply.append(text_list)
-                            # log
-                            # print("text_data {} :".format(i), text_list)
-                        loop += 1
-                        # jika 0 < 0 = Flase [stop]
-                    except:
-                        pass
-                # log
-                # print(reply)
-                # get_reply = "\n".join(reply)
-                # print("Balasan Chat Ada 5:\n---\n",
-                #       get_reply.strip(), "\n---")
-                # print("+Balasan Chat 5 pesan+")
-            except:
-                pass
-        else:
-            pass
-    except:
-        pass
-    # log
-    # print(reply)
-    get_reply = "\n".join(reply)
-    # print("+"*14,">Balasan Chat<","+"*14)
-    # print(get_reply.strip())
-    # print("+"*14,">Balasan Chat<","+"*14)
-    # print("$__2 Ambil Text Balasan Chat__$")
-    # print()
+        result = driver.execute_script(GET_REPLY_SCRIPT, class_name, content, message_content, messages)
+    except Exception as e:
+        print(Fore.RED + f"❌ Gagal mengambil balasan chat: {e}" + Style.RESET_ALL)
+        return []
 
+    reply = result.get("bubbles", []) if result else []
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print("Jumlah bubble:", len(reply), "bubble")
+    logging.info(
+        f"get_reply_chat: {len(reply)} bubble dari {result.get('wrappers', 0) if result else 0} pesan, "
+        f"script {result.get('script_ms', 0) if result else 0} ms, total {elapsed_ms:.0f} ms"
+    )
     return reply
-
-
-
-
-
-    # try:
-    #     respondin = driver.find_elements(By.CLASS_NAME, "message-in")[-1]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    
-    # except:
-    #     pass
-    
-    # try:
-    #     respondin = driver.find_elements(By.CSS_SELECTOR, ".message-in")[-2]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    # except:
-    #     pass
-
-    # try:
-    #     respondin = driver.find_elements(By.CSS_SELECTOR, ".message-in")[-3]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    # except:
-    #     pass
-
-    # try:
-    #     respondin = driver.find_elements(By.CSS_SELECTOR, ".message-in")[-4]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    # except:
-    #     pass
-
-    # try:
-    #     respondin = driver.find_elements(By.CSS_SELECTOR, ".message-in")[-5]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    # except:
-    #     pass
-
-    # try:
-    #     respondin = driver.find_elements(By.CSS_SELECTOR, ".message-in")[-6]
-    #     respond_bot = respondin.find_element(By.CLASS_NAME, "content").text
-    # except:
-    #     pass
-
-    # return respond_bot
\ No newline at end of file
@@ -1,52 +1,25 @@
 import datetime
+import os
 import time
 import uuid
 from art import *
-from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from module import envwebchat, envfolder
+from module import envfolder, envdriver, envprogress
 from colorama import Fore, Style
-import sys
 import logging
 import datetime
 
-# Driver
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
+# Perkiraan memori yang dipakai satu sesi headless Chrome (MB)
+WEBCHAT_WORKER_MEMORY_MB = int(os.getenv("WEBCHAT_WORKER_MEMORY_MB", "600"))
 
 
 
 
 def show_loading(title):
-    animation = "|/-\\"
-    for i in range(15):
-        time.sleep(0.1)  # Jeda antara setiap titik
-        sys.stdout.write(Fore.BLUE + "\r" + title + animation[i % len(animation)])
-        sys.stdout.flush()
-    # Setelah animasi selesai, ganti karakter animasi menjadi centang
-    sys.stdout.write(Fore.BLUE + "\r" + title + " ✔")
-    sys.stdout.flush()
-    print(Style.RESET_ALL)  # Ganti warna konsol ke default setelah loading selesai
+    # Tanpa animasi/jeda; progress live ditangani envprogress di thread terpisah
+    envprogress.message(title + " ✔", Fore.BLUE)
 
 def show_loading_sampletext(title):
-    animation = "|/-\\"
-    for i in range(10):
-        time.sleep(0.1)  # Jeda antara setiap titik
-        sys.stdout.write(Fore.WHITE + "\r" + title + animation[i % len(animation)])
-        sys.stdout.flush()
-    # Setelah animasi selesai, ganti karakter animasi menjadi centang
-    sys.stdout.write(Fore.WHITE + "\r" + title + " ✔")
-    sys.stdout.flush()
-    print(Style.RESET_ALL)
+    envprogress.message(title + " ✔", Fore.WHITE)
 
 def initialize(text):
     print(Fore.RED + text2art(text))
@@ -66,11 +39,20 @@ def start_time():
     start = time.time()
     return start
 
-def end_time(start):
-    end_time = time.time() - start
+def end_time(start, offset=0):
+    # `offset` = detik yang sudah berjalan sebelumnya (mis. dari run yang dilanjutkan)
+    end_time = time.time() - start + offset
     duration = time.strftime("%H:%M:%S", time.gmtime(end_time))
     return duration
 
+def duration_seconds(duration):
+    # Kebalikan end_time: "HH:MM:SS" menjadi jumlah detik
+    try:
+        hours, minutes, seconds = (int(part) for part in str(duration).split(":"))
+    except ValueError:
+        return 0
+    return hours * 3600 + minutes * 60 + seconds
+
 def id_test():
     unique_id = str(uuid.uuid4())
     # Mengambil 8 karakter pertama dari ID unik
@@ -87,6 +69,12 @@ def wait_time(numbres=1):
 
 
 def read_browser(url, browser):
+    # Selenium baru dimuat saat browser dibutuhkan, bukan saat modul diimpor
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
     browser = browser.upper()
     title = f"Choose {browser} as a main browser and open the Webchat URL"
     show_loading(title)
@@ -99,7 +87,7 @@ def read_browser(url, browser):
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument("--window-size=1920,1080")
         
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
+        driver = webdriver.Chrome(service=envdriver.service("chrome"), options=chrome_options)
         driver.maximize_window()
 
         browser_name = "Google Chrome"
@@ -111,7 +99,7 @@ def read_browser(url, browser):
         edge_options.add_argument('--disable-dev-shm-usage')
         edge_options.add_argument("--window-size=1920,1080")
 
-        driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()), options=edge_options)
+        driver = webdriver.Edge(service=envdriver.service("edge"), options=edge_options)
         driver.maximize_window()
         browser_name = "Microsoft Edge"
         
@@ -122,7 +110,7 @@ def read_browser(url, browser):
         firefox_options.add_argument('--disable-dev-shm-usage')
         firefox_options.add_argument("--window-size=1920,1080")
 
-        driver =  webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=firefox_options)
+        driver =  webdriver.Firefox(service=envdriver.service("firefox"), options=firefox_options)
         driver.maximize_window()
         browser_name = "Firefox"
         
@@ -133,6 +121,28 @@ def read_browser(url, browser):
     title_page = "{}".format(driver.title)
     return driver, title_page, browser_name
 
+def available_memory_mb():
+    """Memori yang masih tersedia (MB) dari /proc/meminfo, None jika tidak bisa dibaca."""
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def worker_pool_size(requested):
+    """
+    Membatasi jumlah sesi browser paralel sesuai jumlah core CPU dan memori
+    yang tersedia (WEBCHAT_WORKER_MEMORY_MB per sesi). Minimal 1.
+    """
+    size = min(requested, os.cpu_count() or 1)
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        size = min(size, memory_mb // max(WEBCHAT_WORKER_MEMORY_MB, 1))
+    return max(1, size)
+
 def refresh(driver):
     driver.refresh()
 
@@ -1,9 +1,99 @@
 import json
 import os
+import time
 import uuid
 import logging
 from typing import Optional, Tuple, List, Dict, Any
 
+SESSIONS_DIR = 'session'
+# Index of known sessions: cookie file path -> mtime, essential cookies, earliest expiry.
+# Kept outside the session folder so writing it does not change that folder's mtime.
+SESSION_INDEX_PATH = os.path.join('cache', 'session_index.json')
+ESSENTIAL_COOKIES = ['c_user', 'xs']  # Reduced to only the most critical cookies
+
+_index: Optional[Dict[str, Any]] = None
+
+def _cookie_file(path: str) -> str:
+    """Resolve a session folder to its cookie file (sessionfb.json first, then cookies.json)."""
+    if os.path.isdir(path):
+        sessionfb_path = os.path.join(path, 'sessionfb.json')
+        if os.path.exists(sessionfb_path):
+            return sessionfb_path
+        return os.path.join(path, 'cookies.json')
+    return path
+
+def _describe_cookie_file(cookie_file_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a cookie file once and record what session selection needs."""
+    entry = {"mtime": mtime, "valid": False, "missing": [], "expires": None}
+    try:
+        with open(cookie_file_path, 'r') as f:
+            cookies = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return entry
+
+    if not cookies or not isinstance(cookies, list):
+        return entry
+
+    cookie_names = [cookie.get('name', '') for cookie in cookies if isinstance(cookie, dict)]
+    expiries = [
+        cookie['expiry'] for cookie in cookies
+        if isinstance(cookie, dict) and cookie.get('name') in ESSENTIAL_COOKIES and cookie.get('expiry')
+    ]
+    entry["valid"] = True
+    entry["missing"] = [name for name in ESSENTIAL_COOKIES if name not in cookie_names]
+    entry["expires"] = min(expiries) if expiries else None
+    return entry
+
+def _load_index() -> Dict[str, Any]:
+    global _index
+    if _index is None:
+        try:
+            with open(SESSION_INDEX_PATH, 'r') as f:
+                _index = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            _index = {}
+        _index.setdefault("sessions", {})
+    return _index
+
+def _save_index() -> None:
+    index = _load_index()
+    try:
+        os.makedirs(os.path.dirname(SESSION_INDEX_PATH), exist_ok=True)
+        temp_path = f"{SESSION_INDEX_PATH}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_path, SESSION_INDEX_PATH)
+    except OSError as e:
+        logging.warning(f"Failed to write session index: {e}")
+
+def session_info(cookie_file_path: str, session_id: Optional[str] = None, session_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the index entry for a cookie file. The file is only parsed again
+    when its mtime differs from the one recorded in the index.
+    """
+    try:
+        stat = os.stat(cookie_file_path)
+    except OSError:
+        return None
+
+    sessions = _load_index()["sessions"]
+    entry = sessions.get(cookie_file_path)
+    if entry is None or entry.get("mtime") != stat.st_mtime:
+        entry = _describe_cookie_file(cookie_file_path, stat.st_mtime)
+        folder = session_path or os.path.dirname(cookie_file_path)
+        entry["session_id"] = session_id or os.path.basename(folder)
+        entry["session_path"] = folder
+        entry["ctime"] = os.stat(folder).st_ctime if os.path.exists(folder) else stat.st_ctime
+        sessions[cookie_file_path] = entry
+        _save_index()
+    return entry
+
+def _is_usable(entry: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+    if not entry or not entry.get("valid") or entry.get("missing"):
+        return False
+    expires = entry.get("expires")
+    return expires is None or expires > (now or time.time())
+
 def create_session_folder() -> Tuple[str, str]:
     """Create a new session folder with unique ID."""
     session_id = str(uuid.uuid4())
@@ -18,6 +108,7 @@ def save_session_cookies(folder_path: str, cookies: List[Dict[str, Any]]) -> Non
         with open(json_path, 'w') as f:
             json.dump(cookies, f, indent=2)
         logging.info(f"Session cookies saved to {json_path}")
+        session_info(json_path, os.path.basename(folder_path), folder_path)
     except Exception as e:
         logging.error(f"Failed to save session cookies: {e}")
         raise
@@ -44,67 +135,73 @@ def load_session_cookies(folder_path: str) -> Optional[List[Dict[str, Any]]]:
         logging.error(f"Failed to load session cookies: {e}")
     return None
 
+def _refresh_index() -> Dict[str, Any]:
+    """
+    Rescan the session folder only when its mtime changed (a session was
+    added or removed); cookie files are re-parsed only when they changed.
+    Entries that were invalid at the last scan are re-checked every time
+    (one stat each), since fixing a cookie file in place does not change
+    the folder's mtime.
+    """
+    index = _load_index()
+    before = (index.get("dir_mtime"), index.get("latest"))
+    sessions_dir = SESSIONS_DIR  # Changed from 'sessions' to 'session'
+    try:
+        dir_mtime = os.stat(sessions_dir).st_mtime
+    except OSError:
+        dir_mtime = None
+
+    if dir_mtime is not None and index.get("dir_mtime") != dir_mtime:
+        # Check for sessionfb.json file directly
+        sessionfb_path = os.path.join(sessions_dir, 'sessionfb.json')
+        if os.path.exists(sessionfb_path):
+            session_info(sessionfb_path, 'sessionfb', sessions_dir)
+
+        # Also check for traditional session folders
+        for session_id in os.listdir(sessions_dir):
+            session_path = os.path.join(sessions_dir, session_id)
+            cookies_path = os.path.join(session_path, 'cookies.json')
+            if os.path.isdir(session_path) and os.path.exists(cookies_path):
+                session_info(cookies_path, session_id, session_path)
+
+        index["dir_mtime"] = dir_mtime
+
+    for cookie_file_path, entry in list(index["sessions"].items()):
+        if not entry.get("valid"):
+            session_info(cookie_file_path)
+
+    # Forget sessions whose cookie file is gone
+    for cookie_file_path in [path for path in index["sessions"] if not os.path.exists(path)]:
+        del index["sessions"][cookie_file_path]
+
+    ranked = sorted(index["sessions"].items(), key=lambda item: item[1].get("ctime", 0), reverse=True)
+    index["latest"] = [path for path, entry in ranked if entry.get("valid")]
+    if (index.get("dir_mtime"), index["latest"]) != before:
+        _save_index()
+    return index
+
 def find_available_sessions() -> List[Tuple[str, str]]:
     """Find all available session folders with valid cookies."""
+    index = _refresh_index()
     available_sessions = []
-    sessions_dir = 'session'  # Changed from 'sessions' to 'session'
-    
-    if not os.path.exists(sessions_dir):
-        return available_sessions
-    
-    # Check for sessionfb.json file directly
-    sessionfb_path = os.path.join(sessions_dir, 'sessionfb.json')
-    if os.path.exists(sessionfb_path):
-        try:
-            # Validate cookies file
-            with open(sessionfb_path, 'r') as f:
-                cookies = json.load(f)
-                if cookies and isinstance(cookies, list) and len(cookies) > 0:
-                    available_sessions.append(('sessionfb', sessions_dir))
-                    logging.info(f"Found valid Facebook session: sessionfb.json")
-        except (json.JSONDecodeError, IOError):
-            logging.warning(f"Invalid Facebook session found: sessionfb.json")
-    
-    # Also check for traditional session folders
-    for session_id in os.listdir(sessions_dir):
-        session_path = os.path.join(sessions_dir, session_id)
-        cookies_path = os.path.join(session_path, 'cookies.json')
-        
-        if os.path.isdir(session_path) and os.path.exists(cookies_path):
-            try:
-                # Validate cookies file
-                with open(cookies_path, 'r') as f:
-                    cookies = json.load(f)
-                    if cookies and isinstance(cookies, list) and len(cookies) > 0:
-                        available_sessions.append((session_id, session_path))
-                        logging.info(f"Found valid session: {session_id}")
-            except (json.JSONDecodeError, IOError):
-                logging.warning(f"Invalid session found: {session_id}")
-                continue
-    
+    for cookie_file_path in index["latest"]:
+        entry = session_info(cookie_file_path)
+        if entry and entry.get("valid"):
+            available_sessions.append((entry["session_id"], entry["session_path"]))
     return available_sessions
 
 def get_latest_session() -> Optional[Tuple[str, str]]:
-    """Get the most recently created valid session."""
-    sessions = find_available_sessions()
-    if not sessions:
-        return None
-    
-    # Sort by creation time (newest first)
-    sessions_with_time = []
-    for session_id, session_path in sessions:
-        try:
-            stat = os.stat(session_path)
-            sessions_with_time.append((session_id, session_path, stat.st_ctime))
-        except OSError:
+    """Get the most recently created valid session, skipping expired ones."""
+    index = _refresh_index()
+    now = time.time()
+    for cookie_file_path in index["latest"]:
+        entry = session_info(cookie_file_path)
+        if not _is_usable(entry, now):
+            logging.info(f"Skipping unusable session: {cookie_file_path}")
             continue
-    
-    if sessions_with_time:
-        sessions_with_time.sort(key=lambda x: x[2], reverse=True)
-        latest = sessions_with_time[0]
-        logging.info(f"Selected latest session: {latest[0]}")
-        return (latest[0], latest[1])
-    
+        logging.info(f"Selected latest session: {entry['session_id']}")
+        return (entry["session_id"], entry["session_path"])
+
     return None
 
 def validate_session_cookies(cookie_file_path: str) -> bool:
@@ -119,34 +216,27 @@ def validate_session_cookies(cookie_file_path: str) -> bool:
     """
     try:
         # If cookie_file_path is a directory, check for sessionfb.json first
-        if os.path.isdir(cookie_file_path):
-            sessionfb_path = os.path.join(cookie_file_path, 'sessionfb.json')
-            if os.path.exists(sessionfb_path):
-                cookie_file_path = sessionfb_path
-            else:
-                cookie_file_path = os.path.join(cookie_file_path, 'cookies.json')
-        
-        if not os.path.exists(cookie_file_path):
+        cookie_file_path = _cookie_file(cookie_file_path)
+
+        # Parsed result comes from the session index unless the file changed
+        entry = session_info(cookie_file_path)
+        if entry is None:
             logging.warning(f"Cookie file does not exist: {cookie_file_path}")
             return False
-        
-        # Load cookies from file
-        with open(cookie_file_path, 'r') as f:
-            cookies = json.load(f)
-            
-        if not cookies or not isinstance(cookies, list):
+
+        if not entry.get("valid"):
             logging.warning(f"Invalid cookie structure in: {cookie_file_path}")
             return False
-        
+
         # Check for essential Facebook cookies
-        essential_cookies = ['c_user', 'xs']  # Reduced to only the most critical cookies
-        cookie_names = [cookie.get('name', '') for cookie in cookies if isinstance(cookie, dict)]
-        
-        missing_cookies = [name for name in essential_cookies if name not in cookie_names]
-        if missing_cookies:
-            logging.warning(f"Missing essential cookies: {missing_cookies}")
+        if entry.get("missing"):
+            logging.warning(f"Missing essential cookies: {entry['missing']}")
             return False
-        
+
+        if not _is_usable(entry):
+            logging.warning(f"Session cookies expired at {time.ctime(entry['expires'])}: {cookie_file_path}")
+            return False
+
         logging.info(f"Session cookies validated successfully: {cookie_file_path}")
         return True
         
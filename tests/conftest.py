@@ -0,0 +1,44 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from module import envjournal, envllmqueue, envprogress  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Folder kerja sementara: report/, log/ dan cache/ ditulis di sini, bukan di repo."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(envprogress, "PROGRESS_MODE", "off")
+    yield tmp_path
+    envllmqueue.stop_all_workers()
+    envprogress.stop()
+
+
+@pytest.fixture
+def report(workdir):
+    """(report_filename, id_test) unik per test; journal-nya ditutup setelah test."""
+    report_filename, id_test = "Test Knowledge Base", uuid.uuid4().hex[:8]
+    yield report_filename, id_test
+    envjournal.close_journal(f"{report_filename}-{id_test}")
+
+
+def pending_record(no, question, response_bot, respond_text):
+    """Record data bot seperti yang ditulis action sebelum skoring."""
+    return {
+        "no": no,
+        "title": f"Topik {no}",
+        "question": question,
+        "response_kb": respond_text,
+        "response_llm": response_bot,
+        "status": "pending",
+        "duration": "00:00:01",
+        "image_capture": None,
+        "skor": None,
+        "explanation": "",
+    }
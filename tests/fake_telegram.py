@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+from telethon import errors
+
+# Transport Telegram palsu untuk test: dipasang lewat envtelegram.set_client_factory,
+# bot membalas setiap pesan setelah jeda singkat.
+
+
+class FakeTelegramClient:
+    """
+    Pengganti TelegramClient dengan API yang dipakai envtelegram:
+    send_message, get_peer_id, add/remove_event_handler dan context manager.
+    """
+
+    def __init__(self, session=None, reply=None, delay=0.05, chunks=1, flood_every=0, flood_seconds=1):
+        self.session = session
+        self.reply = reply or (lambda text: f"Echo: {text}")
+        self.delay = delay
+        self.chunks = chunks
+        self.flood_every = flood_every
+        self.flood_seconds = flood_seconds
+        self.sent = []
+        self.handlers = []
+        self._peers = {}
+
+    @property
+    def loop(self):
+        return asyncio.get_event_loop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def connect(self):
+        return None
+
+    async def disconnect(self):
+        return None
+
+    async def get_peer_id(self, entity):
+        return self._peers.setdefault(entity, len(self._peers) + 1)
+
+    def add_event_handler(self, callback, event=None):
+        self.handlers.append((callback, event))
+
+    def remove_event_handler(self, callback, event=None):
+        self.handlers = [(cb, ev) for cb, ev in self.handlers if not (cb == callback and ev is event)]
+
+    async def send_message(self, entity, text):
+        self.sent.append((entity, text))
+        if self.flood_every and len(self.sent) % self.flood_every == 0:
+            raise errors.FloodWaitError(request=None, capture=self.flood_seconds)
+
+        peer_id = await self.get_peer_id(entity)
+        asyncio.get_running_loop().create_task(self._deliver(peer_id, str(self.reply(text))))
+
+    async def _deliver(self, peer_id, reply_text):
+        """Mengirim balasan bot (bisa dipecah beberapa pesan) ke handler yang cocok."""
+        size = max(1, -(-len(reply_text) // self.chunks))
+        for start in range(0, len(reply_text) or 1, size):
+            await asyncio.sleep(self.delay)
+            event = SimpleNamespace(message=SimpleNamespace(text=reply_text[start:start + size]))
+            for callback, event_filter in list(self.handlers):
+                chats = getattr(event_filter, "chats", None)
+                if chats is None or peer_id in chats:
+                    await callback(event)
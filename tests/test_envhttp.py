@@ -0,0 +1,143 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from module import envhitllm, envhttp, envllmqueue
+
+
+class StubEvaluator(ThreadingHTTPServer):
+    """Server HTTP lokal yang membalas POST sesuai urutan `responses` (status, header, body)."""
+
+    def __init__(self, responses):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.responses = list(responses)
+        self.hits = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        server = self.server
+        status, headers, body = server.responses[min(server.hits, len(server.responses) - 1)]
+        server.hits += 1
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(responses):
+        server = StubEvaluator(responses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(envhttp, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(envhttp, "LLM_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(envhttp, "LLM_BACKOFF_MAX", 0.05)
+
+
+OK = (200, {}, {"ok": True})
+
+
+def test_retry_after_on_429_is_honoured(stub_server, fast_retry):
+    server = stub_server([(429, {"Retry-After": "1"}, {}), OK])
+    client = envhttp.EvaluatorClient("test", 0, 1)
+
+    response = client.post(server.url, json={})
+
+    assert response.status_code == 200
+    assert server.hits == 2
+    # Retry-After (1 detik) dipakai walau melebihi LLM_BACKOFF_MAX
+    assert client.metrics["retries"] == 1
+    assert client.metrics["backoff_wait"] >= 1
+    assert client.metrics["errors"] == 0
+
+
+def test_retry_after_is_capped_by_retry_after_max(stub_server, fast_retry, monkeypatch):
+    monkeypatch.setattr(envhttp, "LLM_RETRY_AFTER_MAX", 0.2)
+    server = stub_server([(429, {"Retry-After": "600"}, {}), OK])
+    client = envhttp.EvaluatorClient("test", 0, 1)
+
+    assert client.post(server.url, json={}).status_code == 200
+    assert client.metrics["backoff_wait"] == pytest.approx(0.2)
+
+
+def test_persistent_5xx_returns_last_response(stub_server, fast_retry):
+    server = stub_server([(503, {}, {"error": "overloaded"})])
+    client = envhttp.EvaluatorClient("test", 0, 1)
+
+    response = client.post(server.url, json={})
+
+    assert response.status_code == 503
+    assert server.hits == envhttp.LLM_MAX_RETRIES + 1
+    assert client.metrics["retries"] == envhttp.LLM_MAX_RETRIES
+    assert client.metrics["errors"] == 1
+
+
+def test_non_retryable_status_is_returned_immediately(stub_server, fast_retry):
+    server = stub_server([(400, {}, {"error": "bad request"})])
+    client = envhttp.EvaluatorClient("test", 0, 1)
+
+    assert client.post(server.url, json={}).status_code == 400
+    assert server.hits == 1
+    assert client.metrics["retries"] == 0
+
+
+@pytest.fixture
+def gemini_stub(stub_server, fast_retry, workdir, monkeypatch):
+    def start(responses):
+        server = stub_server(responses)
+        monkeypatch.setenv("API_KEY_GEMINI", "test")
+        monkeypatch.setattr(envhttp, "GEMINI_BASE_URL", server.url)
+        monkeypatch.setitem(envhttp._clients, "gemini", envhttp.EvaluatorClient("gemini", 0, 1))
+        return server
+    return start
+
+
+def test_score_gemini_parses_score(gemini_stub):
+    text = json.dumps({"Skor": 0.85, "Penjelasan": "Sebagian besar sesuai"})
+    gemini_stub([(200, {}, {"candidates": [{"content": {"parts": [{"text": text}]}}]})])
+
+    score, _, explanation, AI = envhitllm.score_gemini("jawaban bot", "jawaban kb")
+
+    assert score == 0.85
+    assert explanation == "Sebagian besar sesuai"
+    assert AI == envhitllm.AI_GEMINI
+
+
+def test_exhausted_retries_give_error_status(gemini_stub):
+    gemini_stub([(503, {}, {"error": "overloaded"})])
+
+    score, _, explanation, _ = envhitllm.score_gemini("jawaban bot", "jawaban kb")
+    fields = envllmqueue.score_fields(score, explanation, "llm", "jawaban bot", "jawaban kb")
+
+    assert score is None
+    assert explanation.startswith("Skoring gagal")
+    assert fields["status"] == envllmqueue.STATUS_ERROR
+    assert fields["skor"] is None
@@ -0,0 +1,73 @@
+import json
+import re
+
+import pytest
+
+from module import envhitllm, envllmcache
+
+PAIRS = [("jawaban bot 1", "jawaban kb 1"), ("jawaban bot 2", "jawaban kb 2")]
+
+
+@pytest.fixture
+def llm_cache(workdir, monkeypatch):
+    """Cache LLM baru di folder kerja sementara, dengan counter hit/miss dari nol."""
+    monkeypatch.setattr(envllmcache, "LLM_CACHE", True)
+    monkeypatch.setattr(envllmcache, "_connection", None)
+    monkeypatch.setattr(envllmcache, "hits", 0)
+    monkeypatch.setattr(envllmcache, "misses", 0)
+    yield envllmcache
+    if envllmcache._connection is not None:
+        envllmcache._connection.close()
+
+
+@pytest.fixture
+def gemini_calls(monkeypatch):
+    """gemini_request palsu: prompt batch dibalas list skor, prompt tunggal satu skor."""
+    calls = []
+
+    def gemini_request(prompt):
+        calls.append(prompt)
+        ids = [int(item_id) for item_id in re.findall(r'"id": (\d+)', prompt)]
+        if ids:
+            return json.dumps([{"id": item_id, "Skor": 0.8, "Penjelasan": "batch"} for item_id in ids])
+        return json.dumps({"Skor": 0.7, "Penjelasan": "tunggal"})
+
+    monkeypatch.setattr(envhitllm, "gemini_request", gemini_request)
+    return calls
+
+
+def test_get_any_counts_one_lookup(llm_cache):
+    templates = ["template batch", "template tunggal"]
+    assert llm_cache.get_any("model", templates, "kb", "bot") is None
+    llm_cache.put("model", "template tunggal", "kb", "bot", 0.5, "output", "penjelasan")
+
+    assert llm_cache.get_any("model", templates, "kb", "bot") == (0.5, "output", "penjelasan")
+    assert llm_cache.stats() == {"llm_cache_hit": 1, "llm_cache_miss": 1}
+
+
+def test_batch_stats_count_each_pair_once(llm_cache, gemini_calls):
+    envhitllm.hit_llm_to_scoring_gemini_batch(PAIRS)
+    assert llm_cache.stats() == {"llm_cache_hit": 0, "llm_cache_miss": 2}
+
+    results = envhitllm.hit_llm_to_scoring_gemini_batch(PAIRS)
+    assert [result[0] for result in results] == [0.8, 0.8]
+    assert len(gemini_calls) == 1
+    assert llm_cache.stats() == {"llm_cache_hit": 2, "llm_cache_miss": 2}
+
+
+def test_single_rescore_reuses_batch_result(llm_cache, gemini_calls):
+    envhitllm.hit_llm_to_scoring_gemini_batch(PAIRS)
+
+    score, _, explanation, _ = envhitllm.hit_llm_to_scoring_gemini(*PAIRS[0])
+
+    assert (score, explanation) == (0.8, "batch")
+    assert len(gemini_calls) == 1
+
+
+def test_batch_reuses_single_result(llm_cache, gemini_calls):
+    envhitllm.hit_llm_to_scoring_gemini(*PAIRS[0])
+
+    results = envhitllm.hit_llm_to_scoring_gemini_batch(PAIRS)
+
+    assert [result[0] for result in results] == [0.7, 0.7]
+    assert len(gemini_calls) == 2
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from module import envjournal, envllmqueue, envllmscore, envprescore
+from conftest import pending_record
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    """Evaluator LLM palsu yang mencatat setiap panggilan (tunggal dan batch)."""
+    calls = []
+    lock = threading.Lock()
+
+    def llm_score(response_bot, respond_text):
+        with lock:
+            calls.append([response_bot])
+        return 0.9, None, "cocok", "stub"
+
+    def llm_score_batch(pairs):
+        with lock:
+            calls.append([response_bot for response_bot, _ in pairs])
+        return [(0.9, None, "cocok", "stub") for _ in pairs]
+
+    monkeypatch.setattr(envllmscore, "llm_score", llm_score)
+    monkeypatch.setattr(envllmscore, "llm_score_batch", llm_score_batch)
+    monkeypatch.setattr(envprescore, "PRESCORE", False)
+    return calls
+
+
+def write_pending(report, count):
+    journal = envjournal.get_journal(f"{report[0]}-{report[1]}")
+    return journal, [
+        journal.append_data(pending_record(i, f"tanya {i}", f"jawab {i}", f"kb {i}"))
+        for i in range(count)
+    ]
+
+
+def test_worker_sends_full_batch_in_one_request(report, evaluator, monkeypatch):
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_SIZE", 3)
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_WAIT", 5)
+    journal, indexes = write_pending(report, 3)
+
+    envllmqueue.start_workers(*report, workers=1)
+    for index in indexes:
+        envllmqueue.submit(*report, index, f"jawab {index}", f"kb {index}")
+    envllmqueue.stop_all_workers()
+
+    assert evaluator == [["jawab 0", "jawab 1", "jawab 2"]]
+    assert [record["status"] for record in journal.data] == ["pass"] * 3
+
+
+def test_stop_flushes_partial_batch(report, evaluator, monkeypatch):
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_SIZE", 5)
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_WAIT", 30)
+    journal, indexes = write_pending(report, 2)
+
+    envllmqueue.start_workers(*report, workers=1)
+    for index in indexes:
+        envllmqueue.submit(*report, index, f"jawab {index}", f"kb {index}")
+    started = time.monotonic()
+    envllmqueue.stop_all_workers()
+
+    # Batch yang belum penuh tetap dikirim tanpa menunggu SCORING_BATCH_WAIT habis
+    assert time.monotonic() - started < 10
+    assert evaluator == [["jawab 0", "jawab 1"]]
+    assert [record["status"] for record in journal.data] == ["pass"] * 2
+    assert envllmqueue.scoring_queue is None
+
+
+def test_enqueue_unscored_data_backfills_pending_and_error(report, evaluator, monkeypatch):
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_SIZE", 5)
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_WAIT", 0.05)
+    journal, indexes = write_pending(report, 3)
+    journal.update_data(indexes[0], {"skor": 0.8, "status": "pass", "explanation": "ok"})
+    journal.update_data(indexes[2], envllmqueue.error_fields("timeout"))
+
+    envllmqueue.start_workers(*report, workers=1)
+    assert envllmqueue.enqueue_unscored_data(*report) == 2
+    envllmqueue.stop_all_workers()
+
+    assert sorted(response for call in evaluator for response in call) == ["jawab 1", "jawab 2"]
+    assert [record["status"] for record in journal.data] == ["pass"] * 3
+    assert journal.data[0]["explanation"] == "ok"
+
+
+def test_worker_exception_marks_batch_as_error(report, monkeypatch):
+    def llm_score_batch(pairs):
+        raise RuntimeError("evaluator mati")
+
+    monkeypatch.setattr(envllmscore, "llm_score_batch", llm_score_batch)
+    monkeypatch.setattr(envprescore, "PRESCORE", False)
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_SIZE", 2)
+    monkeypatch.setattr(envllmqueue, "SCORING_BATCH_WAIT", 5)
+    journal, indexes = write_pending(report, 2)
+
+    envllmqueue.start_workers(*report, workers=1)
+    for index in indexes:
+        envllmqueue.submit(*report, index, f"jawab {index}", f"kb {index}")
+    envllmqueue.stop_all_workers()
+
+    for record in journal.data:
+        assert record["status"] == envllmqueue.STATUS_ERROR
+        assert record["skor"] is None
+        assert "evaluator mati" in record["explanation"]
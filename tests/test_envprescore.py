@@ -0,0 +1,38 @@
+import pytest
+
+from module import envprescore
+
+KB = "Kerusakan akibat banjir ditanggung oleh produk BRINS DIRI selama polis masih aktif."
+
+
+@pytest.fixture(autouse=True)
+def prescore_on(monkeypatch):
+    monkeypatch.setattr(envprescore, "PRESCORE", True)
+
+
+def test_identical_after_normalization_passes():
+    skor, _, tier = envprescore.evaluate("kerusakan akibat banjir ditanggung oleh produk brins diri selama polis masih aktif", KB)
+    assert (skor, tier) == (1.0, envprescore.TIER_EXACT)
+
+
+def test_negation_goes_to_llm():
+    answer = KB.replace("ditanggung", "tidak ditanggung")
+    assert envprescore.evaluate(answer, KB) is None
+
+
+def test_product_swap_goes_to_llm():
+    answer = KB.replace("BRINS DIRI", "BRINS ASRI")
+    assert envprescore.evaluate(answer, KB) is None
+
+
+def test_same_words_with_repetition_pass_locally():
+    answer = KB.replace("aktif.", "aktif aktif.")
+    skor, _, tier = envprescore.evaluate(answer, KB)
+    assert tier == envprescore.TIER_LEXICAL
+    assert skor >= envprescore.PRESCORE_PASS_THRESHOLD
+
+
+def test_unrelated_answer_fails_locally():
+    skor, _, tier = envprescore.evaluate("Silakan hubungi call center kami", KB)
+    assert tier == envprescore.TIER_LEXICAL
+    assert skor <= envprescore.PRESCORE_FAIL_THRESHOLD
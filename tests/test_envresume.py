@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from module import envfolder, envjournal, envresume
+from conftest import pending_record
+
+OLD_DATE = "2026-10-01"
+
+
+@pytest.fixture
+def resume_state(report, monkeypatch):
+    monkeypatch.setattr(envfolder, "RUN_DATE", None)
+    monkeypatch.setattr(envresume, "_state", None)
+    return report
+
+
+def write_partial_journal(report_filename, id_test, summary=None):
+    """Journal run yang terhenti di folder tanggal lama: topik 1 dan 3 selesai, topik 2 separuh."""
+    envfolder.use_run_date(OLD_DATE)
+    name = f"{report_filename}-{id_test}"
+    journal = envjournal.get_journal(name)
+    for key in ("pertanyaan1", "pertanyaan2"):
+        record = dict(pending_record("1", f"tanya 1 {key}", "jawab", "kb"), duration="00:00:25")
+        journal.append_data(record, order=[0, 1], key=["1", key])
+    journal.append_chart({"Topik 1": "00:01:00"}, order=[0], key=["1"])
+    record = dict(pending_record("2", "tanya 2", "jawab", "kb"), duration="00:00:20")
+    journal.append_data(record, order=[1, 1], key=["2", "pertanyaan1"])
+    # Record dan chart dari versi lama tanpa key
+    journal.append_data(dict(pending_record("3", "tanya lama", "jawab", "kb"), duration="00:00:05"))
+    journal.append_chart({"Topik 3": "00:00:30"})
+    if summary:
+        journal.update_summary(summary)
+    envjournal.close_journal(name)
+    envfolder.use_run_date(None)
+
+
+def test_start_without_journal_returns_none(resume_state):
+    assert envresume.start(*resume_state) is None
+    assert not envresume.active()
+    assert envresume.elapsed() == 0
+
+
+def test_completed_topics_and_questions_are_skipped(resume_state):
+    write_partial_journal(*resume_state)
+
+    assert envresume.start(*resume_state) == {}
+    assert envresume.active()
+    # Report dan log run lanjutan ditulis ke folder tanggal run lama
+    assert envfolder.run_date() == OLD_DATE
+    assert os.path.dirname(envfolder.journal(f"{resume_state[0]}-{resume_state[1]}")).endswith(OLD_DATE)
+
+    assert envresume.topic_done({"no": "1", "title": "Topik 1"})
+    assert not envresume.topic_done({"no": "2", "title": "Topik 2"})
+    assert envresume.topic_done({"no": "3", "title": "Topik 3"})
+    assert not envresume.topic_done({"no": "4", "title": "Topik 4"})
+
+    topic_2 = {"no": "2", "title": "Topik 2"}
+    assert envresume.is_answered(topic_2, "pertanyaan1", "tanya 2")
+    assert not envresume.is_answered(topic_2, "pertanyaan2", "tanya 2 lagi")
+    assert envresume.is_answered({"no": "3"}, "pertanyaan1", "tanya lama")
+    assert not envresume.is_answered({"no": "3"}, "pertanyaan2", "tanya baru")
+
+
+def test_elapsed_time_is_carried_over(resume_state):
+    write_partial_journal(*resume_state)
+    envresume.start(*resume_state)
+
+    # Chart topik 1 dan 3 (60 + 30 detik) ditambah pertanyaan topik 2 yang belum punya chart (20 detik)
+    assert envresume.topic_offset({"no": "2"}) == 20
+    assert envresume.topic_offset({"no": "1"}) == 0
+    assert envresume.elapsed() == 110
+
+
+def test_summary_duration_takes_precedence(resume_state):
+    write_partial_journal(*resume_state, summary={"id_test": resume_state[1], "duration": "00:05:00"})
+
+    summary = envresume.start(*resume_state)
+
+    assert summary["duration"] == "00:05:00"
+    assert envresume.elapsed() == 300
@@ -0,0 +1,20 @@
+import pytest
+
+from module import envstatus
+
+
+@pytest.fixture
+def markup_tokens():
+    original = list(envstatus.MARKUP_TOKENS)
+    yield envstatus.set_markup_tokens
+    envstatus.set_markup_tokens(original)
+
+
+def test_default_markup_is_stripped():
+    assert envstatus.normalize_response("Halo (bubble1) [button] apa kabar") == envstatus.normalize_response("Halo apa kabar")
+
+
+@pytest.mark.parametrize("text", ["ini video tes", "ini video tes [x]", "ini VIDEO tes", "ini Video tes"])
+def test_markup_token_is_case_insensitive_regardless_of_other_characters(markup_tokens, text):
+    markup_tokens(envstatus.MARKUP_TOKENS + ["Video"])
+    assert envstatus.normalize_response(text).replace(" [x]", "") == "ini tes"
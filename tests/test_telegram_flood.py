@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from telethon import errors
+
+from module import envtelegram
+from fake_telegram import FakeTelegramClient
+
+
+class FloodOnceClient(FakeTelegramClient):
+    """Client palsu yang membalas FloodWait sekali untuk teks tertentu."""
+
+    def __init__(self, session, flood_text, flood_seconds):
+        super().__init__(session, delay=0.01)
+        self.flood_text = flood_text
+        self.flood_seconds = flood_seconds
+        self.sent_at = []
+
+    async def send_message(self, entity, text):
+        self.sent_at.append((time.monotonic(), text))
+        if text == self.flood_text:
+            self.flood_text = None
+            raise errors.FloodWaitError(request=None, capture=self.flood_seconds)
+        await super().send_message(entity, text)
+
+
+@pytest.fixture(autouse=True)
+def fast_replies(monkeypatch):
+    monkeypatch.setattr(envtelegram, "TELEGRAM_QUIET_PERIOD", 0.05)
+    monkeypatch.setattr(envtelegram, "TELEGRAM_REPLY_TIMEOUT", 2)
+
+
+def test_flood_wait_does_not_hold_the_semaphore():
+    async def scenario():
+        flooded = FloodOnceClient("s1", "banjir", 1)
+        other = FakeTelegramClient("s2", delay=0.01)
+        flooded_a = await envtelegram.start_reply_collector("bot_a", flooded)
+        flooded_b = await envtelegram.start_reply_collector("bot_b", flooded)
+        other_a = await envtelegram.start_reply_collector("bot_a", other)
+        semaphore = asyncio.Semaphore(1)
+
+        started = time.monotonic()
+        flood_task = asyncio.create_task(envtelegram.ask_bot("bot_a", "banjir", flooded, semaphore, flooded_a))
+        await asyncio.sleep(0.1)
+        # Jalur lain di session yang sama harus menunggu FloodWait, bukan ikut mengirim
+        same_session = asyncio.create_task(envtelegram.ask_bot("bot_b", "lain", flooded, semaphore, flooded_b))
+        # Session lain tetap bisa memakai slot semaphore selama FloodWait
+        other_reply, _ = await envtelegram.ask_bot("bot_a", "halo", other, semaphore, other_a)
+        other_elapsed = time.monotonic() - started
+
+        flood_reply, _ = await flood_task
+        same_reply, _ = await same_session
+        return flooded, started, other_reply, other_elapsed, flood_reply, same_reply
+
+    flooded, started, other_reply, other_elapsed, flood_reply, same_reply = asyncio.run(scenario())
+
+    assert other_reply == "Echo: halo"
+    assert other_elapsed < 0.9
+    assert flood_reply == "Echo: banjir"
+    assert same_reply == "Echo: lain"
+    assert [text for _, text in flooded.sent_at] in (["banjir", "banjir", "lain"], ["banjir", "lain", "banjir"])
+    assert all(sent - started >= 1 for sent, _ in flooded.sent_at[1:])
+
+
+def test_flood_wait_longer_than_max_gives_up(monkeypatch):
+    monkeypatch.setattr(envtelegram, "TELEGRAM_FLOOD_WAIT_MAX", 0.5)
+
+    async def scenario():
+        client = FloodOnceClient("s1", "banjir", 5)
+        collector = await envtelegram.start_reply_collector("bot_a", client)
+        started = time.monotonic()
+        reply = await envtelegram.ask_bot("bot_a", "banjir", client, asyncio.Semaphore(1), collector)
+        return reply, time.monotonic() - started, envtelegram.flood_remaining(client)
+
+    reply, elapsed, remaining = asyncio.run(scenario())
+
+    assert reply == (None, None)
+    assert elapsed < 0.5
+    assert remaining == 0
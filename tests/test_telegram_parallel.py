@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from module import action, envjournal, envllmscore, envtelegram
+from fake_telegram import FakeTelegramClient
+
+ROWS = [
+    {"no": "1", "title": "Polis", "pertanyaan1": "Apa itu polis?", "pertanyaan2": "Kapan polis aktif?", "context": "Polis adalah kontrak asuransi"},
+    {"no": "2", "title": "Klaim", "pertanyaan1": "Bagaimana cara klaim?", "context": "Klaim diajukan lewat aplikasi"},
+    {"no": "3", "title": "Premi", "pertanyaan1": "Berapa premi?", "pertanyaan2": "", "context": "Premi dibayar setiap bulan"},
+    {"no": "4", "title": "Agen", "pertanyaan1": "Siapa agen saya?", "context": "Agen tercantum di polis"},
+]
+ANSWERS = {row[key]: row["context"] for row in ROWS for key in row if key.startswith("pertanyaan") and row[key]}
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    """Mengganti client Telethon dengan FakeTelegramClient; balasan dipecah dua pesan."""
+    clients = []
+
+    def factory(session_string):
+        client = FakeTelegramClient(session_string, reply=lambda text: ANSWERS.get(text, "Halo juga"), delay=0.01, chunks=2)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(envtelegram, "TELEGRAM_QUIET_PERIOD", 0.1)
+    monkeypatch.setattr(envtelegram, "TELEGRAM_REPLY_TIMEOUT", 2)
+    envtelegram.set_client_factory(factory)
+    yield clients
+    envtelegram.set_client_factory(envtelegram.telethon_client_factory)
+
+
+def test_parallel_lanes_answer_every_question_in_file_order(report, fake_clients, monkeypatch):
+    # Balasan yang terpotong di tengah kata tidak lolos prescore exact dan jatuh ke LLM;
+    # evaluator palsu memberi 1.0 hanya jika potongan balasan tersusun kembali menjadi jawaban KB
+    def llm_score(response_bot, respond_text):
+        return (1.0 if response_bot.replace("\n", "") == respond_text else 0.0), None, "stub", "stub"
+
+    monkeypatch.setattr(envllmscore, "llm_score", llm_score)
+    report_filename, id_test = report
+
+    asyncio.run(action.actions_telegram_parallel(
+        ["s1", "s2"], ["bot_a"], "Halo", ROWS, report_filename, id_test, "00:00:00", "today", "tester"
+    ))
+
+    snapshot = envjournal.get_journal(f"{report_filename}-{id_test}").snapshot()
+    questions = [record["question"] for record in snapshot["data"]]
+    assert questions == list(ANSWERS)
+    for record in snapshot["data"]:
+        assert record["response_kb"] == ANSWERS[record["question"]]
+        assert record["response_llm"].replace("\n", "") == record["response_kb"]
+        assert record["status"] == "pass"
+    assert [next(iter(chart)) for chart in snapshot["chart"]] == [row["title"] for row in ROWS]
+
+    # Kedua session dipakai dan topik dibagi round-robin
+    assert [client.session for client in fake_clients] == ["s1", "s2"]
+    sent = [[text for _, text in client.sent] for client in fake_clients]
+    assert sent[0] == ["Halo", "Apa itu polis?", "Kapan polis aktif?", "Berapa premi?"]
+    assert sent[1] == ["Halo", "Bagaimana cara klaim?", "Siapa agen saya?"]